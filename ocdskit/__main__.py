@@ -1,5 +1,6 @@
 import argparse
 import importlib
+import json
 import logging
 import sys
 import warnings
@@ -15,7 +16,9 @@ COMMAND_MODULES = (
     "ocdskit.commands.compile",
     "ocdskit.commands.detect_format",
     "ocdskit.commands.echo",
+    "ocdskit.commands.get",
     "ocdskit.commands.indent",
+    "ocdskit.commands.index",
     "ocdskit.commands.mapping_sheet",
     "ocdskit.commands.normalize",
     "ocdskit.commands.package_records",
@@ -34,19 +37,33 @@ OPTIONAL_COMMAND_MODULES = {"ocdskit.commands.erd"}
 # The arguments are for use in oc4idskit.
 def main(description="Open Contracting Data Standard CLI", modules=COMMAND_MODULES, logger=logger):
     parser = argparse.ArgumentParser(prog="ocdskit", description=description)
-    parser.add_argument("--encoding", help="the file encoding")
-    parser.add_argument("--ascii", help="print escape sequences instead of UTF-8 characters", action="store_true")
-    parser.add_argument("--pretty", help="pretty print output", action="store_true")
+    _add_global_arguments(parser)
 
     subparsers = parser.add_subparsers(dest="subcommand")
 
     subcommands = {}
 
-    for module in (*modules, *OPTIONAL_COMMAND_MODULES):
+    # Command modules import heavy dependencies (jsonschema, ocdsextensionregistry, etc.). To start quickly, only the
+    # selected command's module is imported. Other commands are added as placeholders, to be listed in the help text.
+    # A module's command name is assumed to be its name, with hyphens instead of underscores.
+    names = {_get_command_name(module): module for module in (*modules, *OPTIONAL_COMMAND_MODULES)}
+
+    subcommand = _get_subcommand()
+    if subcommand in names:
+        selected = {names[subcommand]}
+    elif subcommand:  # the command's name might not follow the convention
+        selected = set(names.values())
+    else:
+        selected = set()
+
+    for name, module in names.items():
+        if module not in selected:
+            subparsers.add_parser(name)
+            continue
         try:
             command = importlib.import_module(module).Command(subparsers)
         except ImportError as e:
-            if module not in OPTIONAL_COMMAND_MODULES:
+            if module not in OPTIONAL_COMMAND_MODULES or name == subcommand:
                 logger.error('exception "%s" prevented loading of %s module', e, module)  # noqa: TRY400 # UX
         else:
             subcommands[command.name] = command
@@ -60,7 +77,7 @@ def main(description="Open Contracting Data Standard CLI", modules=COMMAND_MODUL
             try:
                 with warnings.catch_warnings():
                     warnings.showwarning = _showwarning
-                    command.handle()
+                    command.run()
             except ijson.common.IncompleteJSONError as e:
                 if e.args and isinstance(e.args[0], (bytes, UnicodeDecodeError)):
                     message = e.args[0]
@@ -70,6 +87,9 @@ def main(description="Open Contracting Data Standard CLI", modules=COMMAND_MODUL
                 raise CommandError(f"JSON error: {e}") from e
             except UnicodeDecodeError as e:
                 _raise_encoding_error(e, args.encoding)
+            # orjson.JSONDecodeError is a subclass of json.JSONDecodeError.
+            except json.JSONDecodeError as e:
+                raise CommandError(f"JSON error: {e}") from e
         except CommandError as e:
             logger.critical(e)
             sys.exit(1)
@@ -77,6 +97,36 @@ def main(description="Open Contracting Data Standard CLI", modules=COMMAND_MODUL
         parser.print_help()
 
 
+def _add_global_arguments(parser):
+    parser.add_argument("--encoding", help="the file encoding")
+    parser.add_argument("--ascii", help="print escape sequences instead of UTF-8 characters", action="store_true")
+    parser.add_argument("--pretty", help="pretty print output", action="store_true")
+    parser.add_argument(
+        "--input-compression",
+        choices=("auto", "gzip", "bz2", "lzma"),
+        help="the compression format of the input (auto detects the format, if any, from its first bytes)",
+    )
+    parser.add_argument("--output-compression", choices=("gzip", "bz2", "lzma"), help="compress the output")
+
+
+def _get_command_name(module):
+    return module.rpartition(".")[2].replace("_", "-")
+
+
+def _get_subcommand():
+    """Return the name of the selected subcommand, without parsing the subcommand's arguments."""
+    # Abbreviations are disabled, so that a command's `--input` option isn't read as `--input-compression`. If a global
+    # option is abbreviated, its value might be read as the subcommand, in which case all commands are loaded.
+    parser = argparse.ArgumentParser(add_help=False, allow_abbrev=False)
+    _add_global_arguments(parser)
+    parser.add_argument("subcommand", nargs="?")
+    try:
+        args, _ = parser.parse_known_args()
+    except SystemExit:  # the real parser reports the error
+        return None
+    return args.subcommand
+
+
 def _showwarning(message, category, filename, lineno, file=None, line=None):  # noqa: ARG001
     if file is None:
         file = sys.stderr
@@ -0,0 +1,97 @@
+"""Cache patched release schemas and their merge rules on disk, to not build or download them on each run."""
+
+from __future__ import annotations
+
+import contextlib
+import hashlib
+import json
+import os
+import time
+from tempfile import NamedTemporaryFile
+
+from ocdsextensionregistry import ProfileBuilder
+from ocdsmerge import Merger
+from ocdsmerge.merge import get_merge_rules
+
+from ocdskit.util import get_ocds_patch_tag
+
+#: The environment variable that sets the default cache directory.
+CACHE_DIR_ENVIRONMENT_VARIABLE = "OCDSKIT_CACHE_DIR"
+#: The number of seconds after which an entry is evicted.
+MAX_AGE = 7 * 24 * 60 * 60
+
+
+class SchemaCache:
+    """
+    A cache of patched release schemas and merge rules, keyed by OCDS tag and extensions.
+
+    Entries are evicted ``max_age`` seconds after they are written, such that new patch versions of OCDS and changes to
+    extensions are eventually used.
+    """
+
+    def __init__(self, directory: str, max_age: int = MAX_AGE):
+        """
+        :param directory: the directory in which to store entries (created if it doesn't exist)
+        :param max_age: the number of seconds after which an entry is evicted
+        """
+        self.directory = directory
+        self.max_age = max_age
+
+        os.makedirs(directory, exist_ok=True)
+        self.evict()
+
+    def evict(self):
+        """Remove the entries that were written more than ``max_age`` seconds ago."""
+        cutoff = time.time() - self.max_age
+        with os.scandir(self.directory) as it:
+            for entry in it:
+                if entry.name.endswith(".json") and entry.is_file() and entry.stat().st_mtime < cutoff:
+                    # Another process might have evicted the entry.
+                    with contextlib.suppress(FileNotFoundError):
+                        os.remove(entry.path)
+
+    def get_tag(self, version: str) -> str:
+        """
+        Return the OCDS patch version as a git tag (like ``1__1__4``) for a given minor version (like ``1.1``).
+
+        :raises UnknownVersionError: if the OCDS version is not recognized
+        """
+        return self._get(f"tag-{version}", lambda: get_ocds_patch_tag(version))
+
+    def get_release_schema(self, tag: str, extensions: list[str]) -> dict:
+        """Return the release schema for the OCDS tag, patched with the extensions, in order."""
+        return self._get(
+            f"release-schema-{_hash(tag, extensions)}",
+            lambda: ProfileBuilder(tag, extensions).patched_release_schema(),
+        )
+
+    def get_merge_rules(self, tag: str, extensions: list[str]) -> dict[tuple[str, ...], str]:
+        """Return the merge rules for the release schema for the OCDS tag, patched with the extensions, in order."""
+        rules = self._get(
+            f"merge-rules-{_hash(tag, extensions)}",
+            lambda: list(get_merge_rules(self.get_release_schema(tag, extensions)).items()),
+        )
+        return {tuple(path): rule for path, rule in rules}
+
+    def get_merger(self, version: str, extensions: list[str]) -> Merger:
+        """Return a merger for the OCDS version (like ``1.1``), with the extensions, in order."""
+        return Merger(merge_rules=self.get_merge_rules(self.get_tag(version), extensions))
+
+    def _get(self, key, default):
+        path = os.path.join(self.directory, f"{key}.json")
+
+        try:
+            with open(path, "rb") as f:
+                value = json.load(f)
+        except (FileNotFoundError, ValueError):  # missing or corrupt
+            value = default()
+            with NamedTemporaryFile("w", dir=self.directory, suffix=".tmp", delete=False) as f:
+                json.dump(value, f)
+            # Replace atomically, in case other processes share the cache.
+            os.replace(f.name, path)
+
+        return value
+
+
+def _hash(tag, extensions):
+    return hashlib.sha256(json.dumps([tag, extensions]).encode()).hexdigest()
@@ -1,13 +1,20 @@
 from __future__ import annotations
 
+import os
 import warnings
 
 from ocdsextensionregistry import ProfileBuilder
 from ocdsmerge import Merger
 from ocdsmerge.util import get_release_schema_url
 
-from ocdskit.exceptions import MissingRecordsWarning, MissingReleasesWarning
-from ocdskit.packager import Packager
+from ocdskit.cache import CACHE_DIR_ENVIRONMENT_VARIABLE, SchemaCache
+from ocdskit.exceptions import (
+    DuplicateReleasesWarning,
+    IgnoredMetadataWarning,
+    MissingRecordsWarning,
+    MissingReleasesWarning,
+)
+from ocdskit.packager import AbstractBackend, Packager
 from ocdskit.util import (
     _empty_record_package,
     _empty_release_package,
@@ -68,7 +75,9 @@ def package_releases(releases, uri="", publisher=None, published_date="", versio
     return _package("releases", releases, uri, publisher, published_date, version, extensions)
 
 
-def combine_record_packages(packages, uri="", publisher=None, published_date="", version=DEFAULT_VERSION):
+def combine_record_packages(
+    packages, uri="", publisher=None, published_date="", version=DEFAULT_VERSION, *, records=None
+):
     """
     Collect the packages and records from the record packages into one record package.
 
@@ -79,6 +88,10 @@ def combine_record_packages(packages, uri="", publisher=None, published_date="",
     :param dict publisher: the record package's ``publisher``
     :param str published_date: the record package's ``publishedDate``
     :param str version: the record package's ``version``
+    :param records: if set, the records to put in the record package, instead of those from the record packages.
+        To not read all records into memory, set ``packages`` to :func:`ocdskit.util.iter_package_metadata` and
+        ``records`` to :func:`ocdskit.util.iter_package_entries`, each over its own pass of the input, and stream the
+        output with :func:`ocdskit.util.iterencode`.
     """
     # See options for not buffering all inputs into memory: https://github.com/open-contracting/ocdskit/issues/119
     output = _empty_record_package(uri, publisher, published_date, version)
@@ -87,7 +100,8 @@ def combine_record_packages(packages, uri="", publisher=None, published_date="",
     for i, package in enumerate(packages):
         _update_package_metadata(output, package)
         if "records" in package:
-            output["records"].extend(package["records"])
+            if records is None:
+                output["records"].extend(package["records"])
         else:
             warnings.warn(
                 f'item {i} has no "records" field (check that it is a record package)',
@@ -97,6 +111,8 @@ def combine_record_packages(packages, uri="", publisher=None, published_date="",
         if "packages" in package:
             output["packages"].update(dict.fromkeys(package["packages"]))
 
+    if records is not None:
+        output["records"] = records
     if publisher:
         output["publisher"] = publisher
 
@@ -107,7 +123,9 @@ def combine_record_packages(packages, uri="", publisher=None, published_date="",
     return output
 
 
-def combine_release_packages(packages, uri="", publisher=None, published_date="", version=DEFAULT_VERSION):
+def combine_release_packages(
+    packages, uri="", publisher=None, published_date="", version=DEFAULT_VERSION, *, releases=None
+):
     """
     Collect the releases from the release packages into one release package.
 
@@ -118,6 +136,10 @@ def combine_release_packages(packages, uri="", publisher=None, published_date=""
     :param dict publisher: the release package's ``publisher``
     :param str published_date: the release package's ``publishedDate``
     :param str version: the release package's ``version``
+    :param releases: if set, the releases to put in the release package, instead of those from the release packages.
+        To not read all releases into memory, set ``packages`` to :func:`ocdskit.util.iter_package_metadata` and
+        ``releases`` to :func:`ocdskit.util.iter_package_entries`, each over its own pass of the input, and stream the
+        output with :func:`ocdskit.util.iterencode`.
     """
     # See options for not buffering all inputs into memory: https://github.com/open-contracting/ocdskit/issues/119
     output = _empty_release_package(uri, publisher, published_date, version)
@@ -125,7 +147,8 @@ def combine_release_packages(packages, uri="", publisher=None, published_date=""
     for i, package in enumerate(packages):
         _update_package_metadata(output, package)
         if "releases" in package:
-            output["releases"].extend(package["releases"])
+            if releases is None:
+                output["releases"].extend(package["releases"])
         else:
             warnings.warn(
                 f'item {i} has no "releases" field (check that it is a release package)',
@@ -133,6 +156,8 @@ def combine_release_packages(packages, uri="", publisher=None, published_date=""
                 stacklevel=2,
             )
 
+    if releases is not None:
+        output["releases"] = releases
     if publisher:
         output["publisher"] = publisher
 
@@ -157,6 +182,15 @@ def merge(
     force_version: str | None = None,
     ignore_version: bool = False,
     convert_exceptions_to_warnings: bool = False,
+    workers: int = 1,
+    store: str | None = None,
+    assume_grouped: bool = False,
+    cache_dir: str | None = None,
+    compression: str | None = None,
+    compression_level: int | None = None,
+    deduplicate: str | None = None,
+    backend: str | AbstractBackend | None = None,
+    backend_options: dict | None = None,
 ):
     """
     Merge release packages and individual releases.
@@ -189,23 +223,66 @@ def merge(
     :param force_version: version to use instead of the version of the first release package or individual release
     :param ignore_version: do not raise an error if the versions are inconsistent across items to merge
     :param convert_exceptions_to_warnings: whether to convert inconsistent type errors from OCDS Merge to warnings
+    :param workers: the number of worker processes in which to merge releases (0 for the number of CPUs). The output
+        is in the same order.
+    :param store: the path to a SQLite database in which to keep releases across calls. If set, only OCIDs with new
+        releases are output, and their output is merged from all their releases, including those from earlier calls.
+    :param assume_grouped: whether the releases for each OCID are contiguous in the input. If so, the input is merged
+        while it is read, and the output is in the same order as the input. The patched release schema and, if
+        ``streaming`` is ``True``, the package metadata are determined from the first item only. If later packages
+        have other extensions or metadata, an :class:`~ocdskit.exceptions.IgnoredMetadataWarning` is issued, once the
+        output is exhausted. It can't be combined with ``store``, ``compression``, ``backend`` or ``backend_options``.
+    :param cache_dir: if ``schema`` isn't set, the directory in which to cache the patched release schema and its merge
+        rules (default: the ``OCDSKIT_CACHE_DIR`` environment variable, if set)
+    :param compression: if SQLite is used, the format in which to compress releases while they are stored: "zlib" or
+        "zstd" (Zstandard requires Python 3.14 or the ``zstandard`` package)
+    :param compression_level: the compression level, if ``compression`` is set
+    :param deduplicate: whether to drop duplicate releases before they are stored, and where to keep the fingerprints
+        of releases: "memory" or "disk" (in a temporary SQLite database). If ``store`` is set, the fingerprints are
+        kept in the store instead, to also drop duplicates of releases from earlier calls. If any releases are dropped,
+        a :class:`~ocdskit.exceptions.DuplicateReleasesWarning` is issued, once the output is exhausted.
+    :param backend: the backend in which to store releases before merging them: a name, as accepted by
+        :func:`~ocdskit.packager.get_backend`, or an instance of :class:`~ocdskit.packager.AbstractBackend` (default:
+        "sqlite" if sqlite3 is available, and "python" otherwise)
+    :param backend_options: if ``backend`` is a name, keyword arguments with which to create the backend
     :raises InconsistentVersionError: if the versions are inconsistent across items to merge
     :raises MissingOcidKeyError: if the release is missing an ``ocid`` field
     :raises UnknownVersionError: if the OCDS version is not recognized
+    :raises UnknownBackendError: if the name of the backend is not recognized
+    :raises UngroupedOcidError: if ``assume_grouped`` is ``True``, and an OCID's releases are not contiguous
     """
-    with Packager(force_version=force_version) as packager:
+    with Packager(
+        force_version=force_version,
+        store=store,
+        assume_grouped=assume_grouped,
+        compression=compression,
+        compression_level=compression_level,
+        deduplicate=deduplicate,
+        backend=backend,
+        backend_options=backend_options,
+    ) as packager:
         packager.add(data, ignore_version=ignore_version)
 
-        if not schema and packager.version:
-            tag = get_ocds_patch_tag(packager.version)
-            if packager.package["extensions"]:
-                # `extensions` is an insertion-ordered dict at this point.
-                builder = ProfileBuilder(tag, list(packager.package["extensions"]))
-                schema = builder.patched_release_schema()
-            else:
-                schema = get_release_schema_url(tag)
+        # If `assume_grouped` is set, the extensions of later packages are read after the schema is patched.
+        is_patched = not schema
+
+        if cache_dir is None:
+            cache_dir = os.getenv(CACHE_DIR_ENVIRONMENT_VARIABLE)
 
-        merger = Merger(schema)
+        if not schema and packager.version and cache_dir:
+            # `extensions` is an insertion-ordered dict at this point.
+            merger = SchemaCache(cache_dir).get_merger(packager.version, list(packager.package["extensions"]))
+        else:
+            if not schema and packager.version:
+                tag = get_ocds_patch_tag(packager.version)
+                if packager.package["extensions"]:
+                    # `extensions` is an insertion-ordered dict at this point.
+                    builder = ProfileBuilder(tag, list(packager.package["extensions"]))
+                    schema = builder.patched_release_schema()
+                else:
+                    schema = get_release_schema_url(tag)
+
+            merger = Merger(schema)
 
         if return_package:
             packager.package["uri"] = uri
@@ -220,10 +297,33 @@ def merge(
                 use_linked_releases=use_linked_releases,
                 streaming=streaming,
                 convert_exceptions_to_warnings=convert_exceptions_to_warnings,
+                workers=workers,
             )
         else:
             yield from packager.output_releases(
                 merger,
                 return_versioned_release=return_versioned_release,
                 convert_exceptions_to_warnings=convert_exceptions_to_warnings,
+                workers=workers,
+            )
+
+        if packager.duplicates:
+            warnings.warn(
+                f"{packager.duplicates} duplicate releases were dropped",
+                category=DuplicateReleasesWarning,
+                stacklevel=2,
+            )
+        if is_patched and packager.late_extensions:
+            warnings.warn(
+                f"extensions after the first package were not used to merge releases: "
+                f"{', '.join(packager.late_extensions)}",
+                category=IgnoredMetadataWarning,
+                stacklevel=2,
+            )
+        # If the record package isn't streamed, it is output after all packages are read.
+        if return_package and streaming and packager.late_metadata:
+            warnings.warn(
+                "metadata after the first package is missing from the record package",
+                category=IgnoredMetadataWarning,
+                stacklevel=2,
             )
@@ -1,21 +1,182 @@
+import contextlib
+import functools
+import glob
+import importlib
+import io
+import itertools
+import json
+import logging
 import os
 import sys
+import tempfile
 from abc import ABC, abstractmethod
 
-from ocdskit.util import ijson, iterencode, json_dumps
+from ocdskit.exceptions import CommandError
+from ocdskit.util import _parallel_map, iter_items, iterencode, json_dumps
+
+logger = logging.getLogger("ocdskit")
+
+# The number of characters to buffer before writing streamed output.
+WRITE_BUFFER_SIZE = 2**20
+# The number of bytes to buffer while reading compressed input.
+READ_BUFFER_SIZE = 2**20
+# The number of bytes of spooled input to hold in memory, before writing to disk.
+SPOOL_MAX_SIZE = 2**26
+
+# The magic bytes at the start of a compressed file, by compression format.
+MAGIC_BYTES = {
+    "gzip": b"\x1f\x8b",
+    "bz2": b"BZh",
+    "lzma": b"\xfd7zXZ\x00",
+}
+
+
+def open_compressed(file, compression, mode="rb"):
+    """
+    Return a file object that decompresses data read from, or compresses data written to, a binary file object.
+
+    :param file: a binary file object
+    :param compression: "gzip", "bz2" or "lzma"
+    :param mode: "rb" or "wb"
+    """
+    # Import here, to not slow the CLI's start if the options aren't used.
+    module = importlib.import_module(compression)
+    if compression == "gzip":
+        # Use the same default compression level as the gzip command, instead of the slowest level.
+        return module.GzipFile(fileobj=file, mode=mode, compresslevel=6)
+    return getattr(module, f"{compression.upper()}File")(file, mode=mode)
+
+
+def detect_compression(file):
+    """
+    Return the compression format of a buffered binary file object, based on its magic bytes, without consuming them.
+
+    :returns: "gzip", "bz2", "lzma", or ``None`` if the file is uncompressed
+    """
+    start = file.peek(max(len(magic) for magic in MAGIC_BYTES.values()))
+    for compression, magic in MAGIC_BYTES.items():
+        if start.startswith(magic):
+            return compression
+    return None
+
+
+class Manifest:
+    """
+    A manifest of the path, size, modification time and result of each processed file, to skip unchanged files.
+
+    If the options that affect results differ from those in the manifest, its entries are discarded.
+    """
+
+    def __init__(self, path, options):
+        """
+        :param path: the path to the manifest file, or ``None`` to not cache results
+        :param dict options: the options that affect results
+        """
+        self.path = path
+        self.options = options
+        self.entries = {}
+
+        if path:
+            # The manifest might be missing or corrupt.
+            with contextlib.suppress(FileNotFoundError, ValueError), open(path, "rb") as f:
+                data = json.load(f)
+                if data["options"] == options:
+                    self.entries = data["files"]
+
+    def get(self, path, default=None):
+        """Return the cached result for the file, or ``default`` if the file is new or changed."""
+        entry = self.entries.get(os.path.abspath(path))
+        if entry:
+            stat = os.stat(path)
+            if entry[0] == stat.st_size and entry[1] == stat.st_mtime_ns:
+                return entry[2]
+        return default
+
+    def set(self, path, result):
+        """Cache the result for the file, with its current size and modification time."""
+        if self.path:
+            stat = os.stat(path)
+            self.entries[os.path.abspath(path)] = [stat.st_size, stat.st_mtime_ns, result]
+
+    def save(self):
+        """Write the manifest, atomically."""
+        if self.path:
+            directory = os.path.dirname(os.path.abspath(self.path))
+            with tempfile.NamedTemporaryFile("w", dir=directory, suffix=".tmp", delete=False) as f:
+                json.dump({"options": self.options, "files": self.entries}, f)
+            os.replace(f.name, self.path)
 
 
 class StandardInputReader:
-    def __init__(self, encoding):
+    def __init__(self, encoding, compression=None, file=None):
+        """
+        :param encoding: the encoding of the standard input
+        :param compression: the compression format of the standard input: "gzip", "bz2", "lzma" or "auto"
+        :param file: a binary file object to read instead of the standard input
+        """
         self.encoding = encoding
+        self.file = sys.stdin.buffer if file is None else file
+
+        if compression:
+            self.file = io.BufferedReader(self.file, READ_BUFFER_SIZE)
+            if compression == "auto":
+                compression = detect_compression(self.file)
+            if compression:
+                self.file = open_compressed(self.file, compression)
 
     def read(self, buf_size):
-        data = sys.stdin.buffer.read(buf_size)
+        return self._transcode(self.file.read(buf_size))
+
+    def readline(self, size=-1):
+        return self._transcode(self.file.readline(size))
+
+    def _transcode(self, data):
         if self.encoding is None or self.encoding == "utf-8":
             return data
         return data.decode(self.encoding).encode("utf-8")
 
 
+class FilesReader:
+    """Read files in order, as if they were concatenated, decompressing and transcoding each file like the input."""
+
+    def __init__(self, paths, encoding, compression=None):
+        """
+        :param paths: the paths to the files
+        :param encoding: the encoding of the files
+        :param compression: the compression format of the files: "gzip", "bz2", "lzma" or "auto"
+        """
+        self.paths = iter(paths)
+        self.encoding = encoding
+        self.compression = compression
+        self.file = None
+        self.reader = None
+
+    def read(self, buf_size):
+        return self._read("read", buf_size)
+
+    def readline(self, size=-1):
+        return self._read("readline", size)
+
+    def _read(self, method, size):
+        while True:
+            if self.reader is None:
+                path = next(self.paths, None)
+                if path is None:
+                    return b""
+                self.file = open(path, "rb")  # noqa: SIM115
+                self.reader = StandardInputReader(self.encoding, self.compression, self.file)
+            if data := getattr(self.reader, method)(size):
+                return data
+            self.file.close()
+            self.reader = None
+
+
+def _read_items(path, prefix, encoding, compression, jsonl, kwargs):
+    """Return the items in a file. This function runs in a worker process."""
+    with open(path, "rb") as f:
+        return list(iter_items(StandardInputReader(encoding, compression, f), prefix, jsonl=jsonl, **kwargs))
+
+
 class BaseCommand(ABC):
     kwargs = {}  # noqa: RUF012
 
@@ -40,21 +201,188 @@ class BaseCommand(ABC):
     def handle(self):
         """Run the command."""
 
+    def run(self):
+        """Run the command, compressing the standard output if ``--output-compression`` is set."""
+        compression = getattr(self.args, "output_compression", None)
+        if not compression:
+            self.handle()
+            return
+
+        stdout = sys.stdout
+        # Closing the compressed file writes its trailer, without closing the standard output.
+        with (
+            open_compressed(stdout.buffer, compression, "wb") as file,
+            io.TextIOWrapper(file, encoding="utf-8") as sys.stdout,
+        ):
+            try:
+                self.handle()
+            finally:
+                sys.stdout = stdout  # noqa: PLW2901
+
+    def add_file_arguments(self):
+        """Add arguments to commands that process files instead of the standard input."""
+        self.add_argument(
+            "-j", "--jobs", type=int, default=1, help="the number of processes to use (0 for the number of CPUs)"
+        )
+        self.add_argument(
+            "--cache", help="the path to a manifest of results, to skip unchanged files on later runs", metavar="PATH"
+        )
+
+    def map_files(self, function, callback, predicate, options):
+        """
+        Call the function on each file, and the callback with the path and result, in order.
+
+        The files are processed by ``--jobs`` processes. If ``--cache`` is set, the results for unchanged files are
+        read from the manifest, and new results are written to it.
+
+        :param function: a picklable function that accepts a path and returns a JSON-serializable result
+        :param callback: a function that accepts a path and a result
+        :param predicate: a function that accepts a filename and returns whether to process it, if recursing
+        :param dict options: the options that affect results
+        """
+        manifest = Manifest(self.args.cache, options)
+        missing = object()
+
+        items = [(path, manifest.get(path, missing)) for path in self.iter_paths(predicate)]
+        paths = [path for path, cached in items if cached is missing]
+
+        if self.args.jobs == 1:
+            results = map(function, paths)
+        else:
+            results = _parallel_map(function, paths, self.args.jobs or os.cpu_count())
+
+        try:
+            for path, cached in items:
+                if cached is missing:
+                    result = next(results)
+                    manifest.set(path, result)
+                else:
+                    result = cached
+                callback(path, result)
+        finally:
+            manifest.save()
+
+    def iter_paths(self, predicate):
+        """
+        Yield the paths to the files in the ``file`` argument, recursing into directories if ``--recursive`` is set.
+
+        :param predicate: a function that accepts a filename and returns whether to yield it, if recursing
+        """
+        for file in self.args.file:
+            if os.path.isfile(file):
+                yield file
+            elif self.args.recursive:
+                for root, _, files in os.walk(file):
+                    for name in files:
+                        if predicate(name):
+                            yield os.path.join(root, name)
+            elif os.path.isdir(file):
+                logger.warning("%s is a directory. Set --recursive to recurse into directories.", file)
+            else:
+                logger.error("%s: No such file or directory", file)
+
     def prefix(self):
         """Return the path to the items to process within each input."""
         return ""
 
+    def input_paths(self):
+        """
+        Return the paths to the input files, if ``--input`` is set, expanding any glob patterns, in sorted order.
+
+        :raises CommandError: if a pattern matches no files, or if a path is a directory or doesn't exist
+        """
+        paths = []
+        for pattern in getattr(self.args, "input", None) or ():
+            matches = sorted(glob.glob(pattern, recursive=True)) if glob.has_magic(pattern) else [pattern]
+            if not matches:
+                raise CommandError(f"{pattern}: No files match the pattern")
+            for path in matches:
+                if os.path.isdir(path):
+                    raise CommandError(f"{path}: Is a directory")
+                if not os.path.isfile(path):
+                    raise CommandError(f"{path}: No such file or directory")
+                paths.append(path)
+        return paths
+
+    def reader(self):
+        """Return a reader of the input files, if ``--input`` is set, or of the standard input."""
+        compression = getattr(self.args, "input_compression", None)
+        if paths := self.input_paths():
+            return FilesReader(paths, self.args.encoding, compression)
+        return StandardInputReader(self.args.encoding, compression)
+
+    def spool(self):
+        """Return a temporary file with a copy of the standard input, to read the input more than once."""
+        file = tempfile.SpooledTemporaryFile(max_size=SPOOL_MAX_SIZE)  # noqa: SIM115
+        reader = self.reader()
+        while data := reader.read(READ_BUFFER_SIZE):
+            file.write(data)
+        file.seek(0)
+        return file
+
+    def jsonl(self):
+        """Return whether the input is JSON Lines, or ``None`` to detect it."""
+        return getattr(self.args, "jsonl", None) or None
+
     def items(self, **kwargs):
-        """Yield the items in the input."""
-        file = StandardInputReader(self.args.encoding)
-        yield from ijson.items(file, self.prefix(), multiple_values=True, **kwargs)
+        """
+        Yield the items in the input.
+
+        If ``--input-workers`` is set, each input file is parsed in a worker process, and its items are yielded in the
+        order of the files, or, if ``--unordered`` is set, in the order in which the files are parsed. If
+        ``--use-float`` is set and ``--unordered`` isn't set, large files are split into chunks, which are parsed in
+        worker processes (using orjson if available, which parses numbers as ``int`` or ``float``, not ``Decimal``).
+
+        :param kwargs: keyword arguments to ``ijson.items()``
+        """
+        workers = getattr(self.args, "input_workers", 1)
+        if workers != 1 and (paths := self.input_paths()):
+            workers = workers or os.cpu_count()
+            function = functools.partial(
+                _read_items,
+                prefix=self.prefix(),
+                encoding=self.args.encoding,
+                compression=getattr(self.args, "input_compression", None),
+                jsonl=self.jsonl(),
+                kwargs=kwargs,
+            )
+            for split, group in itertools.groupby(
+                paths, key=lambda path: kwargs == {"use_float": True} and self.is_splittable(path)
+            ):
+                if split:
+                    # Import here, to not slow the CLI's start if the option isn't used.
+                    from ocdskit import parallel  # noqa: PLC0415
+
+                    for path in group:
+                        yield from parallel.iter_items_parallel(
+                            path, self.prefix(), workers, jsonl=self.jsonl(), chunk_size=parallel.CHUNK_SIZE
+                        )
+                else:
+                    yield from itertools.chain.from_iterable(
+                        _parallel_map(function, group, workers, ordered=not self.args.unordered)
+                    )
+        else:
+            yield from iter_items(self.reader(), self.prefix(), jsonl=self.jsonl(), **kwargs)
+
+    def is_splittable(self, path):
+        """Return whether to split the input file into chunks, to parse in worker processes."""
+        from ocdskit.parallel import CHUNK_SIZE  # noqa: PLC0415
+
+        if self.args.unordered or self.args.encoding not in (None, "utf-8") or os.path.getsize(path) <= CHUNK_SIZE:
+            return False
+        compression = getattr(self.args, "input_compression", None)
+        if compression == "auto":
+            with open(path, "rb") as f:
+                start = f.read(max(len(magic) for magic in MAGIC_BYTES.values()))
+            return not any(start.startswith(magic) for magic in MAGIC_BYTES.values())
+        return not compression
 
     def print(self, data, *, streaming=False):
         """
         Print JSON data.
 
-        :param bool streaming: whether to stream output using ``json.JSONEncoder().iterencode()`` (it is only more
-            memory efficient if ``data`` contains iterators)
+        :param bool streaming: whether to stream output using :func:`ocdskit.util.iterencode` (it is only more memory
+            efficient if ``data`` contains iterators)
         """
         kwargs = {}
         if self.args.pretty:
@@ -64,12 +392,22 @@ class BaseCommand(ABC):
 
         try:
             if streaming:
+                buffer = []
+                size = 0
                 for chunk in iterencode(data, **kwargs):
-                    print(chunk, end="")
-                print()
+                    buffer.append(chunk)
+                    size += len(chunk)
+                    if size >= WRITE_BUFFER_SIZE:
+                        sys.stdout.write("".join(buffer))
+                        buffer.clear()
+                        size = 0
+                buffer.append("\n")
+                sys.stdout.write("".join(buffer))
             else:
                 print(json_dumps(data, **kwargs))
-            sys.stdout.flush()
+            # Flushing a compressed file ends a compressed block, which reduces the compression ratio.
+            if not getattr(self.args, "output_compression", None):
+                sys.stdout.flush()
         # https://docs.python.org/3/library/signal.html#note-on-sigpipe
         except BrokenPipeError:
             devnull = os.open(os.devnull, os.O_WRONLY)
@@ -83,12 +421,54 @@ class OCDSCommand(BaseCommand, ABC):
             "--root-path", type=str, default="", help="the path to the items to process within each input"
         )
 
+    def add_input_arguments(self, *, workers=True):
+        """
+        Add arguments for reading the input to the subparser.
+
+        :param bool workers: whether to add arguments for parsing the input files in worker processes
+        """
+        self.add_argument(
+            "--jsonl",
+            action="store_true",
+            help="parse the input as JSON Lines, without first detecting whether it is JSON Lines",
+        )
+        self.add_argument(
+            "-i",
+            "--input",
+            nargs="+",
+            action="extend",
+            help="read these files (or glob patterns, like dir/**/*.json) in order, instead of the standard input",
+            metavar="PATH",
+        )
+        self.add_argument(
+            "--use-float",
+            action="store_true",
+            help="parse numbers as floats instead of decimals, which is faster, but can lose precision",
+        )
+        if workers:
+            self.add_argument(
+                "--input-workers",
+                type=int,
+                default=1,
+                help="if --input is set, the number of processes in which to parse files (0 for the number of CPUs)",
+            )
+            self.add_argument(
+                "--unordered",
+                action="store_true",
+                help="if --input-workers is set, read the items of each file as soon as it is parsed, instead of in "
+                "order",
+            )
+
     def prefix(self):
         return self.args.root_path
 
+    def parse_kwargs(self):
+        """Return keyword arguments to ``ijson.items()`` and the library's reading helpers, like ``use_float``."""
+        return {"use_float": True} if getattr(self.args, "use_float", False) else {}
+
     def items(self, **kwargs):
         """Yield the items in the input. If an item is an array, yield each entry of the array."""
-        for item in super().items(**kwargs):
+        for item in super().items(**self.parse_kwargs(), **kwargs):
             if isinstance(item, list):
                 yield from item
             else:
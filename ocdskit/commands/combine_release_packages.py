@@ -1,5 +1,7 @@
 from ocdskit.combine import combine_release_packages
 from ocdskit.commands.base import OCDSCommand
+from ocdskit.exceptions import CommandError
+from ocdskit.util import iter_package_entries, iter_package_metadata
 
 
 class Command(OCDSCommand):
@@ -8,10 +10,35 @@ class Command(OCDSCommand):
 
     def add_arguments(self):
         self.add_package_arguments("release")
+        self.add_argument(
+            "--streaming",
+            action="store_true",
+            help="read the input twice (from a temporary copy), to print the releases without reading them all into "
+            "memory",
+        )
+        self.add_input_arguments()
 
     def handle(self):
         kwargs = self.parse_package_arguments()
 
-        output = combine_release_packages(self.items(), **kwargs)
+        if self.args.streaming and (self.args.input_workers != 1 or self.args.unordered):
+            raise CommandError("--input-workers and --unordered can't be combined with --streaming.")
 
-        self.print(output)
+        if not self.args.streaming:
+            self.print(combine_release_packages(self.items(), **kwargs))
+            return
+
+        with self.spool() as file:
+            # The first pass reads the packages' metadata, and the second pass reads the releases.
+            def releases():
+                file.seek(0)
+                yield from iter_package_entries(
+                    file, "releases", self.prefix(), jsonl=self.jsonl(), **self.parse_kwargs()
+                )
+
+            packages = iter_package_metadata(
+                file, "releases", self.prefix(), jsonl=self.jsonl(), **self.parse_kwargs()
+            )
+            output = combine_release_packages(packages, releases=releases(), **kwargs)
+
+            self.print(output, streaming=True)
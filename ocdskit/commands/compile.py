@@ -1,5 +1,8 @@
+import itertools
+import json
 import logging
 import sys
+import time
 
 import ocdskit.packager
 from ocdskit.combine import merge
@@ -9,8 +12,11 @@ from ocdskit.exceptions import (
     InconsistentVersionError,
     MissingOcidKeyError,
     NonObjectReleaseError,
+    UngroupedOcidError,
+    UnknownBackendError,
     UnknownVersionError,
 )
+from ocdskit.util import _Stage
 
 logger = logging.getLogger("ocdskit")
 
@@ -37,7 +43,61 @@ class Command(OCDSCommand):
             "print versioned releases instead of compiled releases",
         )
 
+        self.add_argument(
+            "--workers",
+            type=int,
+            default=1,
+            help="the number of worker processes in which to merge releases (0 for the number of CPUs)",
+        )
+        self.add_argument(
+            "--store",
+            help="the path to a SQLite database in which to keep releases across runs, to only print the OCIDs with "
+            "new releases",
+        )
+        self.add_argument(
+            "--assume-grouped",
+            action="store_true",
+            help="assume that the releases for each OCID are contiguous in the input, to merge them while reading",
+        )
+        self.add_argument(
+            "--cache-dir",
+            help="the directory in which to cache patched release schemas and merge rules, if --schema isn't set "
+            "(default: the OCDSKIT_CACHE_DIR environment variable, if set)",
+        )
+        self.add_argument(
+            "--compression",
+            choices=("zlib", "zstd"),
+            help="the format in which to compress releases while they are stored (zstd requires Python 3.14 or the "
+            "zstandard package)",
+        )
+        self.add_argument("--compression-level", type=int, help="the compression level, if --compression is set")
+        self.add_argument(
+            "--deduplicate",
+            choices=("memory", "disk"),
+            help="drop duplicate releases before they are stored, keeping the fingerprints of releases in memory or "
+            "on disk (or in the store, if --store is set)",
+        )
+        self.add_argument(
+            "--backend",
+            help="the backend in which to store releases: python, sqlite (default), external-sort, or the name of a "
+            "backend registered by another package",
+        )
+        self.add_argument(
+            "--backend-option",
+            action="append",
+            default=[],
+            help="an option with which to create the backend, like memory_budget=1000000000 (can be repeated)",
+            metavar="KEY=VALUE",
+        )
+
+        self.add_argument(
+            "--pipeline",
+            action="store_true",
+            help="parse the input and merge releases in separate threads, and print the throughput of each stage",
+        )
+
         self.add_package_arguments("record", "if --package is set, ")
+        self.add_input_arguments()
 
     def handle(self):
         kwargs = self.parse_package_arguments()
@@ -45,20 +105,61 @@ class Command(OCDSCommand):
         kwargs["return_package"] = self.args.package
         kwargs["use_linked_releases"] = self.args.linked_releases
         kwargs["return_versioned_release"] = self.args.versioned
+        kwargs["workers"] = self.args.workers
+        kwargs["store"] = self.args.store
+        kwargs["assume_grouped"] = self.args.assume_grouped
+        kwargs["cache_dir"] = self.args.cache_dir
+        kwargs["compression"] = self.args.compression
+        kwargs["compression_level"] = self.args.compression_level
+        kwargs["deduplicate"] = self.args.deduplicate
+        kwargs["backend"] = self.args.backend
+        kwargs["backend_options"] = self.parse_backend_options()
+
+        if self.args.assume_grouped and (
+            self.args.store or self.args.compression or self.args.backend or self.args.backend_option
+        ):
+            raise CommandError(
+                "--assume-grouped can't be combined with --store, --compression, --backend or --backend-option."
+            )
+        if self.args.backend not in (None, "sqlite") and (self.args.store or self.args.compression):
+            raise CommandError("--store and --compression require --backend sqlite.")
+        if not ocdskit.packager.USING_SQLITE and (
+            self.args.store
+            or self.args.compression
+            or self.args.deduplicate == "disk"
+            or self.args.backend == "sqlite"
+        ):
+            raise CommandError(
+                "sqlite3 is unavailable, so --store, --compression, --deduplicate disk and --backend sqlite can't be "
+                "used."
+            )
 
-        if not ocdskit.packager.USING_SQLITE:
+        if (
+            not ocdskit.packager.USING_SQLITE
+            and not self.args.store
+            and not self.args.assume_grouped
+            and not self.args.backend
+        ):
             logger.warning(
                 "sqlite3 is unavailable, so the command will run in memory. If input files are too large, "
                 "the command might exceed available memory."
             )
 
         try:
-            for output in merge(self.items(), streaming=True, **kwargs):
-                self.print(output, streaming=self.args.package)
+            if self.args.pipeline:
+                self.handle_pipeline(kwargs)
+            else:
+                for output in merge(self.items(), streaming=True, **kwargs):
+                    self.print(output, streaming=self.args.package)
         except MissingOcidKeyError as e:
             raise CommandError("The `ocid` field of at least one release is missing.") from e
         except NonObjectReleaseError as e:
             raise CommandError(f"At least one release is a {e}, not a dict.") from e
+        except UngroupedOcidError as e:
+            raise CommandError(f"{e}. Try without --assume-grouped.") from e
+        except UnknownBackendError as e:
+            names = ", ".join(ocdskit.packager.get_backend_names())
+            raise CommandError(f'The backend "{e}" is not recognized. Try one of: {names}.') from e
         except UnknownVersionError as e:
             raise CommandError(f'The `version` value ("{e}") of a release package is not recognized.') from e
         except InconsistentVersionError as e:
@@ -70,3 +171,51 @@ class Command(OCDSCommand):
                 f"{e}\nTry first upgrading items to the same version:\n  cat file [file ...] | ocdskit upgrade "
                 f"{versions[0]}:{versions[1]} | ocdskit {' '.join(sys.argv[1:])}"
             ) from e
+
+    def parse_backend_options(self):
+        """Return the backend options as a dictionary. Values are parsed as JSON, if possible."""
+        options = {}
+        for option in self.args.backend_option:
+            key, separator, value = option.partition("=")
+            if not separator:
+                raise CommandError(f"The backend option {option!r} is not like KEY=VALUE.")
+            try:
+                options[key] = json.loads(value)
+            except ValueError:
+                options[key] = value
+        return options
+
+    def handle_pipeline(self, kwargs):
+        """
+        Parse the input in one thread, store and merge releases in another thread, and serialize the output in this
+        thread. If ``--package`` is set, releases are stored in this thread, before the package is serialized.
+        """
+        parse = _Stage("parse", self.items())
+        stages = [parse]
+        serialize = 0.0
+
+        try:
+            outputs = merge(parse, streaming=True, **kwargs)
+            if self.args.package:
+                package = next(outputs)
+                package["records"] = _Stage("merge", package["records"])
+                stages.append(package["records"])
+                # Exhaust the generator, to close the packager.
+                outputs = itertools.chain([package], outputs)
+            else:
+                outputs = _Stage("merge", outputs)
+                stages.append(outputs)
+
+            for output in outputs:
+                start = time.perf_counter()
+                self.print(output, streaming=self.args.package)
+                serialize += time.perf_counter() - start
+        finally:
+            for stage in stages:
+                stage.close()
+
+        # If --package is set, the records are merged while the package is serialized.
+        serialize -= stages[-1].waited if self.args.package else 0
+        for stage in stages:
+            print(stage.report(), file=sys.stderr)
+        print(f"serialize: {stages[-1].items} items in {serialize:.2f}s", file=sys.stderr)
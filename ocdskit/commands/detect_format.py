@@ -1,5 +1,5 @@
 import logging
-import os.path
+from functools import partial
 
 from ocdskit.commands.base import OCDSCommand
 from ocdskit.exceptions import UnknownFormatError
@@ -15,26 +15,39 @@ class Command(OCDSCommand):
     def add_arguments(self):
         self.add_argument("file", help="OCDS files", nargs="+")
         self.add_argument("-r", "--recursive", help="recursively indent JSON files", action="store_true")
+        self.add_argument(
+            "--bounded",
+            action="store_true",
+            help="stop parsing each file once its format is decided, instead of parsing the entire file",
+        )
+        self.add_argument(
+            "--max-bytes",
+            type=int,
+            help="the maximum number of bytes to read from each file (if reached, whether a file is concatenated JSON "
+            "can be unknown)",
+        )
+        self.add_file_arguments()
 
     def handle(self):
-        for file in self.args.file:
-            if os.path.isfile(file):
-                self.detect_format(file)
-            elif self.args.recursive:
-                for root, _, files in os.walk(file):
-                    for name in files:
-                        if not name.startswith("."):
-                            self.detect_format(os.path.join(root, name))
-            elif os.path.isdir(file):
-                logger.warning("%s is a directory. Set --recursive to recurse into directories.", file)
-            else:
-                logger.error("%s: No such file or directory", file)
-
-    def detect_format(self, path):
-        try:
-            _print(path, *detect_format(path, self.args.root_path))
-        except UnknownFormatError as e:
-            logger.warning("%s: unknown (%s)", path, e)
+        options = {"root_path": self.args.root_path, "bounded": self.args.bounded, "max_bytes": self.args.max_bytes}
+        function = partial(_detect_format, **options)
+
+        self.map_files(function, _callback, lambda name: not name.startswith("."), options)
+
+
+def _callback(path, value):
+    result, error = value
+    if error is None:
+        _print(path, *result)
+    else:
+        logger.warning("%s: unknown (%s)", path, error)
+
+
+def _detect_format(path, **kwargs):
+    try:
+        return detect_format(path, **kwargs), None
+    except UnknownFormatError as e:
+        return None, str(e)
 
 
 def _print(path, detected_format, is_concatenated, is_array):
@@ -45,5 +58,7 @@ def _print(path, detected_format, is_concatenated, is_array):
 
     if is_concatenated:
         string = f"concatenated JSON, starting with {string}"
+    elif is_concatenated is None:
+        string = f"{string} (unknown whether concatenated JSON)"
 
     print(f"{path}: {string}")
@@ -5,6 +5,9 @@ class Command(OCDSCommand):
     name = "echo"
     help = "Repeats the input, applying --encoding, --ascii, --pretty and --root-path, and using the UTF-8 encoding"
 
+    def add_arguments(self):
+        self.add_input_arguments()
+
     def handle(self):
         for data in self.items():
             self.print(data)
@@ -0,0 +1,33 @@
+import logging
+
+from ocdskit.commands.base import BaseCommand
+from ocdskit.exceptions import CommandError, StaleIndexError
+from ocdskit.index import Index
+
+logger = logging.getLogger("ocdskit")
+
+
+class Command(BaseCommand):
+    name = "get"
+    help = "reads the releases or records for OCIDs from a file indexed by the index command"
+
+    def add_arguments(self):
+        self.add_argument("file", help="an indexed file")
+        self.add_argument("ocid", help="the OCIDs of the releases or records to read", nargs="+")
+        self.add_argument("--index", help="the path to the index (default: the file's path, plus .ocid-index)")
+
+    def handle(self):
+        try:
+            index = Index(self.args.file, self.args.index)
+        except FileNotFoundError as e:
+            raise CommandError(f"{e.filename} doesn't exist. Run the index command first.") from e
+        except StaleIndexError as e:
+            raise CommandError(f"{e}. Run the index command again.") from e
+
+        with index:
+            for ocid in self.args.ocid:
+                items = index.get(ocid)
+                if not items:
+                    logger.warning("%s: OCID not found", ocid)
+                for data in items:
+                    self.print(data)
@@ -0,0 +1,19 @@
+import logging
+
+from ocdskit.commands.base import BaseCommand
+from ocdskit.index import build_index
+
+logger = logging.getLogger("ocdskit")
+
+
+class Command(BaseCommand):
+    name = "index"
+    help = "indexes the releases or records in a file by OCID, for use with the get command"
+
+    def add_arguments(self):
+        self.add_argument("file", help="an uncompressed file of packages, releases or records")
+        self.add_argument("--index", help="the path to the index (default: the file's path, plus .ocid-index)")
+
+    def handle(self):
+        count = build_index(self.args.file, self.args.index)
+        logger.info("%s: indexed %d releases or records", self.args.file, count)
@@ -12,6 +12,7 @@ class Command(OCDSCommand):
         self.add_argument("--size", type=int, help="the maximum number of records per package")
 
         self.add_package_arguments("record")
+        self.add_input_arguments()
 
     def handle(self):
         kwargs = self.parse_package_arguments()
@@ -1,4 +1,5 @@
 from ocdskit.commands.base import OCDSCommand
+from ocdskit.util import iter_package_metadata, iter_split_packages
 
 
 class Command(OCDSCommand):
@@ -7,17 +8,22 @@ class Command(OCDSCommand):
 
     def add_arguments(self):
         self.add_argument("size", type=int, help="the number of records per package")
+        self.add_input_arguments(workers=False)
 
     def handle(self):
-        # See exploration of not reading each input into memory: https://github.com/open-contracting/ocdskit/issues/118
-        for package in self.items():
-            records = package["records"]
+        # Packages are printed as records are read, instead of after reading each input into memory.
+        # https://github.com/open-contracting/ocdskit/issues/118
+        with self.spool() as file:
+            # The first pass reads the packages' metadata, which can follow the records (like "uri" and "version", if
+            # keys are sorted), and the second pass reads the records.
+            kwargs = self.parse_kwargs()
+            metadata = list(iter_package_metadata(file, "records", self.prefix(), jsonl=self.jsonl(), **kwargs))
+            file.seek(0)
 
-            # We can't determine which records came from which packages.
-            if "packages" in package:
-                del package["packages"]
-
-            for i in range(0, len(records), self.args.size):
-                package.update(records=records[i : i + self.args.size])
+            for package in iter_split_packages(
+                file, "records", self.args.size, self.prefix(), jsonl=self.jsonl(), metadata=metadata, **kwargs
+            ):
+                # We can't determine which records came from which packages.
+                package.pop("packages", None)
 
                 self.print(package)
@@ -1,4 +1,5 @@
 from ocdskit.commands.base import OCDSCommand
+from ocdskit.util import iter_package_metadata, iter_split_packages
 
 
 class Command(OCDSCommand):
@@ -7,13 +8,19 @@ class Command(OCDSCommand):
 
     def add_arguments(self):
         self.add_argument("size", type=int, help="the number of releases per package")
+        self.add_input_arguments(workers=False)
 
     def handle(self):
-        # See exploration of not reading each input into memory: https://github.com/open-contracting/ocdskit/issues/118
-        for package in self.items():
-            releases = package["releases"]
-
-            for i in range(0, len(releases), self.args.size):
-                package.update(releases=releases[i : i + self.args.size])
+        # Packages are printed as releases are read, instead of after reading each input into memory.
+        # https://github.com/open-contracting/ocdskit/issues/118
+        with self.spool() as file:
+            # The first pass reads the packages' metadata, which can follow the releases (like "uri" and "version", if
+            # keys are sorted), and the second pass reads the releases.
+            kwargs = self.parse_kwargs()
+            metadata = list(iter_package_metadata(file, "releases", self.prefix(), jsonl=self.jsonl(), **kwargs))
+            file.seek(0)
 
+            for package in iter_split_packages(
+                file, "releases", self.args.size, self.prefix(), jsonl=self.jsonl(), metadata=metadata, **kwargs
+            ):
                 self.print(package)
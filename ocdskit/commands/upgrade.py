@@ -1,8 +1,17 @@
-from collections import OrderedDict  # for move_to_end()
+import functools
+import logging
+import os
+from itertools import chain, islice
 
 from ocdskit import upgrade
 from ocdskit.commands.base import OCDSCommand
 from ocdskit.exceptions import CommandError
+from ocdskit.util import _parallel_map, jsonlib
+
+logger = logging.getLogger("ocdskit")
+
+# The number of items to send to a worker process at a time, to amortize the cost of inter-process communication.
+BATCH_SIZE = 100
 
 
 class Command(OCDSCommand):
@@ -16,6 +25,13 @@ class Command(OCDSCommand):
             action="store_true",
             help="don't move identifying fields like 'ocid' to the top of objects",
         )
+        self.add_argument(
+            "--workers",
+            type=int,
+            default=1,
+            help="the number of worker processes in which to upgrade items (0 for the number of CPUs)",
+        )
+        self.add_input_arguments()
 
     def handle(self):
         versions = self.args.versions
@@ -30,7 +46,66 @@ class Command(OCDSCommand):
             raise CommandError(message) from e
 
         reorder = not self.args.no_reorder
-        map_type = OrderedDict if reorder else dict
 
-        for data in self.items(map_type=map_type):
-            self.print(upgrade_method(data, reorder=reorder))
+        workers = self.args.workers or os.cpu_count()
+        if workers <= 1:
+            for data in self.items():
+                self.print(upgrade_method(data, reorder=reorder))
+            return
+
+        # If the input is JSON Lines, the lines are parsed in the worker processes, instead of in this process, unless
+        # --input-workers is set.
+        if self.jsonl() and not self.prefix() and self.args.input_workers == 1:
+            items = self.lines()
+            loads = jsonlib.loads
+        else:
+            items = self.items()
+            loads = None
+
+        function = functools.partial(_upgrade_in_worker, upgrade_method, loads=loads, reorder=reorder)
+        for batch, records in _parallel_map(function, _batched(items, BATCH_SIZE), workers):
+            for record in records:
+                logger.handle(record)
+            for data in batch:
+                self.print(data)
+
+    def lines(self):
+        """Yield the non-blank lines in the input."""
+        reader = self.reader()
+        while line := reader.readline():
+            if not line.isspace():
+                yield line
+
+
+def _batched(iterable, n):
+    iterator = iter(iterable)
+    while batch := list(islice(iterator, n)):
+        yield batch
+
+
+class _RecordingHandler(logging.Handler):
+    def __init__(self):
+        super().__init__()
+        self.records = []
+
+    def emit(self, record):
+        # Format the message, in case its arguments can't be pickled.
+        record.msg = record.getMessage()
+        record.args = None
+        self.records.append(record)
+
+
+def _upgrade_in_worker(upgrade_method, items, *, loads, **kwargs):
+    # Log records are returned, to be handled in the main process.
+    handler = _RecordingHandler()
+    propagate = logger.propagate
+    logger.addHandler(handler)
+    logger.propagate = False
+    try:
+        if loads:
+            # Like `OCDSCommand.items()`, if an item is an array, yield each entry of the array.
+            items = chain.from_iterable(data if isinstance(data, list) else [data] for data in map(loads, items))
+        return [upgrade_method(data, **kwargs) for data in items], handler.records
+    finally:
+        logger.removeHandler(handler)
+        logger.propagate = propagate
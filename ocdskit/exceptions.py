@@ -31,10 +31,26 @@ class UnknownVersionError(OCDSKitError):
     """Raised if the OCDS version is not recognized."""
 
 
+class UnknownBackendError(OCDSKitError):
+    """Raised if the name of a packager backend is not recognized."""
+
+
 class MissingOcidKeyError(OCDSKitError, KeyError):
     """Raised if a release to be merged is missing an ``ocid`` field."""
 
 
+class UngroupedOcidError(OCDSKitError):
+    """Raised if the releases for an OCID are not contiguous, when assumed to be grouped by OCID."""
+
+    def __init__(self, message, ocid=None):
+        self.ocid = ocid
+        super().__init__(message)
+
+
+class StaleIndexError(OCDSKitError):
+    """Raised if an indexed file changed since it was indexed."""
+
+
 class OCDSKitWarning(UserWarning):
     """Base class for warnings from within this package."""
 
@@ -47,5 +63,17 @@ class MissingReleasesWarning(OCDSKitWarning):
     """Used when the "releases" field is missing from a release package when combining packages."""
 
 
+class DuplicateReleasesWarning(OCDSKitWarning):
+    """Used when duplicate releases are dropped when merging."""
+
+
+class LateMetadataWarning(OCDSKitWarning):
+    """Used when a package's metadata follows its releases or records when splitting packages."""
+
+
+class IgnoredMetadataWarning(OCDSKitWarning):
+    """Used when the metadata or extensions of packages after the first are ignored when merging grouped releases."""
+
+
 class MergeErrorWarning(OCDSKitWarning):
     """Used when downgrading an OCDS Merge exception to a warning."""
@@ -0,0 +1,237 @@
+"""Index the releases or records in a file by OCID, to read those for an OCID without parsing the entire file."""
+
+from __future__ import annotations
+
+import contextlib
+import errno
+import json
+import mmap
+import os
+import sqlite3
+
+from ocdskit.exceptions import StaleIndexError
+from ocdskit.util import COLON, OPEN, STRING, TOKEN, _decode, jsonlib
+
+#: The suffix of the default path to a file's index.
+INDEX_SUFFIX = ".ocid-index"
+
+# The number of rows to insert at a time.
+INSERT_BATCH_SIZE = 10000
+
+# The keys of the arrays whose entries are indexed, if in a package.
+ENTRY_KEYS = {b'"releases"', b'"records"'}
+
+# The maximum number of bytes to decode, to find the end of a top-level value, before scanning it instead. A package
+# is scanned, to find its releases or records.
+DOCUMENT_DECODE_LIMIT = 2**24
+
+
+class _Frame:
+    """An object or array that is being scanned."""
+
+    __slots__ = ("entries", "is_document", "is_entries", "is_top_array", "key", "ocid", "start")
+
+    def __init__(self, start):
+        self.start = start
+        self.key = None
+        self.ocid = None
+        self.is_document = False
+        self.is_top_array = False
+        self.is_entries = False
+        # The entries in the document's "releases" or "records" array, if it is a package.
+        self.entries = []
+
+
+def iter_offsets(buffer):
+    """
+    Yield the OCID, start offset and end offset of each release or record in a buffer of JSON data.
+
+    The buffer can contain concatenated JSON or JSON Lines. Each top-level value, or each item of a top-level array,
+    is a release, record, release package or record package. The releases or records of a package are yielded, and
+    other releases or records are yielded whole. Releases and records without a string ``ocid`` are skipped.
+
+    A package is scanned for its structure, and each of its releases or records is decoded at once, to find its end.
+
+    :param buffer: a bytes-like object, like a memory-mapped file
+    """
+    stack = []
+    document = None
+    string = None
+    ocid_frame = None
+
+    search = TOKEN.search
+    pos = 0
+    while match := search(buffer, pos):
+        pos = match.end()
+        token = match.lastindex
+
+        if token == STRING:
+            if ocid_frame:
+                ocid_frame.ocid = json.loads(match.group())
+                ocid_frame = None
+            else:
+                string = match
+            continue
+
+        ocid_frame = None
+
+        if token == COLON:
+            frame = stack[-1]
+            if frame.is_document:
+                frame.key = string.group()
+                if frame.key == b'"ocid"':
+                    ocid_frame = frame
+        elif token == OPEN:
+            start = match.start()
+            parent = stack[-1] if stack else None
+            frame = _Frame(start)
+            if match.group() == b"{":
+                if parent is None or parent.is_top_array:
+                    decoded = _decode(buffer, start, DOCUMENT_DECODE_LIMIT)
+                    if decoded:
+                        value, pos = decoded
+                        if "ocid" in value:
+                            if isinstance(value["ocid"], str):
+                                yield value["ocid"], start, pos
+                            continue
+                        # Scan a package, to find the offsets of its releases or records.
+                        if not any(isinstance(value.get(key), list) for key in ("releases", "records")):
+                            continue
+                        pos = match.end()
+                    frame.is_document = True
+                    document = frame
+                elif parent.is_entries:
+                    value, pos = _decode(buffer, start)
+                    if isinstance(value.get("ocid"), str):
+                        document.entries.append((value["ocid"], start, pos))
+                    continue
+            elif parent is None:
+                frame.is_top_array = True
+            elif parent.is_document and parent.key in ENTRY_KEYS:
+                frame.is_entries = True
+            stack.append(frame)
+        else:  # CLOSE
+            frame = stack.pop()
+            if frame.is_document:
+                # A release or record has an `ocid` field. A package doesn't.
+                if frame.ocid is not None:
+                    if isinstance(frame.ocid, str):
+                        yield frame.ocid, frame.start, match.end()
+                else:
+                    yield from frame.entries
+                document = None
+
+
+def get_index_path(path: str) -> str:
+    """Return the default path to a file's index."""
+    return f"{path}{INDEX_SUFFIX}"
+
+
+def build_index(path: str, index_path: str | None = None) -> int:
+    """
+    Index the releases or records in a file by OCID, and return the number of releases or records indexed.
+
+    See :func:`~ocdskit.index.iter_offsets` for the supported formats. The file must be uncompressed.
+
+    :param path: the path to the file
+    :param index_path: the path to the index (default: the path to the file, plus ``.ocid-index``)
+    """
+    if index_path is None:
+        index_path = get_index_path(path)
+
+    stat = os.stat(path)
+    # Write to a temporary file, to replace the index atomically.
+    temporary_path = f"{index_path}.{os.getpid()}.tmp"
+
+    count = 0
+    try:
+        connection = sqlite3.connect(temporary_path)
+        try:
+            connection.execute("CREATE TABLE metadata (size INTEGER, mtime_ns INTEGER)")
+            connection.execute("CREATE TABLE entries (ocid TEXT NOT NULL, start INTEGER, length INTEGER)")
+            connection.execute("INSERT INTO metadata VALUES (?, ?)", (stat.st_size, stat.st_mtime_ns))
+
+            if stat.st_size:
+                with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as buffer:
+                    batch = []
+                    for ocid, start, end in iter_offsets(buffer):
+                        batch.append((ocid, start, end - start))
+                        if len(batch) >= INSERT_BATCH_SIZE:
+                            connection.executemany("INSERT INTO entries VALUES (?, ?, ?)", batch)
+                            count += len(batch)
+                            batch.clear()
+                    connection.executemany("INSERT INTO entries VALUES (?, ?, ?)", batch)
+                    count += len(batch)
+
+            # Create the index after inserting the rows, which is faster.
+            connection.execute("CREATE INDEX entries_ocid ON entries (ocid)")
+            connection.commit()
+        finally:
+            connection.close()
+        os.replace(temporary_path, index_path)
+    except BaseException:
+        with contextlib.suppress(FileNotFoundError):
+            os.remove(temporary_path)
+        raise
+
+    return count
+
+
+class Index:
+    """
+    Read the releases or records for an OCID from an indexed file, without parsing the rest of the file.
+
+    .. code-block:: python
+
+       with Index(path) as index:
+           releases = index.get("ocds-213czf-1")
+    """
+
+    def __init__(self, path: str, index_path: str | None = None):
+        """
+        :param path: the path to the indexed file
+        :param index_path: the path to the index (default: the path to the file, plus ``.ocid-index``)
+        :raises FileNotFoundError: if the file or index doesn't exist
+        :raises StaleIndexError: if the file changed since it was indexed
+        """
+        if index_path is None:
+            index_path = get_index_path(path)
+        # sqlite3.connect() would create a missing index.
+        if not os.path.isfile(index_path):
+            raise FileNotFoundError(errno.ENOENT, os.strerror(errno.ENOENT), index_path)
+
+        stat = os.stat(path)
+        self.connection = sqlite3.connect(index_path)
+        metadata = self.connection.execute("SELECT size, mtime_ns FROM metadata").fetchone()
+        if metadata != (stat.st_size, stat.st_mtime_ns):
+            self.connection.close()
+            raise StaleIndexError(f"{path} changed since it was indexed")
+
+        self.file = open(path, "rb")  # noqa: SIM115
+        self.buffer = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ) if stat.st_size else None
+
+    def get_bytes(self, ocid: str) -> list[bytes]:
+        """Return the JSON texts of the releases or records for the OCID, in the order in which they occur."""
+        return [
+            self.buffer[start : start + length]
+            for start, length in self.connection.execute(
+                "SELECT start, length FROM entries WHERE ocid = ? ORDER BY start", (ocid,)
+            )
+        ]
+
+    def get(self, ocid: str) -> list[dict]:
+        """Return the releases or records for the OCID, in the order in which they occur."""
+        return [jsonlib.loads(data) for data in self.get_bytes(ocid)]
+
+    def close(self):
+        """Close the file and the index."""
+        if self.buffer is not None:
+            self.buffer.close()
+        self.file.close()
+        self.connection.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
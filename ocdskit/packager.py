@@ -1,18 +1,39 @@
 from __future__ import annotations
 
+import functools
+import hashlib
+import heapq
+import importlib.metadata
 import itertools
 import os
+import struct
 import warnings
+import zlib
 from abc import ABC, abstractmethod
-from collections import defaultdict
-from tempfile import NamedTemporaryFile
+from collections import defaultdict, deque
+from operator import itemgetter
+from tempfile import NamedTemporaryFile, TemporaryFile
 from typing import TYPE_CHECKING
 
 from ocdsmerge.exceptions import InconsistentTypeError
 
-from ocdskit.exceptions import InconsistentVersionError, MergeErrorWarning, MissingOcidKeyError, NonObjectReleaseError
+# flatten(), CompiledRelease, VersionedRelease and their flat_append() methods aren't part of OCDS Merge's public API.
+# They are used by _create_merged_releases(), and are tested with OCDS Merge 0.7 and 0.8.
+from ocdsmerge.flatten import flatten
+from ocdsmerge.merge import CompiledRelease, VersionedRelease
+from ocdsmerge.util import sorted_releases
+
+from ocdskit.exceptions import (
+    InconsistentVersionError,
+    MergeErrorWarning,
+    MissingOcidKeyError,
+    NonObjectReleaseError,
+    UngroupedOcidError,
+    UnknownBackendError,
+)
 from ocdskit.util import (
     _empty_record_package,
+    _parallel_map,
     _remove_empty_optional_metadata,
     _resolve_metadata,
     _update_package_metadata,
@@ -25,6 +46,15 @@ from ocdskit.util import (
 if TYPE_CHECKING:
     import ocdsmerge
 
+# The first byte of a zlib stream with the default window size.
+# https://datatracker.ietf.org/doc/html/rfc1950#section-2.2
+ZLIB_HEADER = b"x"
+# https://datatracker.ietf.org/doc/html/rfc8878#section-3.1.1
+ZSTD_MAGIC_NUMBER = b"\x28\xb5\x2f\xfd"
+
+#: The entry point group in which other packages can register backends, by name.
+BACKEND_ENTRY_POINT_GROUP = "ocdskit.backends"
+
 try:
     import sqlite3
 
@@ -34,6 +64,11 @@ try:
         return json_dumps(data)
 
     def convert_json(string):
+        # Compressed releases are stored as zlib or Zstandard streams. JSON text can't start with either header.
+        if string[:1] == ZLIB_HEADER:
+            string = zlib.decompress(string)
+        elif string[:4] == ZSTD_MAGIC_NUMBER:
+            string = _get_codec("zstd")[1](string)
         return jsonlib.loads(string)
 
     sqlite3.register_adapter(dict, adapt_json)
@@ -42,6 +77,12 @@ except ImportError:
     USING_SQLITE = False
 
 
+def _require_sqlite(name):
+    # `USING_SQLITE` is read at call time, so that tests can patch it.
+    if not USING_SQLITE:
+        raise ImportError(f"sqlite3 is unavailable, so {name} can't be used")
+
+
 # The `warnings.catch_warnings()` context manager resets the `showwarning` method to the module's definition.
 # Accept a `showwarning` method as an argument, to preserve any earlier override (e.g. by `__main__.py`).
 def _showwarning(showwarning, ocid):
@@ -58,23 +99,102 @@ class Packager:
     same version of OCDS.
     """
 
-    def __init__(self, force_version: str | None = None):
+    def __init__(
+        self,
+        force_version: str | None = None,
+        *,
+        store: str | None = None,
+        assume_grouped: bool = False,
+        compression: str | None = None,
+        compression_level: int | None = None,
+        deduplicate: str | None = None,
+        backend: str | AbstractBackend | None = None,
+        backend_options: dict | None = None,
+    ):
         """
         :param force_version: version to use instead of the version of the first release package or individual release
+        :param store: the path to a SQLite database in which to keep releases across runs. If set, only OCIDs with new
+            releases are output, and their output is merged from all their releases, including those from earlier runs.
+        :param assume_grouped: whether the releases for each OCID are contiguous in the input. If so, no backend is
+            used, each OCID is merged as soon as the next OCID is read, and the output is in the same order as the
+            input. Only the first item is read by ``add``; the rest are read as the output is generated, and extensions
+            and metadata that they change or add are set on ``late_extensions`` and ``late_metadata``. It can't be
+            combined with ``store``, ``compression``, ``backend`` or ``backend_options``.
+        :param compression: if SQLite is used, the format in which to compress releases: "zlib" or "zstd"
+        :param compression_level: the compression level, if ``compression`` is set
+        :param deduplicate: whether to drop duplicate releases before they are stored, and where to keep the
+            fingerprints of releases: "memory" or "disk" (in a temporary SQLite database). If ``store`` is set, the
+            fingerprints are kept in the store instead, to also drop duplicates of releases that were added with
+            ``deduplicate`` set in earlier runs. The number of dropped releases is set on ``duplicates``.
+        :param backend: the backend in which to store releases before merging them: a name, as accepted by
+            :func:`~ocdskit.packager.get_backend`, or an instance of :class:`~ocdskit.packager.AbstractBackend`. By
+            default, "sqlite" if sqlite3 is available, and "python" otherwise.
+        :param backend_options: if ``backend`` is a name, keyword arguments with which to create the backend
+        :raises UnknownBackendError: if the name of the backend is not recognized
+        :raises ValueError: if ``store`` or ``compression`` is set, and the backend is not "sqlite", or if
+            ``backend_options`` is set, and ``backend`` is an instance
+        :raises ValueError: if ``assume_grouped`` is set, and ``store``, ``compression``, ``backend`` or
+            ``backend_options`` is set
+        :raises ImportError: if the "sqlite" backend or "disk" deduplication is used, and sqlite3 is unavailable
         """
         self.package = _empty_record_package()
         self.version = force_version
-
-        if USING_SQLITE:
-            self.backend = SQLiteBackend()
-        else:
+        self.assume_grouped = assume_grouped
+        # If `assume_grouped` is set, an iterator of tuples of ``(release, package_uri)``.
+        self.releases = iter(())
+        # If `assume_grouped` is set, the extensions that were first read after the first item, as an insertion-ordered
+        # dict, and whether other package metadata was changed or added after the first item.
+        self.late_extensions = {}
+        self.late_metadata = False
+        self._is_late = False
+
+        if assume_grouped and (store or compression or backend or backend_options):
+            raise ValueError("assume_grouped can't be combined with store, compression, backend or backend_options")
+
+        if backend is None:
+            backend = "sqlite" if store or compression or USING_SQLITE else "python"
+        elif (store or compression) and backend != "sqlite":
+            raise ValueError("store and compression require the sqlite backend")
+
+        if isinstance(backend, AbstractBackend):
+            if backend_options:
+                raise ValueError("backend_options can't be set if backend is an instance")
+            self.backend = backend
+        elif assume_grouped:
+            # The backend is unused.
             self.backend = PythonBackend()
+        else:
+            options = backend_options or {}
+            if backend == "sqlite":
+                options = {
+                    "path": store,
+                    "compression": compression,
+                    "compression_level": compression_level,
+                    **options,
+                }
+            self.backend = get_backend(backend)(**options)
+
+        if deduplicate and isinstance(self.backend, SQLiteBackend) and self.backend.path:
+            # Keep the fingerprints in the store, to drop releases that are duplicates of those from earlier runs.
+            self.fingerprints = SQLiteFingerprints(self.backend.connection)
+        elif deduplicate == "memory":
+            self.fingerprints = MemoryFingerprints()
+        elif deduplicate == "disk":
+            self.fingerprints = SQLiteFingerprints()
+        elif deduplicate:
+            raise ValueError(f"unknown deduplicate value: {deduplicate}")
+        else:
+            self.fingerprints = None
+        # The number of duplicate releases that were dropped.
+        self.duplicates = 0
 
     def __enter__(self):
         return self
 
     def __exit__(self, type_, value, traceback):
         self.backend.close()
+        if self.fingerprints:
+            self.fingerprints.close()
 
     def add(self, data, *, ignore_version: bool = False):
         """
@@ -84,6 +204,23 @@ class Packager:
         :param ignore_version: do not raise an error if the versions are inconsistent across items to merge
         :raises InconsistentVersionError: if the versions are inconsistent across items to merge
         """
+        items = self._iter_releases(data, ignore_version=ignore_version)
+
+        if self.assume_grouped:
+            # Read the first item, to set the version and the package metadata before merging.
+            first = next(items, [])
+            self._is_late = True
+            self.releases = itertools.chain(self.releases, first, itertools.chain.from_iterable(items))
+            return
+
+        for releases in items:
+            for release, uri in releases:
+                self.backend.add_release(release, uri)
+
+            self.backend.flush()
+
+    def _iter_releases(self, data, *, ignore_version):
+        """Yield, for each item, a list of tuples of ``(release, package_uri)``."""
         for i, item in enumerate(data):
             version = get_ocds_minor_version(item)
             if self.version:
@@ -101,21 +238,62 @@ class Packager:
                 self.version = version
 
             if is_release(item):
-                self.backend.add_release(item, "")
+                releases = [(item, "")]
             else:  # release package
                 uri = item.get("uri", "")
 
+                if self._is_late:
+                    self._check_late_metadata(item, uri, version)
                 _update_package_metadata(self.package, item)
 
                 # Note: If there are millions of packages to merge, we should use SQLite to store the packages instead.
                 if uri and version < "1.2":
                     self.package["packages"].append(uri)
 
-                for release in item["releases"]:
-                    if release is not None:  # observed in some release packages
-                        self.backend.add_release(release, uri)
+                # `None` is observed in some release packages.
+                releases = [(release, uri) for release in item["releases"] if release is not None]
 
-            self.backend.flush()
+            if self.fingerprints:
+                releases = [pair for pair in releases if not self._is_duplicate(pair[0])]
+
+            yield releases
+
+    def _check_late_metadata(self, package, uri, version):
+        for extension in package.get("extensions", ()):
+            if extension not in self.package["extensions"]:
+                self.late_extensions[extension] = None
+                self.late_metadata = True
+        if (uri and version < "1.2") or any(
+            field in package and package[field] != self.package[field]
+            for field in ("publisher", "license", "publicationPolicy")
+        ):
+            self.late_metadata = True
+
+    def _is_duplicate(self, release):
+        if self.fingerprints.add(_fingerprint(release)):
+            return False
+        self.duplicates += 1
+        return True
+
+    def get_releases_by_ocid(self):
+        """
+        Yield an OCID and an iterable of tuples of ``(ocid, package_uri, release)``.
+
+        If ``assume_grouped`` is set, OCIDs are yielded in the order of the input. Otherwise, OCIDs are yielded in
+        alphabetical order.
+
+        :raises UngroupedOcidError: if ``assume_grouped`` is set, and an OCID's releases are not contiguous
+        """
+        if not self.assume_grouped:
+            yield from self.backend.get_releases_by_ocid()
+            return
+
+        seen = set()
+        for ocid, group in itertools.groupby(self.releases, lambda pair: _get_ocid(pair[0])):
+            if ocid in seen:
+                raise UngroupedOcidError(f"the releases for OCID {ocid} are not contiguous", ocid)
+            seen.add(ocid)
+            yield ocid, ((ocid, uri, release) for release, uri in group)
 
     def output_package(
         self,
@@ -125,6 +303,7 @@ class Packager:
         use_linked_releases: bool = False,
         streaming: bool = False,
         convert_exceptions_to_warnings: bool = False,
+        workers: int = 1,
     ):
         """
         Yield a record package.
@@ -134,12 +313,14 @@ class Packager:
         :param use_linked_releases: whether to use linked releases instead of full releases, if possible
         :param streaming: whether to set the package's records to a generator instead of a list
         :param convert_exceptions_to_warnings: whether to convert inconsistent type errors from OCDS Merge to warnings
+        :param workers: the number of worker processes in which to merge releases (0 for the number of CPUs)
         """
         records = self.output_records(
             merger,
             return_versioned_release=return_versioned_release,
             use_linked_releases=use_linked_releases,
             convert_exceptions_to_warnings=convert_exceptions_to_warnings,
+            workers=workers,
         )
 
         # If a user wants to stream data but can't exhaust records right away, we can add an `autoclose=True` argument.
@@ -147,13 +328,18 @@ class Packager:
         if not streaming:
             records = list(records)
 
-        self.package["records"] = records
+        package = self.package
+        # If releases are read while records are output, later items update a copy of the package metadata.
+        if self.assume_grouped:
+            package = package.copy()
 
-        _resolve_metadata(self.package, "packages")
-        _resolve_metadata(self.package, "extensions")
-        _remove_empty_optional_metadata(self.package)
+        package["records"] = records
 
-        yield self.package
+        _resolve_metadata(package, "packages")
+        _resolve_metadata(package, "extensions")
+        _remove_empty_optional_metadata(package)
+
+        yield package
 
     def output_records(
         self,
@@ -162,6 +348,7 @@ class Packager:
         return_versioned_release: bool = False,
         use_linked_releases: bool = False,
         convert_exceptions_to_warnings: bool = False,
+        workers: int = 1,
     ):
         """
         Yield records, ordered by OCID.
@@ -170,17 +357,21 @@ class Packager:
         :param return_versioned_release: whether to include a versioned release in the record
         :param use_linked_releases: whether to use linked releases instead of full releases, if possible
         :param convert_exceptions_to_warnings: whether to convert inconsistent type errors from OCDS Merge to warnings
+        :param workers: the number of worker processes in which to merge releases (0 for the number of CPUs)
         """
-        for ocid, rows in self.backend.get_releases_by_ocid():
+        for ocid, rows, merged in self._merge(
+            merger,
+            return_compiled_release=True,
+            return_versioned_release=return_versioned_release,
+            convert_exceptions_to_warnings=convert_exceptions_to_warnings,
+            workers=workers,
+        ):
             record = {
                 "ocid": ocid,
                 "releases": [],
             }
 
-            releases = []
             for _, uri, release in rows:
-                releases.append(release)
-
                 if use_linked_releases and uri:
                     package_release = {
                         "url": uri + "#" + release["id"],
@@ -191,19 +382,7 @@ class Packager:
                     package_release = release
                 record["releases"].append(package_release)
 
-            showwarning = warnings.showwarning
-            with warnings.catch_warnings():
-                warnings.showwarning = _showwarning(showwarning, ocid)
-
-                try:
-                    record["compiledRelease"] = merger.create_compiled_release(releases)
-                    if return_versioned_release:
-                        record["versionedRelease"] = merger.create_versioned_release(releases)
-                except InconsistentTypeError as e:
-                    if convert_exceptions_to_warnings:
-                        warnings.warn(str(e), category=MergeErrorWarning, stacklevel=2)
-                    else:
-                        raise
+            record.update(merged)
 
             yield record
 
@@ -213,6 +392,7 @@ class Packager:
         *,
         return_versioned_release: bool = False,
         convert_exceptions_to_warnings: bool = False,
+        workers: int = 1,
     ):
         """
         Yield compiled releases or versioned releases, ordered by OCID.
@@ -220,24 +400,165 @@ class Packager:
         :param merger: a merger
         :param return_versioned_release: whether to yield versioned releases instead of compiled releases
         :param convert_exceptions_to_warnings: whether to convert inconsistent type errors from OCDS Merge to warnings
+        :param workers: the number of worker processes in which to merge releases (0 for the number of CPUs)
+        """
+        key = "versionedRelease" if return_versioned_release else "compiledRelease"
+
+        for _, _, merged in self._merge(
+            merger,
+            return_compiled_release=not return_versioned_release,
+            return_versioned_release=return_versioned_release,
+            convert_exceptions_to_warnings=convert_exceptions_to_warnings,
+            workers=workers,
+        ):
+            if key in merged:
+                yield merged[key]
+
+    def _merge(self, merger, *, workers=1, **kwargs):
+        """
+        Yield each OCID, its rows, and a dict of its compiled release and/or versioned release, ordered by OCID.
+
+        If ``workers`` is greater than 1 (or 0, for the number of CPUs), merge the releases in a pool of worker
+        processes. OCIDs are independent, so the releases for each OCID are merged in a single task, and the results
+        are yielded in the same order.
         """
-        for ocid, rows in self.backend.get_releases_by_ocid():
-            releases = (row[-1] for row in rows)
+        workers = workers or os.cpu_count()
+        if workers <= 1:
+            for ocid, group in self.get_releases_by_ocid():
+                # The group might be a one-time iterator.
+                rows = list(group)
+
+                showwarning = warnings.showwarning
+                with warnings.catch_warnings():
+                    warnings.showwarning = _showwarning(showwarning, ocid)
+
+                    merged = _merge(merger, [row[-1] for row in rows], **kwargs)
+
+                yield ocid, rows, merged
+            return
+
+        # The rows stay in this process, to not send them back from the worker processes.
+        pending = deque()
+
+        def tasks():
+            for ocid, group in self.get_releases_by_ocid():
+                rows = list(group)
+                pending.append((ocid, rows))
+                yield [row[-1] for row in rows]
+
+        for merged, caught in _parallel_map(
+            functools.partial(_merge_in_worker, **kwargs),
+            tasks(),
+            workers,
+            initializer=_initialize_worker,
+            initargs=(merger,),
+        ):
+            ocid, rows = pending.popleft()
+
+            showwarning = _showwarning(warnings.showwarning, ocid)
+            for message, category, filename, lineno in caught:
+                showwarning(message, category, filename, lineno)
+
+            yield ocid, rows, merged
+
+
+def _merge(merger, releases, *, return_compiled_release, return_versioned_release, convert_exceptions_to_warnings):
+    merged = {}
+
+    try:
+        if return_compiled_release and return_versioned_release:
+            merged["compiledRelease"], merged["versionedRelease"] = _create_merged_releases(merger, releases)
+        elif return_compiled_release:
+            merged["compiledRelease"] = merger.create_compiled_release(releases)
+        elif return_versioned_release:
+            merged["versionedRelease"] = merger.create_versioned_release(releases)
+    except InconsistentTypeError as e:
+        if convert_exceptions_to_warnings:
+            warnings.warn(str(e), category=MergeErrorWarning, stacklevel=2)
+        else:
+            raise
+
+    return merged
+
+
+def _create_merged_releases(merger, releases):
+    """
+    Return a compiled release and a versioned release, sorting and flattening the releases once, instead of once each.
+
+    This is equivalent to calling ``merger.create_compiled_release(releases)`` and
+    ``merger.create_versioned_release(releases)``, except that the two merged releases can share values, like arrays
+    that are merged whole.
+    """
+    compiled_release = CompiledRelease(merge_rules=merger.merge_rules, rule_overrides=merger.rule_overrides)
+    versioned_release = VersionedRelease(merge_rules=merger.merge_rules, rule_overrides=merger.rule_overrides)
+
+    # See ocdsmerge.merge.MergedRelease.append().
+    for original in sorted_releases(releases):
+        release = original.copy()
+
+        ocid = release.get("ocid")
+        release_id = release.get("id")
+        date = release.get("date")
+        tag = release.pop("tag", None)
+
+        flat = flatten(release, merger.merge_rules, merger.rule_overrides, flattened={})
+        compiled_release.flat_append(flat, ocid, release_id, date, tag)
+        # VersionedRelease.flat_append() removes the `ocid` from the flattened release, so it is called last.
+        versioned_release.flat_append(flat, ocid, release_id, date, tag)
+
+    return compiled_release.asdict(), versioned_release.asdict()
+
+
+# The merger is set once per worker process, instead of being pickled with each task.
+_worker_merger = None
+
+
+def _initialize_worker(merger):
+    global _worker_merger  # noqa: PLW0603
+    _worker_merger = merger
+
+
+def _merge_in_worker(releases, **kwargs):
+    # Warnings are recorded, to be shown in the main process with the OCID.
+    with warnings.catch_warnings(record=True) as caught:
+        merged = _merge(_worker_merger, releases, **kwargs)
+
+    return merged, [(w.message, w.category, w.filename, w.lineno) for w in caught]
+
+
+@functools.cache
+def _get_codec(compression, level=None):
+    """Return the compress and decompress functions for the compression format."""
+    if compression == "zlib":
+        return functools.partial(zlib.compress, level=-1 if level is None else level), zlib.decompress
+    if compression == "zstd":
+        try:
+            from compression import zstd  # noqa: PLC0415 # Python 3.14+
+        except ImportError:
+            try:
+                import zstandard  # noqa: PLC0415
+            except ImportError as e:
+                raise ImportError("zstd compression requires Python 3.14 or the zstandard package") from e
+
+            compressor = zstandard.ZstdCompressor(level=3 if level is None else level)
+            return compressor.compress, zstandard.ZstdDecompressor().decompress
+
+        return functools.partial(zstd.compress, level=level), zstd.decompress
+    raise ValueError(f"unknown compression format: {compression}")
+
 
-            showwarning = warnings.showwarning
-            with warnings.catch_warnings():
-                warnings.showwarning = _showwarning(showwarning, ocid)
+def _fingerprint(release):
+    """Return a digest of the release's canonical JSON, which includes its ``ocid`` and ``id``."""
+    return hashlib.blake2b(json_dumps(release, sort_keys=True).encode(), digest_size=16).digest()
 
-                try:
-                    if return_versioned_release:
-                        yield merger.create_versioned_release(releases)
-                    else:
-                        yield merger.create_compiled_release(releases)
-                except InconsistentTypeError as e:
-                    if convert_exceptions_to_warnings:
-                        warnings.warn(str(e), category=MergeErrorWarning, stacklevel=2)
-                    else:
-                        raise
+
+def _get_ocid(release):
+    try:
+        return release["ocid"]
+    except KeyError as e:
+        raise MissingOcidKeyError("ocid") from e
+    except TypeError as e:
+        raise NonObjectReleaseError(type(release).__name__) from e
 
 
 # The backend's responsibilities (for now) are exclusively to:
@@ -254,14 +575,9 @@ class AbstractBackend(ABC):
         (The release might be added to an internal buffer.)
 
         :raises MissingOcidKeyError: if the release is missing an ``ocid`` field
+        :raises NonObjectReleaseError: if the release is not an object
         """
-        try:
-            ocid = release["ocid"]
-        except KeyError as e:
-            raise MissingOcidKeyError("ocid") from e
-        except TypeError as e:
-            raise NonObjectReleaseError(type(release).__name__) from e
-        self._add_release(ocid, package_uri, release)
+        self._add_release(_get_ocid(release), package_uri, release)
 
     @abstractmethod
     def _add_release(self, ocid, package_uri, release):
@@ -297,35 +613,254 @@ class PythonBackend(AbstractBackend):
 class SQLiteBackend(AbstractBackend):
     # "The sqlite3 module internally uses a statement cache to avoid SQL parsing overhead."
     # https://docs.python.org/3/library/sqlite3.html#sqlite3.connect
-    # Note: We never commit changes. SQLite manages the memory usage of uncommitted changes.
+    # Note: We never commit changes to the temporary database. SQLite manages the memory usage of uncommitted changes.
     # https://sqlite.org/atomiccommit.html#_cache_spill_prior_to_commit
-    def __init__(self):
-        self.file = NamedTemporaryFile(delete=False)  # noqa: SIM115
+    # Note: Releases can be added in one thread and read in another (`compile --pipeline`), but not at the same time.
+    def __init__(
+        self, path: str | None = None, *, compression: str | None = None, compression_level: int | None = None
+    ):
+        """
+        :param path: the path to a database in which to keep releases across runs, instead of a temporary file. If
+            set, only the OCIDs with releases that were added since the last run are yielded.
+        :param compression: the format in which to compress releases: "zlib" or "zstd" (Zstandard requires Python 3.14
+            or the ``zstandard`` package). Releases are decompressed as they are yielded.
+        :param compression_level: the compression level, if ``compression`` is set
+        :raises ImportError: if sqlite3 is unavailable
+        """
+        _require_sqlite("SQLiteBackend")
+
+        self.path = path
+        self.compress = _get_codec(compression, compression_level)[0] if compression else None
+
+        if path:
+            self.file = None
+            self.connection = sqlite3.connect(path, detect_types=sqlite3.PARSE_DECLTYPES, check_same_thread=False)
+            # `pending` is set on releases that were added since OCIDs were last yielded.
+            self.connection.execute(
+                "CREATE TABLE IF NOT EXISTS releases (ocid text, uri text, release json, pending integer)"
+            )
+            self.connection.execute("CREATE INDEX IF NOT EXISTS ocid_idx ON releases(ocid)")
+            # https://sqlite.org/partialindex.html
+            self.connection.execute("CREATE INDEX IF NOT EXISTS pending_idx ON releases(ocid) WHERE pending")
+        else:
+            self.file = NamedTemporaryFile(delete=False)  # noqa: SIM115
 
-        # https://docs.python.org/3/library/sqlite3.html#sqlite3.PARSE_DECLTYPES
-        self.connection = sqlite3.connect(self.file.name, detect_types=sqlite3.PARSE_DECLTYPES)
+            # https://docs.python.org/3/library/sqlite3.html#sqlite3.PARSE_DECLTYPES
+            self.connection = sqlite3.connect(
+                self.file.name, detect_types=sqlite3.PARSE_DECLTYPES, check_same_thread=False
+            )
 
-        # https://sqlite.org/tempfiles.html#temp_databases
-        self.connection.execute("CREATE TEMP TABLE releases (ocid text, uri text, release json)")
+            # https://sqlite.org/tempfiles.html#temp_databases
+            self.connection.execute("CREATE TEMP TABLE releases (ocid text, uri text, release json)")
 
         self.buffer = []
 
     def _add_release(self, ocid, package_uri, release):
+        if self.compress:
+            # Stored as a BLOB, which `convert_json` recognizes.
+            release = self.compress(json_dumps(release).encode())
         self.buffer.append((ocid, package_uri, release))
 
     def flush(self):
         # https://docs.python.org/3/library/sqlite3.html#sqlite3.Connection.executemany
-        self.connection.executemany("INSERT INTO releases VALUES (?, ?, ?)", self.buffer)
+        if self.path:
+            self.connection.executemany("INSERT INTO releases VALUES (?, ?, ?, 1)", self.buffer)
+        else:
+            self.connection.executemany("INSERT INTO releases VALUES (?, ?, ?)", self.buffer)
+
+        self.buffer = []
+
+    def get_releases_by_ocid(self):
+        if self.path:
+            results = self.connection.execute(
+                "SELECT ocid, uri, release FROM releases "
+                "WHERE ocid IN (SELECT ocid FROM releases WHERE pending) ORDER BY ocid"
+            )
+            yield from itertools.groupby(results, lambda row: row[0])
+
+            # If all OCIDs were yielded, don't yield them again in the next run.
+            self.connection.execute("UPDATE releases SET pending = 0 WHERE pending")
+        else:
+            self.connection.execute("CREATE INDEX IF NOT EXISTS ocid_idx ON releases(ocid)")
+
+            results = self.connection.execute("SELECT * FROM releases ORDER BY ocid")
+            yield from itertools.groupby(results, lambda row: row[0])
+
+    def close(self):
+        if self.path:
+            self.connection.commit()
+            self.connection.close()
+        else:
+            self.file.close()
+            self.connection.close()
+            os.unlink(self.file.name)
+
+
+class MemoryFingerprints:
+    """A set of release fingerprints, in memory."""
+
+    def __init__(self):
+        self.fingerprints = set()
+
+    def add(self, fingerprint):
+        """Add the fingerprint, and return whether it is new."""
+        if fingerprint in self.fingerprints:
+            return False
+        self.fingerprints.add(fingerprint)
+        return True
+
+    def close(self):
+        """Tidy up any resources used. This is a no-op."""
+
+
+class SQLiteFingerprints:
+    """A set of release fingerprints, in a SQLite database, to not exhaust memory in large runs."""
+
+    def __init__(self, connection=None):
+        """
+        Create a temporary SQLite database, or use the ``connection``'s database.
+
+        :param connection: a connection to a database in which to keep fingerprints across runs, like the connection
+            of a :class:`~ocdskit.packager.SQLiteBackend` with a ``path``. The caller commits and closes it.
+        :raises ImportError: if sqlite3 is unavailable
+        """
+        _require_sqlite("SQLiteFingerprints")
+
+        if connection:
+            self.file = None
+            self.connection = connection
+            # https://sqlite.org/withoutrowid.html
+            self.connection.execute(
+                "CREATE TABLE IF NOT EXISTS fingerprints (fingerprint blob PRIMARY KEY) WITHOUT ROWID"
+            )
+        else:
+            self.file = NamedTemporaryFile(delete=False)  # noqa: SIM115
+            # Fingerprints can be added in a thread other than this one (`compile --pipeline`), but not at the same
+            # time.
+            self.connection = sqlite3.connect(self.file.name, check_same_thread=False)
+            self.connection.execute("CREATE TABLE fingerprints (fingerprint blob PRIMARY KEY) WITHOUT ROWID")
+
+    def add(self, fingerprint):
+        """Add the fingerprint, and return whether it is new."""
+        return self.connection.execute("INSERT OR IGNORE INTO fingerprints VALUES (?)", (fingerprint,)).rowcount == 1
+
+    def close(self):
+        """Delete the database, if temporary."""
+        if self.file:
+            self.file.close()
+            self.connection.close()
+            os.unlink(self.file.name)
+
 
+# The lengths of the OCID, package URI and release of each entry in a run.
+RUN_HEADER = struct.Struct("<III")
+
+
+class ExternalSortBackend(AbstractBackend):
+    """
+    Buffer releases in memory up to a budget, and then write them as a run, sorted by OCID, to a temporary file. Group
+    releases by OCID with a k-way merge of the runs.
+
+    Runs are written and read sequentially, which is faster than random I/O on spinning disks and network volumes.
+    """
+
+    def __init__(self, memory_budget: int = 2**28, max_runs: int = 64, directory: str | None = None):
+        """
+        :param memory_budget: the number of bytes of serialized releases to buffer in memory before writing a run
+        :param max_runs: the number of runs to merge at once. If there are more runs, they are merged into one run.
+        :param directory: the directory in which to write runs (by default, the system's temporary directory)
+        """
+        self.memory_budget = memory_budget
+        self.max_runs = max_runs
+        self.directory = directory
+
+        self.runs = []
         self.buffer = []
+        self.size = 0
+
+    def _add_release(self, ocid, package_uri, release):
+        entry = (ocid.encode(), package_uri.encode(), json_dumps(release).encode())
+        self.buffer.append(entry)
+        self.size += sum(map(len, entry))
+
+        if self.size >= self.memory_budget:
+            self._write_run(sorted(self.buffer, key=itemgetter(0)))
+            self.buffer = []
+            self.size = 0
+
+    def _write_run(self, entries):
+        if len(self.runs) >= self.max_runs:
+            runs = self.runs
+            self.runs = []
+            self._write_run(heapq.merge(*map(_read_run, runs), key=itemgetter(0)))
+            for run in runs:
+                run.close()
+
+        run = TemporaryFile(dir=self.directory, buffering=2**20)  # noqa: SIM115
+        for entry in entries:
+            run.write(RUN_HEADER.pack(*map(len, entry)))
+            run.write(b"".join(entry))
+        run.flush()
+        self.runs.append(run)
 
     def get_releases_by_ocid(self):
-        self.connection.execute("CREATE INDEX IF NOT EXISTS ocid_idx ON releases(ocid)")
+        self.buffer.sort(key=itemgetter(0))
 
-        results = self.connection.execute("SELECT * FROM releases ORDER BY ocid")
-        yield from itertools.groupby(results, lambda row: row[0])
+        entries = heapq.merge(*map(_read_run, self.runs), self.buffer, key=itemgetter(0))
+        for key, group in itertools.groupby(entries, itemgetter(0)):
+            ocid = key.decode()
+            yield ocid, ((ocid, uri.decode(), jsonlib.loads(release)) for _, uri, release in group)
 
     def close(self):
-        self.file.close()
-        self.connection.close()
-        os.unlink(self.file.name)
+        for run in self.runs:
+            run.close()
+
+
+def _read_run(run):
+    run.seek(0)
+    while header := run.read(RUN_HEADER.size):
+        lengths = RUN_HEADER.unpack(header)
+        data = run.read(sum(lengths))
+        ocid_end = lengths[0]
+        uri_end = ocid_end + lengths[1]
+        yield data[:ocid_end], data[ocid_end:uri_end], data[uri_end:]
+
+
+# The backends that are built in, by name.
+BACKENDS = {
+    "python": PythonBackend,
+    "sqlite": SQLiteBackend,
+    "external-sort": ExternalSortBackend,
+}
+
+
+def get_backend(name: str) -> type[AbstractBackend]:
+    """
+    Return the backend class registered under the name.
+
+    The built-in backends are "python" (:class:`~ocdskit.packager.PythonBackend`), "sqlite"
+    (:class:`~ocdskit.packager.SQLiteBackend`) and "external-sort" (:class:`~ocdskit.packager.ExternalSortBackend`).
+    Other packages can register subclasses of :class:`~ocdskit.packager.AbstractBackend` in the ``ocdskit.backends``
+    entry point group. For example, in ``pyproject.toml``:
+
+    .. code-block:: toml
+
+       [project.entry-points."ocdskit.backends"]
+       postgresql = "mypackage.backends:PostgreSQLBackend"
+
+    :raises UnknownBackendError: if the name is not registered
+    """
+    if name in BACKENDS:
+        return BACKENDS[name]
+    for entry_point in importlib.metadata.entry_points(group=BACKEND_ENTRY_POINT_GROUP, name=name):
+        return entry_point.load()
+    raise UnknownBackendError(name)
+
+
+def get_backend_names() -> list[str]:
+    """Return the names of the built-in and registered backends."""
+    names = list(BACKENDS)
+    for entry_point in importlib.metadata.entry_points(group=BACKEND_ENTRY_POINT_GROUP):
+        if entry_point.name not in names:
+            names.append(entry_point.name)
+    return names
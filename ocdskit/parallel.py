@@ -0,0 +1,390 @@
+"""Parse a large JSON file in worker processes, by splitting it into chunks at the boundaries between items."""
+
+from __future__ import annotations
+
+import functools
+import json
+import mmap
+import os
+import re
+from collections import deque
+
+from ocdskit.util import JSONL_DETECTION_LIMIT, TOKEN, _decode, _get_items, _parallel_map, iter_items, jsonlib
+
+#: The approximate number of bytes in each chunk.
+CHUNK_SIZE = 2**24
+
+# Whitespace, as defined by JSON.
+WHITESPACE = re.compile(rb"[ \t\n\r]*")
+
+# The memory-mapped files in a worker process, by path.
+_buffers = {}
+
+
+def iter_items_parallel(path: str, prefix: str = "", workers: int | None = None, *, jsonl=None, chunk_size=CHUNK_SIZE):
+    """
+    Yield the items at the prefix of each JSON value in a file, parsing chunks of the file in worker processes.
+
+    Like :func:`~ocdskit.util.iter_items`, the items are yielded in order. The file must be uncompressed and UTF-8.
+
+    The boundaries between items are found without parsing the file, if:
+
+    -  the file is JSON Lines: at line breaks
+    -  the file's first value is an array, and the prefix is ``""`` or ``"item"``: between the array's objects
+    -  the file's first value is an object, and the prefix is like ``"releases.item"``: between the objects in the
+       object's array
+    -  the file's first value is an object, and the prefix is ``""``: between concatenated objects, like pretty-printed
+       releases or packages
+
+    In the latter cases, the file is split before each object that starts like the first object (with the same
+    whitespace and first key). A split might fall within an item (like between the parties of a release); if so, the
+    worker fails to parse the chunk, and this process parses the items around the split instead.
+
+    Other files, and the rest of the file after the array, are parsed in this process, by
+    :func:`~ocdskit.util.iter_items`. If the prefix is ``""``, the items of top-level arrays are yielded instead of the
+    arrays, like :meth:`ocdskit.commands.base.OCDSCommand.items`. In particular, if the file is concatenated packages
+    and the prefix is like ``"releases.item"``, only the first package's array is split; the other packages are
+    parsed in this process.
+
+    Like JSON Lines, each item is parsed at once, using orjson if available, so numbers are parsed as ``int`` or
+    ``float``, not ``Decimal``.
+
+    :param path: the path to the file
+    :param prefix: the path to the items within each JSON value, as in ``ijson.items()``
+    :param workers: the number of worker processes (default: the number of CPUs)
+    :param jsonl: whether the file is JSON Lines. If ``None``, the file is JSON Lines if its first line is a complete
+        JSON object.
+    :param chunk_size: the approximate number of bytes in each chunk
+    """
+    workers = workers or os.cpu_count()
+    parts = prefix.split(".") if prefix else []
+
+    with open(path, "rb") as f:
+        if not os.fstat(f.fileno()).st_size:
+            return
+
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as buffer:
+            start = WHITESPACE.match(buffer).end()
+            # If JSON Lines is detected, a line that isn't a complete JSON value ends the JSON Lines.
+            strict = jsonl is True
+            if jsonl is None:
+                jsonl = _is_jsonl(buffer, start)
+
+            if jsonl:
+                rest = yield from _iter_lines(path, buffer, parts, workers, chunk_size, strict=strict)
+            elif array := _find_array(buffer, start, parts):
+                rest = yield from _iter_array(path, buffer, array, workers, chunk_size)
+                if len(parts) == 2:
+                    # Skip the rest of the object that contains the array.
+                    rest = _find_end(buffer, rest, 1)
+            elif not parts and (key := _find_first_key(buffer, start)):
+                rest = yield from _iter_values(path, buffer, start, key, workers, chunk_size)
+            else:
+                rest = 0
+
+            # ijson errors if there is only whitespace.
+            if rest is not None and WHITESPACE.match(buffer, rest).end() == len(buffer):
+                rest = None
+
+        if rest is not None:
+            f.seek(rest)
+            for item in iter_items(f, prefix, jsonl=False):
+                if not parts and isinstance(item, list):
+                    yield from item
+                else:
+                    yield item
+
+
+def _is_jsonl(buffer, start):
+    # A single-line array or large object is not read into memory to detect whether the file is JSON Lines.
+    if buffer[start : start + 1] != b"{":
+        return False
+    end = buffer.find(b"\n", start, start + JSONL_DETECTION_LIMIT)
+    if end == -1:
+        return False
+    try:
+        jsonlib.loads(buffer[start:end])
+    except ValueError:
+        return False
+    return True
+
+
+def _find_array(buffer, start, parts):
+    """
+    Return the offset of the array whose items are at the prefix, the offset of its first object, the whitespace
+    before its first object, and the whitespace and first key of its first object, or ``None`` if not found.
+    """
+    if parts in ([], ["item"]):
+        if buffer[start : start + 1] != b"[":
+            return None
+        array = start
+    elif len(parts) == 2 and parts[1] == "item" and buffer[start : start + 1] == b"{":
+        array = _find_key(buffer, start, parts[0])
+        if array is None:
+            return None
+    else:
+        return None
+
+    first = WHITESPACE.match(buffer, array + 1).end()
+    key = _find_first_key(buffer, first)
+    if key is None:
+        return None
+
+    return array, first, buffer[array + 1 : first], key
+
+
+def _find_first_key(buffer, first):
+    """Return the whitespace and first key (and colon) of the object at the offset, or ``None`` if not an object."""
+    if buffer[first : first + 1] != b"{":
+        return None
+    key = TOKEN.match(buffer, WHITESPACE.match(buffer, first + 1).end())
+    colon = key and TOKEN.match(buffer, WHITESPACE.match(buffer, key.end()).end())
+    if not key or key.lastindex != 1 or not colon or colon.lastindex != 4:  # a string and a colon
+        return None
+    return buffer[first + 1 : colon.end()]
+
+
+def _find_key(buffer, start, name):
+    """Return the offset of the array that is the value of the key in the object at the offset, or ``None``."""
+    depth = 0
+    key = None
+    string = None
+    pos = start
+    while match := TOKEN.search(buffer, pos):
+        pos = match.end()
+        token = match.lastindex
+        if token == 1:  # string
+            string = match
+        elif token == 4:  # colon
+            if depth == 1:
+                key = json.loads(string.group())
+        elif token == 2:  # open
+            if depth == 1 and key == name:
+                return match.start() if match.group() == b"[" else None
+            depth += 1
+        else:  # close
+            depth -= 1
+            if not depth:
+                return None
+    return None
+
+
+def _find_end(buffer, pos, depth):
+    """Return the offset after the end of the object or array that contains the offset, at the given depth."""
+    while match := TOKEN.search(buffer, pos):
+        pos = match.end()
+        if match.lastindex == 2:
+            depth += 1
+        elif match.lastindex == 3:
+            depth -= 1
+            if not depth:
+                return pos
+    return len(buffer)
+
+
+def _iter_lines(path, buffer, parts, workers, chunk_size, *, strict):
+    """Yield the items on each line, and return the offset of the first line that isn't a complete JSON value."""
+    chunks = []
+    start = 0
+    while start < len(buffer):
+        end = buffer.find(b"\n", start + chunk_size)
+        end = len(buffer) if end == -1 else end + 1
+        chunks.append((start, end))
+        start = end
+
+    function = functools.partial(_parse_lines, path, parts=parts, strict=strict)
+    for items, error in _parallel_map(function, chunks, workers):
+        yield from items
+        if error is not None:
+            return error
+    return None
+
+
+def _iter_array(path, buffer, array, workers, chunk_size):
+    """Yield the items in the array, and return the offset after the end of the array."""
+    _, first, gap, key = array
+    # The end of an object, a comma, and the start of an object that starts like the first object.
+    boundary = rb"\}[ \t\n\r]*," + re.escape(gap) + rb"\{" + re.escape(key)
+    parse = functools.partial(_parse_array, path)
+    return (yield from _iter_chunks(buffer, first, key, boundary, parse, _decode_item, workers, chunk_size))
+
+
+def _iter_values(path, buffer, first, key, workers, chunk_size):
+    """Yield the concatenated values (or the items of concatenated arrays)."""
+    # The end of an object, and the start of an object that starts like the first object.
+    boundary = rb"\}[ \t\n\r]*\{" + re.escape(key)
+    parse = functools.partial(_parse_values, path, boundary=boundary)
+    for value in _iter_chunks(buffer, first, key, boundary, parse, _decode_value, workers, chunk_size):
+        if isinstance(value, list):
+            yield from value
+        else:
+            yield value
+
+
+def _iter_chunks(buffer, first, key, boundary, parse, decode, workers, chunk_size):
+    """
+    Yield the items from the offset, in chunks split at the boundary, and return the offset after the last item, if
+    known.
+    """
+    boundary = re.compile(boundary)
+
+    # The chunks are (start, end, next) tuples. The last chunk's end and next are `None`.
+    pending = deque()
+
+    def chunks():
+        start = first
+        while True:
+            match = start + chunk_size < len(buffer) and boundary.search(buffer, start + chunk_size)
+            if not match:
+                pending.append((start, None, None))
+                yield start, None
+                return
+            end = match.start() + 1
+            pending.append((start, end, match.end() - len(key) - 1))
+            yield start, end
+            start = pending[-1][2]
+
+    # The offset of the next item to yield, which is known to be the start of an item.
+    pos = first
+    end_of_items = None
+    for result in _parallel_map(parse, chunks(), workers):
+        start, _, next_start = pending.popleft()
+
+        # If a split fell within an item, parse the items up to this chunk in this process.
+        while end_of_items is None and pos < start:
+            value, pos, end_of_items = decode(buffer, pos)
+            yield value
+
+        if end_of_items is not None or pos > start:
+            continue
+        if result is not None:
+            items, end_of_items = result
+            yield from items
+            pos = next_start
+
+    # If the last split fell within an item, parse the rest of the items in this process.
+    while end_of_items is None:
+        value, pos, end_of_items = decode(buffer, pos)
+        yield value
+
+    return end_of_items
+
+
+def _decode_item(buffer, pos):
+    """
+    Decode the item that starts at the offset, and return it, the offset of the next item, and, if it is the last
+    item, the offset after the end of the array.
+    """
+    value, end = _decode(buffer, pos)
+    end = WHITESPACE.match(buffer, end).end()
+    delimiter = buffer[end : end + 1]
+    if delimiter == b",":
+        return value, WHITESPACE.match(buffer, end + 1).end(), None
+    if delimiter == b"]":
+        return value, None, end + 1
+    raise json.JSONDecodeError("Expecting ',' delimiter", "", end)
+
+
+def _decode_value(buffer, pos):
+    """
+    Decode the value that starts at the offset, and return it, the offset of the next value, and, if it is the last
+    value, the offset of the end of the file.
+    """
+    value, end = _decode(buffer, pos)
+    end = WHITESPACE.match(buffer, end).end()
+    if end == len(buffer):
+        return value, None, end
+    return value, end, None
+
+
+def _get_buffer(path):
+    # The file is mapped once per worker process, and is unmapped when the process exits.
+    if path not in _buffers:
+        with open(path, "rb") as f:
+            _buffers[path] = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    return _buffers[path]
+
+
+def _parse_lines(path, chunk, *, parts, strict):
+    """
+    Return the items on the lines in the chunk, and the offset of the first line that isn't a complete JSON value, or
+    ``None``. This function runs in a worker process.
+    """
+    buffer = _get_buffer(path)
+    start, end = chunk
+
+    items = []
+    while start < end:
+        newline = buffer.find(b"\n", start, end)
+        stop = end if newline == -1 else newline + 1
+        line = buffer[start:stop]
+        if not line.isspace():
+            try:
+                data = jsonlib.loads(line)
+            except ValueError:
+                if strict:
+                    raise
+                return items, start
+            if not parts and isinstance(data, list):
+                items.extend(data)
+            else:
+                items.extend(_get_items(data, parts))
+        start = stop
+
+    return items, None
+
+
+def _parse_array(path, chunk):
+    """
+    Return the items in the chunk, and, if it is the last chunk, the offset after the end of the array. Return
+    ``None`` if the chunk doesn't start and end at the boundaries between items. This function runs in a worker
+    process.
+    """
+    buffer = _get_buffer(path)
+    start, end = chunk
+
+    if end is not None:
+        try:
+            return jsonlib.loads(b"[" + buffer[start:end] + b"]"), None
+        except ValueError:
+            return None
+
+    items = []
+    end_of_array = None
+    try:
+        while end_of_array is None:
+            value, start, end_of_array = _decode_item(buffer, start)
+            items.append(value)
+    # If the chunk starts at the boundary between items, this process raises the error while parsing the chunk.
+    except ValueError:
+        return None
+    return items, end_of_array
+
+
+def _parse_values(path, chunk, *, boundary):
+    """
+    Return the concatenated values in the chunk, and, if it is the last chunk, the offset of the end of the file.
+    Return ``None`` if the chunk doesn't start and end at the boundaries between values. This function runs in a
+    worker process.
+    """
+    buffer = _get_buffer(path)
+    start, end = chunk
+
+    items = []
+    end_of_items = None
+    try:
+        if end is None:
+            while end_of_items is None:
+                value, start, end_of_items = _decode_value(buffer, start)
+                items.append(value)
+        else:
+            data = buffer[start:end]
+            offset = 0
+            # If a boundary falls within a value, the values fail to parse.
+            for match in re.finditer(boundary, data):
+                items.append(jsonlib.loads(data[offset : match.start() + 1]))
+                offset = match.start() + 1
+            items.append(jsonlib.loads(data[offset:]))
+    except ValueError:
+        return None
+    return items, end_of_items
@@ -1,7 +1,6 @@
+import itertools
 import json
 import logging
-from collections import OrderedDict  # for move_to_end()
-from copy import deepcopy
 from hashlib import md5
 
 from ocdskit.util import (
@@ -27,9 +26,13 @@ organization_identification_1_0 = (
 def _move_to_top(data, fields, *, reorder):
     if not reorder:
         return
-    for field in reversed(fields):
-        if field in data:
-            data.move_to_end(field, last=False)
+    top = [field for field in fields if field in data]
+    # Rebuild the dict in-place, as other objects might refer to it.
+    if list(itertools.islice(data, len(top))) != top:
+        items = {field: data.pop(field) for field in top}
+        items.update(data)
+        data.clear()
+        data.update(items)
 
 
 def _in(obj, field):
@@ -52,10 +55,8 @@ def upgrade_10_11(data, *, reorder=True):
 
     Retain the deprecated Amendment.changes, Budget.source and Milestone.documents fields.
 
-    If ``reorder`` is ``True`` (the default), identifying fields like ``ocid`` are moved to the top of objects, and
-    ``data`` must be an ``OrderedDict``. If you have only the parsed JSON, re-parse it with:
-
-    ``upgrade_10_11(json.loads(json.dumps(data), object_pairs_hook=OrderedDict))``
+    If ``reorder`` is ``True`` (the default), identifying fields like ``ocid`` are moved to the top of the objects that
+    are changed.
     """
     version = get_ocds_minor_version(data)
     if version != "1.0":
@@ -90,14 +91,21 @@ def upgrade_record_10_11(record, *, reorder=True):
 
 def upgrade_release_10_11(release, *, reorder=True):
     """Apply upgrades for organization handling, amendment handling and transactions terminology."""
-    upgrade_parties_10_to_11(release, reorder=reorder)
+    parties = _get_parties(release)
+
+    upgrade_parties_10_to_11(release, reorder=reorder, parties=parties)
     upgrade_amendments_10_11(release)
-    upgrade_transactions_10_11(release, reorder=reorder)
+    upgrade_transactions_10_11(release, reorder=reorder, parties=parties)
 
 
-def upgrade_parties_10_to_11(release, *, reorder=True):
-    """Convert organizations to organization references and fill in the ``parties`` array."""
-    parties = _get_parties(release)
+def upgrade_parties_10_to_11(release, *, reorder=True, parties=None):
+    """
+    Convert organizations to organization references and fill in the ``parties`` array.
+
+    :param dict parties: the release's parties by ID, if already indexed
+    """
+    if parties is None:
+        parties = _get_parties(release)
 
     if _in(release, "buyer"):
         buyer = release["buyer"]
@@ -118,14 +126,7 @@ def upgrade_parties_10_to_11(release, *, reorder=True):
                 for i, supplier in enumerate(award["suppliers"]):
                     award["suppliers"][i] = _add_party(parties, supplier, "supplier", reorder=reorder)
 
-    if parties:
-        if "parties" not in release:
-            release["parties"] = []
-            _move_to_top(release, ("ocid", "id", "date", "tag", "initiationType", "parties"), reorder=reorder)
-
-        for party in parties.values():
-            if party not in release["parties"]:
-                release["parties"].append(party)
+    _fill_parties(release, parties, reorder=reorder)
 
 
 def _get_parties(release):
@@ -139,12 +140,25 @@ def _get_parties(release):
     return parties
 
 
+def _fill_parties(release, parties, *, reorder=True):
+    """Append the parties that aren't in the ``parties`` array to it."""
+    if parties:
+        if "parties" not in release:
+            release["parties"] = []
+            _move_to_top(release, ("ocid", "id", "date", "tag", "initiationType", "parties"), reorder=reorder)
+
+        # The parties from the `parties` array are the same objects, so compare identities, not values.
+        existing = {id(party) for party in release["parties"]}
+        release["parties"].extend(party for party in parties.values() if id(party) not in existing)
+
+
 def _add_party(parties, party, role, *, reorder=True):
     """
     Add an ``id`` to the party, add the party to the ``parties`` array, set the party's role, and return an
     OrganizationReference. Warn if there is any data loss from differences in non-identifying fields.
     """
-    party = deepcopy(party)
+    # Only top-level fields are set, and the organization is replaced by an OrganizationReference.
+    party = party.copy()
 
     if "id" not in party:
         party["id"] = _create_party_id(party)
@@ -156,15 +170,14 @@ def _add_party(parties, party, role, *, reorder=True):
         parties[_id] = party
     else:
         # Warn about data loss.
-        survivor = deepcopy(parties[_id])
-        roles = survivor.pop("roles", [])
-        if any(key not in survivor or party[key] != survivor[key] for key in party):
+        survivor = parties[_id]
+        if any(key == "roles" or key not in survivor or party[key] != survivor[key] for key in party):
             logger.warning(
                 'party in "%s" role differs from party in %s roles:\n%s\n%s',
                 role,
-                json.dumps(roles),
+                json.dumps(survivor.get("roles", [])),
                 json.dumps(party),
-                json.dumps(survivor),
+                json.dumps({key: value for key, value in survivor.items() if key != "roles"}),
             )
 
     if "roles" not in parties[_id]:
@@ -224,15 +237,18 @@ def _upgrade_amendment_10_11(block):
         del block["amendment"]
 
 
-def upgrade_transactions_10_11(release, *, reorder=True):
+def upgrade_transactions_10_11(release, *, reorder=True, parties=None):
     """
     Rename ``providerOrganization`` to ``payer``, ``receiverOrganization`` to ``payee``, and ``amount`` to ``value``
     under ``contracts.implementation.transactions``, unless they already exist.
 
     Convert ``providerOrganization`` and ``receiverOrganization`` from an Identifier to an OrganizationReference and
     fill in the ``parties`` array.
+
+    :param dict parties: the release's parties by ID, if already indexed
     """
-    parties = _get_parties(release)
+    if parties is None:
+        parties = _get_parties(release)
 
     if _in(release, "contracts"):
         for contract in release["contracts"]:
@@ -244,7 +260,7 @@ def upgrade_transactions_10_11(release, *, reorder=True):
 
                     for old, new in (("providerOrganization", "payer"), ("receiverOrganization", "payee")):
                         if old in transaction and new not in transaction:
-                            party = OrderedDict([("identifier", transaction[old])])
+                            party = {"identifier": transaction[old]}
 
                             if "legalName" in transaction[old]:
                                 party["name"] = transaction[old]["legalName"]
@@ -1,12 +1,19 @@
+import codecs
+import functools
 import itertools
 import json
+import queue
 import re
+import threading
+import time
+import warnings
+from collections import deque
+from collections.abc import Iterator
 from decimal import Decimal
 
 import ijson
-from ocdsmerge.util import get_tags
 
-from ocdskit.exceptions import UnknownFormatError, UnknownVersionError
+from ocdskit.exceptions import LateMetadataWarning, UnknownFormatError, UnknownVersionError
 
 try:
     import orjson
@@ -31,6 +38,144 @@ def grouper(iterable, n, fillvalue=None):
     return itertools.zip_longest(*args, fillvalue=fillvalue)
 
 
+def _parallel_map(function, iterable, workers, *, buffer_size=None, initializer=None, initargs=(), ordered=True):
+    """
+    Yield the result of calling ``function`` on each item of ``iterable``, in order, using a pool of worker processes.
+
+    At most ``buffer_size`` items (by default, twice the number of workers) are submitted to the pool before their
+    results are yielded, so that a large or slow ``iterable`` isn't exhausted into memory.
+
+    :param function: a module-level function, so that it can be pickled
+    :param iterable: the items to pass to the function
+    :param int workers: the number of worker processes
+    :param int buffer_size: the maximum number of pending results
+    :param initializer: a function to call in each worker process when it starts
+    :param tuple initargs: the arguments to pass to the initializer
+    :param bool ordered: whether to yield the results in order, instead of as soon as each is available
+    """
+    # Import here, to not slow the import of this module.
+    from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait  # noqa: PLC0415
+
+    if buffer_size is None:
+        buffer_size = 2 * workers
+
+    executor = ProcessPoolExecutor(max_workers=workers, initializer=initializer, initargs=initargs)
+    try:
+        if ordered:
+            pending = deque()
+            for item in iterable:
+                if len(pending) >= buffer_size:
+                    yield pending.popleft().result()
+                pending.append(executor.submit(function, item))
+            while pending:
+                yield pending.popleft().result()
+        else:
+            pending = set()
+            for item in iterable:
+                if len(pending) >= buffer_size:
+                    done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        yield future.result()
+                pending.add(executor.submit(function, item))
+            while pending:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    yield future.result()
+    finally:
+        executor.shutdown(cancel_futures=True)
+
+
+class _Stage(Iterator):
+    """
+    Iterate over an iterable in a thread, passing batches of items through a bounded queue, to overlap its work with
+    the work of the code that consumes it.
+
+    Exceptions are raised in the consuming thread. The stage counts the items, the seconds spent producing them, and
+    the seconds that the consumer waited for them, to report its throughput.
+    """
+
+    def __init__(self, name, iterable, *, batch_size=100, maxsize=8):
+        """
+        :param str name: the name of the stage, in its report
+        :param iterable: the items to produce
+        :param int batch_size: the number of items to pass through the queue at a time
+        :param int maxsize: the maximum number of batches in the queue
+        """
+        self.name = name
+        self.items = 0
+        self.busy = 0.0
+        self.waited = 0.0
+
+        self._batch_size = batch_size
+        self._queue = queue.Queue(maxsize)
+        self._batch = iter(())
+        self._done = False
+        self._stopped = threading.Event()
+        self._thread = threading.Thread(target=self._run, args=(iterable,), name=f"ocdskit-{name}", daemon=True)
+        self._thread.start()
+
+    def _run(self, iterable):
+        iterator = iter(iterable)
+        try:
+            while True:
+                start = time.perf_counter()
+                batch = list(itertools.islice(iterator, self._batch_size))
+                self.busy += time.perf_counter() - start
+                if not batch:
+                    break
+                if not self._put((batch, None)):
+                    return
+            self._put((None, None))
+        except BaseException as e:  # noqa: BLE001 # raised in the consuming thread
+            self._put((None, e))
+        finally:
+            # Close a generator in the thread in which it runs, to run any cleanup.
+            if hasattr(iterator, "close"):
+                iterator.close()
+
+    def _put(self, message):
+        # Stop if the consumer stops, instead of blocking on a full queue.
+        while not self._stopped.is_set():
+            try:
+                self._queue.put(message, timeout=0.1)
+            except queue.Full:
+                continue
+            return True
+        return False
+
+    def __next__(self):
+        for item in self._batch:
+            self.items += 1
+            return item
+
+        if self._done:
+            raise StopIteration
+
+        start = time.perf_counter()
+        batch, exception = self._queue.get()
+        self.waited += time.perf_counter() - start
+
+        if batch is None:
+            self._done = True
+            if exception is not None:
+                raise exception
+            raise StopIteration
+
+        self._batch = iter(batch)
+        return next(self)
+
+    def close(self):
+        """Stop producing items."""
+        self._stopped.set()
+
+    def report(self):
+        """Return the number of items produced, the seconds spent producing them, and the rate of production."""
+        rate = self.items / self.busy if self.busy else 0
+        return (
+            f"{self.name}: {self.items} items in {self.busy:.2f}s ({rate:.0f}/s), consumer waited {self.waited:.2f}s"
+        )
+
+
 # https://stackoverflow.com/questions/21663800/python-make-a-list-generator-json-serializable/46841935#46841935
 class SerializableGenerator(list):
     def __init__(self, iterable):
@@ -63,10 +208,53 @@ class JSONEncoder(json.JSONEncoder):
 
 
 def iterencode(data, *, ensure_ascii=False, **kwargs):
-    """Return a generator that yields each string representation as available."""
-    if "indent" not in kwargs:
-        kwargs["separators"] = (",", ":")
-    return JSONEncoder(ensure_ascii=ensure_ascii, **kwargs).iterencode(data)
+    """
+    Return a generator that yields each string representation as available.
+
+    Iterators are evaluated as they are encoded, and each of their items is encoded at once, using orjson if available.
+    This yields fewer, larger strings than ``json.JSONEncoder().iterencode()``, which yields each token.
+    """
+    # Only `indent` is supported by `json_dumps()` and here.
+    if kwargs.keys() - {"indent"}:
+        if "indent" not in kwargs:
+            kwargs["separators"] = (",", ":")
+        return JSONEncoder(ensure_ascii=ensure_ascii, **kwargs).iterencode(data)
+    return _iterencode(data, 0, ensure_ascii=ensure_ascii, indent=kwargs.get("indent"))
+
+
+def _iterencode(data, level, *, ensure_ascii, indent):
+    # Only the top-level object or array and any iterators are streamed. Other values are encoded at once.
+    if isinstance(data, dict) and not level:
+        separator = ": " if indent else ":"
+        items = ((json_dumps(key, ensure_ascii=ensure_ascii) + separator, value) for key, value in data.items())
+        yield from _iterencode_container("{", "}", items, level, ensure_ascii=ensure_ascii, indent=indent)
+    elif (isinstance(data, list) and not level) or isinstance(data, Iterator):
+        items = (("", value) for value in data)
+        yield from _iterencode_container("[", "]", items, level, ensure_ascii=ensure_ascii, indent=indent)
+    else:
+        string = json_dumps(data, ensure_ascii=ensure_ascii, indent=indent)
+        if indent and level:
+            string = string.replace("\n", "\n" + " " * indent * level)
+        yield string
+
+
+def _iterencode_container(start, end, items, level, *, ensure_ascii, indent):
+    if indent:
+        separator = ",\n" + " " * indent * (level + 1)
+        first = start + separator[1:]
+        last = "\n" + " " * indent * level + end
+    else:
+        separator = ","
+        first = start
+        last = end
+
+    empty = True
+    for prefix, value in items:
+        yield (first if empty else separator) + prefix
+        empty = False
+        yield from _iterencode(value, level + 1, ensure_ascii=ensure_ascii, indent=indent)
+
+    yield start + end if empty else last
 
 
 def json_dump(data, io, *, ensure_ascii=False, **kwargs):
@@ -93,7 +281,376 @@ def json_dumps(data, *, ensure_ascii=False, indent=None, sort_keys=False, **kwar
         option |= orjson.OPT_SORT_KEYS
 
     # orjson dumps to bytes.
-    return orjson.dumps(data, default=JSONEncoder().default, option=option).decode()
+    return orjson.dumps(data, default=_default, option=option).decode()
+
+
+# orjson serializes subclasses of `list` natively, so `SerializableGenerator` can't be used to postpone evaluation.
+def _default(obj):
+    if isinstance(obj, Decimal):
+        return float(obj)
+    try:
+        iterable = iter(obj)
+    except TypeError:
+        pass
+    else:
+        return list(iterable)
+    raise TypeError(f"Object of type {obj.__class__.__name__} is not JSON serializable")
+
+
+# The maximum length of a line to read while detecting whether an input is JSON Lines, so that a large JSON value on a
+# single line is parsed iteratively by ijson, instead of being read into memory.
+JSONL_DETECTION_LIMIT = 2**26
+
+
+def iter_items(file, prefix="", *, jsonl=None, **kwargs):
+    """
+    Yield the items at the prefix of each JSON value in a file.
+
+    If the file is `JSON Lines <https://jsonlines.org>`__, each line is parsed at once, using orjson if available,
+    which is faster than parsing it iteratively with ijson. Otherwise, the concatenated JSON is parsed with ijson.
+
+    :param file: a file-like object, open in binary mode
+    :param str prefix: the path to the items within each JSON value, as in ``ijson.items()``
+    :param jsonl: whether the file is JSON Lines. If ``None``, the file is parsed as JSON Lines until a line is not a
+        complete JSON value (or is too long), and the rest of the file is parsed with ijson.
+    :param kwargs: keyword arguments to ``ijson.items()``, like ``use_float=True`` to parse numbers as ``float``
+        instead of ``Decimal``. Only ``map_type`` is used when parsing JSON Lines, whose numbers are parsed as ``int``
+        or ``float``.
+    """
+    if jsonl is not False:
+        parts = prefix.split(".") if prefix else []
+        lines = _JSONLines(file, jsonl=jsonl, map_type=kwargs.get("map_type"))
+        for data in lines:
+            yield from _get_items(data, parts)
+        if lines.rest is None:
+            return
+        file = lines.rest
+
+    yield from ijson.items(file, prefix, multiple_values=True, **kwargs)
+
+
+def iter_split_packages(file, key, size, prefix="", *, jsonl=None, metadata=None, **kwargs):
+    """
+    Yield packages with at most ``size`` entries in the ``key`` array, for each package in a file.
+
+    Unlike :func:`iter_items`, a large package isn't read into memory at once. Instead, the package's metadata is read
+    before its entries, and a package is yielded as soon as ``size`` entries are read. If metadata follows the entries,
+    it is included in the packages that are yielded after it is read, and a
+    :class:`~ocdskit.exceptions.LateMetadataWarning` is issued. To include it in all packages, set ``metadata``.
+
+    If an item at the prefix is an array, each entry of the array is split, like in :meth:`OCDSCommand.items`.
+
+    :param file: a file-like object, open in binary mode
+    :param str key: the key of the array to split, like "releases" or "records"
+    :param int size: the maximum number of entries per package
+    :param str prefix: the path to the packages within each JSON value, as in ``ijson.items()``
+    :param jsonl: whether the file is JSON Lines, as in :func:`iter_items`
+    :param metadata: the metadata of each package in the file, as yielded by :func:`iter_package_metadata` in an
+        earlier pass. If set, each package's metadata is read from it, instead of from the file.
+    :param kwargs: keyword arguments to ``ijson.items()``. Only ``map_type`` and ``use_float`` are used.
+    """
+    if metadata is not None:
+        metadata = iter(metadata)
+    parts = _iter_package_parts(file, key, prefix, jsonl=jsonl, kwargs=kwargs, metadata=metadata is None)
+
+    package = None
+    entries = []
+    yielded = 0
+    for part, name, value in parts:
+        if package is None:
+            package = {} if metadata is None else next(metadata)
+        if part == ENTRY:
+            entries.append(value)
+            if len(entries) == size:
+                yield {**package, key: entries}
+                yielded += 1
+                entries = []
+        elif part == FIELD:
+            if yielded:
+                warnings.warn(
+                    LateMetadataWarning(
+                        f'the "{name}" field follows the "{key}" field, so the first {yielded} packages omit it'
+                    ),
+                    stacklevel=2,
+                )
+            package[name] = value
+        elif part == ARRAY:
+            package[key] = None  # preserve the order of keys
+        else:  # END
+            if entries:
+                yield {**package, key: entries}
+            package = None
+            entries = []
+            yielded = 0
+
+
+def iter_package_metadata(file, key, prefix="", *, jsonl=None, **kwargs):
+    """
+    Yield each package in a file, with an empty ``key`` array, without building its entries.
+
+    If an item at the prefix is an array, each entry of the array is yielded, like in :meth:`OCDSCommand.items`.
+
+    :param file: a file-like object, open in binary mode
+    :param str key: the key of the array to empty, like "releases" or "records"
+    :param str prefix: the path to the packages within each JSON value, as in ``ijson.items()``
+    :param jsonl: whether the file is JSON Lines, as in :func:`iter_items`
+    :param kwargs: keyword arguments to ``ijson.items()``. Only ``map_type`` and ``use_float`` are used.
+    """
+    package = {}
+    parts = _iter_package_parts(file, key, prefix, jsonl=jsonl, kwargs=kwargs, entries=False)
+    for part, name, value in parts:
+        if part == FIELD:
+            package[name] = value
+        elif part == ARRAY:
+            package[key] = []
+        else:  # END
+            yield package
+            package = {}
+
+
+def iter_package_entries(file, key, prefix="", *, jsonl=None, **kwargs):
+    """
+    Yield the entries of the ``key`` array of each package in a file, without building the packages' metadata.
+
+    :param file: a file-like object, open in binary mode
+    :param str key: the key of the array, like "releases" or "records"
+    :param str prefix: the path to the packages within each JSON value, as in ``ijson.items()``
+    :param jsonl: whether the file is JSON Lines, as in :func:`iter_items`
+    :param kwargs: keyword arguments to ``ijson.items()``. Only ``map_type`` and ``use_float`` are used.
+    """
+    parts = _iter_package_parts(file, key, prefix, jsonl=jsonl, kwargs=kwargs, metadata=False)
+    for part, _, value in parts:
+        if part == ENTRY:
+            yield value
+
+
+# The parts of a package yielded by `_iter_package_parts`.
+FIELD = 0  # a metadata field, as a name and value
+ARRAY = 1  # the start of the array of entries
+ENTRY = 2  # an entry of the array
+END = 3  # the end of the package
+
+
+def _iter_package_parts(file, key, prefix, *, jsonl, kwargs, metadata=True, entries=True):
+    # Yield tuples of ``(part, name, value)`` for each object at the prefix.
+    map_type = kwargs.get("map_type")
+    if jsonl is not False:
+        parts = prefix.split(".") if prefix else []
+        lines = _JSONLines(file, jsonl=jsonl, map_type=map_type)
+        for data in lines:
+            for item in _get_items(data, parts):
+                for package in item if isinstance(item, list) else [item]:
+                    if not isinstance(package, dict):
+                        continue
+                    array = isinstance(package.get(key), list)
+                    # The entries are yielded after all metadata, which is already read.
+                    for name, value in package.items():
+                        if name == key and array:
+                            yield ARRAY, key, None
+                        elif metadata:
+                            yield FIELD, name, value
+                    if entries and array:
+                        for entry in package[key]:
+                            yield ENTRY, None, entry
+                    yield END, None, None
+        if lines.rest is None:
+            return
+        file = lines.rest
+
+    item_prefix = f"{prefix}.item" if prefix else "item"
+    events = ijson.parse(file, multiple_values=True, use_float=kwargs.get("use_float", False))
+
+    depth = 0
+    # The depth of the entries of the array at the prefix, if the item at the prefix is an array.
+    array_depth = None
+    for current, event, _ in events:
+        if event == "start_map" and (
+            (array_depth is None and current == prefix) or (depth == array_depth and current == item_prefix)
+        ):
+            yield from _iter_package_parts_events(events, key, map_type, metadata=metadata, entries=entries)
+        elif event in {"start_map", "start_array"}:
+            if event == "start_array" and array_depth is None and current == prefix:
+                array_depth = depth + 1
+            depth += 1
+        elif event in {"end_map", "end_array"}:
+            depth -= 1
+            if depth + 1 == array_depth and current == prefix:
+                array_depth = None
+
+
+def _iter_package_parts_events(events, key, map_type, *, metadata, entries):
+    # Read the events of a package, after its "start_map" event and until its "end_map" event.
+    sink = ijson.utils.sendable_list()
+    for _, event, name in events:
+        if event == "end_map":
+            break
+
+        # `event` is "map_key". Read the value.
+        current, start, value = next(events)
+        if name == key and start == "start_array":
+            yield ARRAY, key, None
+            if entries:
+                # The C backend builds objects faster than `ijson.ObjectBuilder`.
+                coroutine = _get_ijson_backend().items_basecoro(sink, f"{current}.item", map_type=map_type)
+                for item in events:
+                    if item[1] == "end_array" and item[0] == current:
+                        break
+                    coroutine.send(item)
+                    if sink:
+                        yield ENTRY, None, sink.pop()
+            else:
+                _skip_value(events, start)
+        elif metadata:
+            yield FIELD, name, _build_value(events, start, value, map_type)
+        else:
+            _skip_value(events, start)
+
+    yield END, None, None
+
+
+def _skip_value(events, start):
+    # Skip a value's events, after its first event.
+    if start in {"start_map", "start_array"}:
+        depth = 1
+        for _, event, _ in events:
+            if event in {"start_map", "start_array"}:
+                depth += 1
+            elif event in {"end_map", "end_array"}:
+                depth -= 1
+                if not depth:
+                    break
+
+
+def _build_value(events, start, value, map_type):
+    # Build a value from its events, after its first event.
+    builder = ijson.ObjectBuilder(map_type)
+    builder.event(start, value)
+    if start in {"start_map", "start_array"}:
+        depth = 1
+        for _, event, data in events:
+            builder.event(event, data)
+            if event in {"start_map", "start_array"}:
+                depth += 1
+            elif event in {"end_map", "end_array"}:
+                depth -= 1
+                if not depth:
+                    break
+    return builder.value
+
+
+@functools.cache
+def _get_ijson_backend():
+    return ijson.get_backend(ijson.backend)
+
+
+class _JSONLines:
+    """
+    Iterate over the JSON value on each line of a file, until a line is not a complete JSON value (or is too long).
+
+    Then, ``rest`` is set to a file-like object from which to read the rest of the file.
+    """
+
+    def __init__(self, file, *, jsonl, map_type):
+        self.file = file
+        self.jsonl = jsonl
+        self.loads = functools.partial(json.loads, object_pairs_hook=map_type) if map_type else jsonlib.loads
+        self.rest = None
+
+    def __iter__(self):
+        file = self.file
+        limit = -1 if self.jsonl else JSONL_DETECTION_LIMIT
+
+        while line := file.readline(limit):
+            if line.isspace():
+                continue
+            # If the line is as long as the limit, it might be incomplete.
+            if len(line) == limit and not line.endswith(b"\n"):
+                self.rest = _PrefixedReader(line, file)
+                return
+            try:
+                data = self.loads(line)
+            except ValueError:
+                if self.jsonl:
+                    raise
+                self.rest = _PrefixedReader(line, file)
+                return
+            yield data
+
+
+def _get_items(data, parts):
+    # Like ijson, "item" matches either an array's items or an object's "item" key.
+    if not parts:
+        yield data
+    elif isinstance(data, dict):
+        if parts[0] in data:
+            yield from _get_items(data[parts[0]], parts[1:])
+    elif isinstance(data, list) and parts[0] == "item":
+        for value in data:
+            yield from _get_items(value, parts[1:])
+
+
+class _PrefixedReader:
+    """Read the bytes that were already read from a file, and then the rest of the file."""
+
+    def __init__(self, data, file):
+        self.data = data
+        self.file = file
+
+    def read(self, size=-1):
+        if not self.data:
+            return self.file.read(size)
+        if size < 0:
+            data = self.data + self.file.read()
+            self.data = b""
+        else:
+            data = self.data[:size]
+            self.data = self.data[size:]
+        return data
+
+
+# A JSON string, an opening bracket, a closing bracket, or a colon. Other tokens don't affect the structure.
+TOKEN = re.compile(rb'("(?:[^"\\]|\\.)*")|([{[])|([}\]])|(:)')
+STRING, OPEN, CLOSE, COLON = 1, 2, 3, 4
+
+# Bytes other than quotation marks and brackets.
+NOT_STRUCTURAL = bytes(set(range(256)) - set(b'"[]{}'))
+# A quoted sequence of brackets.
+QUOTED = re.compile(rb'"[^"]*"')
+# The rest of a JSON string, from within it.
+STRING_END = re.compile(rb'[^"\\]*(?:\\.[^"\\]*)*"')
+# An opening bracket followed by its closing bracket.
+BRACKET_PAIR = re.compile(rb"\{\}|\[\]")
+# Whitespace, as defined by JSON.
+WHITESPACE = b" \t\n\r"
+
+# The number of bytes to decode at first, to find the end of a JSON value.
+DECODE_SIZE = 2**14
+# The number of bytes to read at a time, to find the end of a JSON value.
+SCAN_SIZE = 2**16
+
+_decoder = json.JSONDecoder()
+
+
+def _decode(buffer, start, limit=None):
+    """
+    Decode the JSON value that starts at the offset, and return it and the offset of its end.
+
+    Return ``None`` if the value is longer than ``limit`` bytes.
+    """
+    size = DECODE_SIZE
+    while True:
+        # Decode whole characters only, in case a multi-byte character is cut off.
+        text, _ = codecs.utf_8_decode(buffer[start : start + size], "strict", False)  # noqa: FBT003
+        try:
+            value, end = _decoder.raw_decode(text)
+        except json.JSONDecodeError:
+            if start + size >= len(buffer):
+                raise
+            if limit and size >= limit:
+                return None
+            size *= 2
+        else:
+            return value, start + (end if text.isascii() else len(text[:end].encode()))
 
 
 def get_definitions_keyword(schema):
@@ -129,6 +686,9 @@ def get_ocds_patch_tag(version):
 
     :raises UnknownVersionError: if the OCDS version is not recognized
     """
+    # Import here, to not slow the import of this module, which the CLI imports.
+    from ocdsmerge.util import get_tags  # noqa: PLC0415
+
     prefix = version.replace(".", "__") + "__"
     try:
         return next(tag for tag in reversed(get_tags()) if tag.startswith(prefix))
@@ -192,7 +752,7 @@ def is_linked_release(data, maximum_properties=3):
     return "url" in data and len(data) <= maximum_properties
 
 
-def detect_format(path, root_path="", reader=open, additional_prefixes=()):
+def detect_format(path, root_path="", reader=open, additional_prefixes=(), *, bounded=False, max_bytes=None):
     """
     Return the format of OCDS data, and whether the OCDS data is concatenated or in an array.
 
@@ -201,12 +761,20 @@ def detect_format(path, root_path="", reader=open, additional_prefixes=()):
     :param str path: the path to a file
     :param str root_path: the path to the OCDS data within the file
     :param tuple additional_prefixes: additional prefixes to consider as part of an empty package
+    :param bool bounded: stop reading once the format is decided and the first top-level JSON value closes. The format
+        is decided once a "records" or "releases" array starts (assuming that a record's "ocid" field precedes its
+        "releases" field), or once the first item closes. The file is then read again without parsing it, to find the
+        end of the first top-level JSON value and whether anything but whitespace follows, to determine whether the
+        data is concatenated.
+    :param int max_bytes: the maximum number of bytes to read. If the limit is reached, the format is detected from the
+        bytes read, and whether the data is concatenated is ``None`` (unknown), unless already determined.
     :returns: the format, whether data is concatenated, and whether data is in an array
     :rtype: tuple
     :raises UnknownFormatError: if the format cannot be detected
     """
     with reader(path, "rb") as f:
-        events = iter(ijson.parse(f, multiple_values=True))
+        file = f if max_bytes is None else _LimitedReader(f, max_bytes)
+        events = iter(ijson.parse(file, multiple_values=True))
 
         while True:
             prefix, event, value = next(events)
@@ -221,6 +789,8 @@ def detect_format(path, root_path="", reader=open, additional_prefixes=()):
         elif event != "start_map":
             raise UnknownFormatError(f"top-level JSON value is a {event}")
 
+        # The prefix of the "end_map" event of the first item.
+        item_prefix = prefix[:-1]
         records_prefix = f"{prefix}records"
         releases_prefix = f"{prefix}releases"
         ocid_prefix = f"{prefix}ocid"
@@ -236,42 +806,138 @@ def detect_format(path, root_path="", reader=open, additional_prefixes=()):
         is_compiled = False
         metadata_count = 0
         is_array = event == "start_array"
+        is_concatenated = None
+        is_decided = False
 
-        for prefix, event, value in events:
-            if prefix == records_prefix:
-                has_records = True
-            elif prefix == releases_prefix:
-                has_releases = True
-            elif prefix == ocid_prefix:
-                has_ocid = True
-            elif prefix == tag_item_prefix:
-                has_tag = True
-                if value == "compiled":
-                    is_compiled = True
-            elif prefix in metadata_prefixes and event not in {"end_array", "end_map", "map_key"}:
-                metadata_count += 1
-            if not prefix and event not in {"end_array", "end_map", "map_key"}:
-                return _detect_format_result(
-                    True,  # noqa: FBT003
-                    is_array,
-                    has_records,
-                    has_releases,
-                    has_ocid,
-                    has_tag,
-                    is_compiled,
-                    metadata_count,
-                )
+        try:
+            for prefix, event, value in events:
+                if prefix == records_prefix:
+                    has_records = True
+                    if bounded:
+                        is_decided = True
+                        break
+                elif prefix == releases_prefix:
+                    has_releases = True
+                    if bounded and event == "start_array":
+                        is_decided = True
+                        break
+                elif prefix == ocid_prefix:
+                    has_ocid = True
+                elif prefix == tag_item_prefix:
+                    has_tag = True
+                    if value == "compiled":
+                        is_compiled = True
+                elif prefix in metadata_prefixes and event not in {"end_array", "end_map", "map_key"}:
+                    metadata_count += 1
+                elif bounded and prefix == item_prefix and event == "end_map":
+                    is_decided = True
+                    break
+                if not prefix and event not in {"end_array", "end_map", "map_key"}:
+                    is_concatenated = True
+                    break
+            else:
+                if file is f or not file.exhausted:
+                    is_concatenated = False
+        except ijson.common.IncompleteJSONError:
+            if file is f or not file.exhausted:
+                raise
+
+    # Read the file again, to find the end of the first top-level JSON value without parsing it.
+    if is_decided:
+        with reader(path, "rb") as f:
+            file = f if max_bytes is None else _LimitedReader(f, max_bytes)
+            is_concatenated = _is_concatenated(file)
+            if file is not f and file.exhausted and not is_concatenated:
+                is_concatenated = None
+            elif is_concatenated is None:
+                raise ijson.common.IncompleteJSONError("Incomplete JSON content")
+
+    return _detect_format_result(
+        is_concatenated,
+        is_array,
+        has_records,
+        has_releases,
+        has_ocid,
+        has_tag,
+        is_compiled,
+        metadata_count,
+    )
+
+
+def _is_concatenated(file):
+    """
+    Return whether anything but whitespace follows the first JSON value in a binary file, or ``None`` if the first
+    JSON value doesn't end.
 
-        return _detect_format_result(
-            False,  # noqa: FBT003
-            is_array,
-            has_records,
-            has_releases,
-            has_ocid,
-            has_tag,
-            is_compiled,
-            metadata_count,
-        )
+    The first JSON value must be an object or array. Its end is found by counting brackets outside strings, without
+    parsing the file. Only the part of the file in which the first JSON value ends is scanned token by token.
+    """
+    depth = 0
+    in_string = False
+    carry = b""
+    while chunk := file.read(SCAN_SIZE):
+        part = carry + chunk
+        # Carry a backslash to the next part, in case it escapes a quotation mark.
+        backslashes = len(part) - len(part.rstrip(b"\\"))
+        carry = part[-1:] if backslashes % 2 else b""
+        if carry:
+            part = part[:-1]
+
+        # Remove escapes, and then all bytes but quotation marks and brackets. Remove adjacent quotation marks, which
+        # are empty strings or the ends and starts of strings, and then strings that contain brackets.
+        brackets = part.replace(b"\\\\", b"").replace(b'\\"', b"").translate(None, NOT_STRUCTURAL)
+        brackets = (b'"' + brackets if in_string else brackets).replace(b'""', b"")
+        if b'"' in brackets:
+            brackets = QUOTED.sub(b"", brackets)
+        ends_in_string = b'"' in brackets
+        if ends_in_string:
+            brackets = brackets[: brackets.index(b'"')]
+
+        # Remove matching brackets, leaving closing brackets and then opening brackets.
+        current = depth
+        if not depth and brackets:  # the first JSON value starts in this part
+            depth, brackets = 1, brackets[1:]
+        while (reduced := BRACKET_PAIR.sub(b"", brackets)) != brackets:
+            brackets = reduced
+        closes = len(brackets) - len(brackets.lstrip(b"]}"))
+
+        # If the first JSON value doesn't end in this part, skip scanning it.
+        if depth > closes:
+            depth += len(brackets) - 2 * closes
+            in_string = ends_in_string
+            continue
+
+        depth = current
+        pos = STRING_END.match(part).end() if in_string else 0
+        for match in TOKEN.finditer(part, pos):
+            if match.lastindex == OPEN:
+                depth += 1
+            elif match.lastindex == CLOSE:
+                depth -= 1
+                if not depth:
+                    if (part[match.end() :] + carry).strip(WHITESPACE):
+                        return True
+                    return any(data.strip(WHITESPACE) for data in iter(functools.partial(file.read, SCAN_SIZE), b""))
+        in_string = ends_in_string
+    return None
+
+
+class _LimitedReader:
+    """Read at most a number of bytes from a file."""
+
+    def __init__(self, file, limit):
+        self.file = file
+        self.remaining = limit
+        self.exhausted = False
+
+    def read(self, size=-1):
+        if size < 0 or size > self.remaining:
+            size = self.remaining
+        data = self.file.read(size)
+        self.remaining -= len(data)
+        if not self.remaining:
+            self.exhausted = True
+        return data
 
 
 class Format(StrEnum):
@@ -1,4 +1,5 @@
 import json
+import logging
 import sys
 from io import BytesIO, TextIOWrapper
 from unittest.mock import patch
@@ -6,7 +7,7 @@ from unittest.mock import patch
 import pytest
 
 from ocdskit.__main__ import main
-from tests import assert_streaming, read, run_streaming
+from tests import assert_streaming, assert_streaming_error, read, run_streaming
 
 
 def test_command(capsys, monkeypatch):
@@ -20,6 +21,36 @@ def test_command(capsys, monkeypatch):
     )
 
 
+@pytest.mark.parametrize("indent", [None, 2])
+def test_command_streaming(capsys, monkeypatch, indent):
+    filenames = ["release-package_minimal.json", "release-package_maximal.json", "release-package_extensions.json"]
+    stdin = "".join(json.dumps(json.loads(read(filename)), indent=indent) + "\n" for filename in filenames).encode()
+
+    assert_streaming(
+        capsys,
+        monkeypatch,
+        main,
+        ["combine-release-packages", "--streaming"],
+        stdin,
+        ["combine-release-packages_minimal-maximal-extensions.json"],
+    )
+
+
+@pytest.mark.parametrize("args", [["--input-workers", "2"], ["--unordered"]])
+def test_command_streaming_input_workers(capsys, monkeypatch, caplog, args):
+    with caplog.at_level(logging.ERROR):
+        assert_streaming_error(
+            capsys,
+            monkeypatch,
+            main,
+            ["combine-release-packages", "--streaming", *args],
+            ["release-package_minimal.json"],
+        )
+
+        assert len(caplog.records) == 1
+        assert caplog.records[0].message == "--input-workers and --unordered can't be combined with --streaming."
+
+
 def test_command_no_extensions(capsys, monkeypatch):
     assert_streaming(
         capsys,
@@ -4,9 +4,10 @@ import logging
 import pytest
 
 import ocdskit.combine
+import ocdskit.packager
 from ocdskit.__main__ import main
 from ocdskit.util import json_dumps
-from tests import assert_streaming, assert_streaming_error, read, run_streaming
+from tests import assert_streaming, assert_streaming_error, path, read, run_streaming
 
 
 def _remove_package_metadata(filenames):
@@ -273,3 +274,261 @@ def test_command_without_sqlite(capsys, monkeypatch, caplog):
         "sqlite3 is unavailable, so the command will run in memory. "
         "If input files are too large, the command might exceed available memory."
     )
+
+
+@pytest.mark.usefixtures("sqlite")
+@pytest.mark.parametrize("workers", ["2", "0"])
+@pytest.mark.parametrize("args", [[], ["--package"], ["--package", "--versioned"]])
+def test_command_workers(capsys, monkeypatch, args, workers):
+    stdin = ["realdata/release-package-1.json", "realdata/release-package-2.json"]
+    args = ["compile", "--schema", path("release-schema.json"), *args]
+
+    expected = run_streaming(capsys, monkeypatch, main, args, stdin)
+    actual = run_streaming(capsys, monkeypatch, main, [*args, "--workers", workers], stdin)
+
+    assert actual.out == expected.out
+
+
+def test_command_store(capsys, monkeypatch, tmp_path):
+    args = ["compile", "--schema", path("release-schema.json"), "--store", str(tmp_path / "store.sqlite3")]
+
+    release_1 = json.loads(read("release_minimal-1.json"))
+    release_2 = json.loads(read("release_minimal-2.json"))
+    release_3 = {**release_1, "id": "3", "date": "2003-02-03T04:05:06Z", "tag": ["tender"]}
+
+    # The first run prints all OCIDs.
+    actual = run_streaming(capsys, monkeypatch, main, args, f"{json_dumps(release_1)}{json_dumps(release_2)}".encode())
+
+    assert [json.loads(line)["ocid"] for line in actual.out.splitlines()] == ["ocds-213czf-1", "ocds-213czf-2"]
+
+    # The next run prints only the OCIDs with new releases, merged with the earlier releases.
+    actual = run_streaming(capsys, monkeypatch, main, args, json_dumps(release_3).encode())
+    expected = run_streaming(
+        capsys, monkeypatch, main, args[:3], f"{json_dumps(release_1)}{json_dumps(release_3)}".encode()
+    )
+
+    assert actual.out == expected.out
+    assert json.loads(actual.out)["tag"] == ["compiled"]
+
+    # A run without new releases prints nothing.
+    actual = run_streaming(capsys, monkeypatch, main, args, b"")
+
+    assert actual.out == ""
+
+
+@pytest.mark.filterwarnings("default::ocdskit.exceptions.DuplicateReleasesWarning")
+@pytest.mark.parametrize("deduplicate", ["memory", "disk"])
+def test_command_store_deduplicate(capsys, monkeypatch, tmp_path, deduplicate):
+    args = ["compile", "--schema", path("release-schema.json"), "--store", str(tmp_path / "store.sqlite3")]
+    args = [*args, "--deduplicate", deduplicate]
+
+    release_1 = json.loads(read("release_minimal-1.json"))
+    release_2 = json.loads(read("release_minimal-2.json"))
+
+    actual = run_streaming(capsys, monkeypatch, main, args, json_dumps(release_1).encode())
+
+    assert [json.loads(line)["ocid"] for line in actual.out.splitlines()] == ["ocds-213czf-1"]
+
+    # The next run drops releases that are duplicates of releases from earlier runs.
+    actual = run_streaming(capsys, monkeypatch, main, args, f"{json_dumps(release_1)}{json_dumps(release_2)}".encode())
+
+    assert [json.loads(line)["ocid"] for line in actual.out.splitlines()] == ["ocds-213czf-2"]
+    assert actual.err == "1 duplicate releases were dropped\n"
+
+    # A run with only duplicates prints nothing.
+    actual = run_streaming(capsys, monkeypatch, main, args, json_dumps(release_2).encode())
+
+    assert actual.out == ""
+    assert actual.err == "1 duplicate releases were dropped\n"
+
+
+def test_command_assume_grouped(capsys, monkeypatch):
+    args = ["compile", "--schema", path("release-schema.json")]
+    stdin = read("release-package_minimal.json", "rb")
+
+    expected = run_streaming(capsys, monkeypatch, main, args, stdin)
+    actual = run_streaming(capsys, monkeypatch, main, [*args, "--assume-grouped"], stdin)
+
+    assert actual.out == expected.out
+
+
+@pytest.mark.filterwarnings("default::ocdskit.exceptions.IgnoredMetadataWarning")
+def test_command_assume_grouped_package_metadata(capsys, monkeypatch):
+    args = ["compile", "--schema", path("release-schema.json"), "--package", "--assume-grouped"]
+    stdin = ["realdata/release-package-1.json", "realdata/release-package-2.json"]
+
+    actual = run_streaming(capsys, monkeypatch, main, args, stdin)
+
+    assert len(json.loads(actual.out)["packages"]) == 1
+    assert actual.err == "metadata after the first package is missing from the record package\n"
+
+
+def test_command_assume_grouped_ungrouped(capsys, monkeypatch, caplog):
+    args = ["compile", "--schema", path("release-schema.json"), "--assume-grouped"]
+    release_1 = read("release_minimal-1.json", "rb")
+    release_2 = read("release_minimal-2.json", "rb")
+
+    expected = run_streaming(capsys, monkeypatch, main, args, release_1 + release_2)
+
+    with caplog.at_level(logging.ERROR):
+        assert_streaming_error(capsys, monkeypatch, main, args, release_1 + release_2 + release_1, expected.out)
+
+        assert len(caplog.records) == 1
+        assert caplog.records[0].levelname == "CRITICAL"
+        assert caplog.records[0].message == (
+            "the releases for OCID ocds-213czf-1 are not contiguous. Try without --assume-grouped."
+        )
+
+
+@pytest.mark.parametrize(
+    "args",
+    [["--store", "store.sqlite3"], ["--compression", "zlib"], ["--backend", "python"], ["--backend-option", "a=1"]],
+)
+def test_command_assume_grouped_conflict(capsys, monkeypatch, caplog, args):
+    args = ["compile", "--schema", path("release-schema.json"), "--assume-grouped", *args]
+
+    with caplog.at_level(logging.ERROR):
+        assert_streaming_error(capsys, monkeypatch, main, args, ["release-package_minimal.json"])
+
+        assert len(caplog.records) == 1
+        assert caplog.records[0].message == (
+            "--assume-grouped can't be combined with --store, --compression, --backend or --backend-option."
+        )
+
+
+@pytest.mark.parametrize(
+    "args", [["--store", "releases.db"], ["--compression", "zlib"], ["--deduplicate", "disk"], ["--backend", "sqlite"]]
+)
+def test_command_sqlite_unavailable(capsys, monkeypatch, caplog, args):
+    monkeypatch.setattr(ocdskit.packager, "USING_SQLITE", False)
+    args = ["compile", "--schema", path("release-schema.json"), *args]
+
+    with caplog.at_level(logging.ERROR):
+        assert_streaming_error(capsys, monkeypatch, main, args, ["release-package_minimal.json"])
+
+        assert len(caplog.records) == 1
+        assert caplog.records[0].message == (
+            "sqlite3 is unavailable, so --store, --compression, --deduplicate disk and --backend sqlite can't be used."
+        )
+
+
+@pytest.mark.parametrize("compression", ["zlib", "zstd"])
+def test_command_compression(capsys, monkeypatch, compression):
+    if compression == "zstd":
+        pytest.importorskip("zstandard")
+
+    args = ["compile", "--schema", path("release-schema.json")]
+    stdin = read("realdata/release-package-1.json", "rb") + read("realdata/release-package-2.json", "rb")
+
+    expected = run_streaming(capsys, monkeypatch, main, args, stdin)
+    actual = run_streaming(capsys, monkeypatch, main, [*args, "--compression", compression], stdin)
+
+    assert actual.out == expected.out
+
+
+@pytest.mark.filterwarnings("default::ocdskit.exceptions.DuplicateReleasesWarning")
+def test_command_deduplicate(capsys, monkeypatch):
+    args = ["compile", "--schema", path("release-schema.json")]
+    package_1 = read("realdata/release-package-1.json", "rb")
+    package_2 = read("realdata/release-package-2.json", "rb")
+
+    expected = run_streaming(capsys, monkeypatch, main, args, package_1 + package_2)
+    actual = run_streaming(capsys, monkeypatch, main, [*args, "--deduplicate", "memory"], package_1 + package_2 * 2)
+
+    assert actual.out == expected.out
+    assert actual.err == "2 duplicate releases were dropped\n"
+
+
+@pytest.mark.filterwarnings("default::ocdskit.exceptions.DuplicateReleasesWarning")
+@pytest.mark.filterwarnings("default::ocdskit.exceptions.IgnoredMetadataWarning")
+@pytest.mark.parametrize("args", [["--package"], ["--package", "--assume-grouped"]])
+def test_command_deduplicate_pipeline(capsys, monkeypatch, args):
+    args = ["compile", "--schema", path("release-schema.json"), "--deduplicate", "disk", *args]
+    package_1 = read("realdata/release-package-1.json", "rb")
+    package_2 = read("realdata/release-package-2.json", "rb")
+    stdin = package_1 + package_2 * 2
+
+    expected = run_streaming(capsys, monkeypatch, main, args, stdin)
+    actual = run_streaming(capsys, monkeypatch, main, [*args, "--pipeline"], stdin)
+
+    assert actual.out == expected.out
+    assert "2 duplicate releases were dropped" in actual.err.splitlines()
+
+
+@pytest.mark.parametrize(
+    "args",
+    [
+        ["--backend", "python"],
+        ["--backend", "sqlite", "--compression", "zlib"],
+        ["--backend", "external-sort", "--backend-option", "memory_budget=1", "--backend-option", "max_runs=2"],
+    ],
+)
+def test_command_backend(capsys, monkeypatch, args):
+    args = ["compile", "--schema", path("release-schema.json"), "--package", *args]
+    stdin = ["realdata/release-package-1.json", "realdata/release-package-2.json"]
+
+    expected = run_streaming(capsys, monkeypatch, main, args[:4], stdin)
+    actual = run_streaming(capsys, monkeypatch, main, args, stdin)
+
+    assert actual.out == expected.out
+
+
+@pytest.mark.parametrize(
+    ("args", "message"),
+    [
+        (
+            ["--backend", "nonexistent"],
+            'The backend "nonexistent" is not recognized. Try one of: python, sqlite, external-sort.',
+        ),
+        (["--backend", "python", "--compression", "zlib"], "--store and --compression require --backend sqlite."),
+        (["--backend-option", "memory_budget"], "The backend option 'memory_budget' is not like KEY=VALUE."),
+    ],
+)
+def test_command_backend_error(capsys, monkeypatch, caplog, args, message):
+    with caplog.at_level(logging.ERROR):
+        assert_streaming_error(capsys, monkeypatch, main, ["compile", *args], ["release-package_minimal.json"])
+
+        assert len(caplog.records) == 1
+        assert caplog.records[0].message == message
+
+
+@pytest.mark.parametrize(
+    "args",
+    [
+        [],
+        ["--versioned"],
+        ["--package"],
+        ["--package", "--versioned", "--linked-releases"],
+        ["--package", "--workers", "2"],
+    ],
+)
+def test_command_pipeline(capsys, monkeypatch, args):
+    args = ["compile", "--schema", path("release-schema.json"), *args]
+    stdin = ["realdata/release-package-1.json", "realdata/release-package-2.json"]
+
+    expected = run_streaming(capsys, monkeypatch, main, args, stdin)
+    actual = run_streaming(capsys, monkeypatch, main, [*args, "--pipeline"], stdin)
+
+    assert actual.out == expected.out
+    assert [line.split(":")[0] for line in actual.err.splitlines()] == ["parse", "merge", "serialize"]
+
+
+def test_command_pipeline_missing_ocid(capsys, monkeypatch, caplog):
+    stdin = b'{"id":"1","date":"2001-02-03T04:05:06Z","tag":["planning"],"initiationType":"tender"}'
+
+    with caplog.at_level(logging.ERROR):
+        assert_streaming_error(capsys, monkeypatch, main, ["compile", "--pipeline"], stdin)
+
+        assert len(caplog.records) == 1
+        assert caplog.records[0].message == "The `ocid` field of at least one release is missing."
+
+
+@pytest.mark.parametrize("args", [[], ["--input-workers", "2"]])
+def test_command_input(capsys, monkeypatch, args):
+    argv = ["compile", "--schema", path("release-schema.json"), "--package"]
+    filenames = ["realdata/release-package-1.json", "realdata/release-package-2.json"]
+
+    expected = run_streaming(capsys, monkeypatch, main, argv, filenames)
+    actual = run_streaming(capsys, monkeypatch, main, [*argv, "--input", *(path(f) for f in filenames), *args], b"")
+
+    assert actual.out == expected.out
@@ -1,4 +1,6 @@
 import os
+import sys
+from unittest.mock import patch
 
 import pytest
 
@@ -27,6 +29,29 @@ def test_command(filename, result, capsys, monkeypatch):
     assert_command(capsys, monkeypatch, main, ["detect-format", path(filename)], expected)
 
 
+@pytest.mark.parametrize(
+    ("filename", "result"),
+    [
+        ("record-package_minimal.json", "record package"),
+        ("release-package_minimal.json", "release package"),
+        ("release_minimal.json", "release"),
+        ("release-packages.json", "a JSON array of release packages"),
+        ("detect-format_mixed.json", "concatenated JSON, starting with release"),
+    ],
+)
+def test_command_bounded(filename, result, capsys, monkeypatch):
+    expected = f"tests{os.sep}fixtures{os.sep}{filename}: {result}\n"
+    assert_command(capsys, monkeypatch, main, ["detect-format", "--bounded", path(filename)], expected)
+
+
+def test_command_max_bytes(capsys, monkeypatch, tmp_path):
+    path = tmp_path / "test.json"
+    path.write_text('{"uri":"","releases":[{"ocid":"1"},{"ocid":"2"}]}')
+
+    expected = f"{path}: release package (unknown whether concatenated JSON)\n"
+    assert_command(capsys, monkeypatch, main, ["detect-format", "--max-bytes", "33", str(path)], expected)
+
+
 @pytest.mark.parametrize(
     ("filename", "root_path", "result"),
     [
@@ -63,6 +88,40 @@ def test_command_recursive(capsys, monkeypatch, caplog, tmpdir):
     assert len(caplog.records) == 0
 
 
+def test_command_jobs(capsys, monkeypatch, caplog):
+    filenames = ["record-package_minimal.json", "release-package_minimal.json", "detect-format_object.json"] * 20
+    paths = [path(filename) for filename in filenames]
+
+    expected = run_command(capsys, monkeypatch, main, ["detect-format", *paths])
+    actual = run_command(capsys, monkeypatch, main, ["detect-format", "--jobs", "2", *paths])
+
+    assert actual.out == expected.out
+    assert len(caplog.records) == 40
+
+
+def test_command_cache(capsys, monkeypatch, caplog, tmpdir):
+    cache = str(tmpdir.join("manifest.json"))
+    p = tmpdir.join("test.json")
+    p.write(b'{"records":[]}')
+
+    args = ["detect-format", "--cache", cache, str(p)]
+    assert_command(capsys, monkeypatch, main, args, f"{p}: record package\n")
+
+    # Unchanged files are skipped.
+    with patch("ocdskit.commands.detect_format.detect_format", side_effect=AssertionError):
+        assert_command(capsys, monkeypatch, main, args, f"{p}: record package\n")
+
+    # Changed files are processed.
+    p.write(b'{"releases":[]}')
+    assert_command(capsys, monkeypatch, main, args, f"{p}: release package\n")
+
+    # Changed options invalidate the manifest.
+    with patch("ocdskit.commands.detect_format.detect_format", return_value=("release", False, False)):
+        assert_command(capsys, monkeypatch, main, [*args, "--bounded"], f"{p}: release\n")
+
+    assert len(caplog.records) == 0
+
+
 @pytest.mark.parametrize(
     ("basename", "result"),
     [
@@ -100,3 +159,13 @@ def test_command_nonexistent(capsys, monkeypatch, caplog):
     assert len(caplog.records) == 1
     assert caplog.records[0].levelname == "ERROR"
     assert caplog.records[0].message == "nonexistent: No such file or directory"
+
+
+@pytest.mark.parametrize("args", [["--jsonl"], ["--use-float"], ["--input-workers", "2"], ["--unordered"]])
+def test_command_input_arguments(capsys, monkeypatch, args):
+    monkeypatch.setattr(sys, "argv", ["ocdskit", "detect-format", *args, path("record_minimal.json")])
+    with pytest.raises(SystemExit) as excinfo:
+        main()
+
+    assert excinfo.value.code == 2
+    assert "unrecognized arguments" in capsys.readouterr().err
@@ -1,13 +1,20 @@
+import bz2
+import gzip
+import json
 import logging
+import lzma
 import re
+import subprocess
 import sys
 from io import BytesIO, TextIOWrapper
 from unittest.mock import patch
 
 import pytest
 
+import ocdskit.parallel
 from ocdskit.__main__ import main
-from tests import assert_streaming, assert_streaming_error, read, run_streaming
+from ocdskit.util import json_dumps
+from tests import assert_streaming, assert_streaming_error, path, read, run_streaming
 
 
 def test_help(capsys, monkeypatch, caplog):
@@ -23,6 +30,17 @@ def test_help(capsys, monkeypatch, caplog):
     assert excinfo.value.code == 0
 
 
+def test_lazy_import():
+    code = (
+        "import sys; from ocdskit.__main__ import main; sys.argv = ['ocdskit', 'echo']; main(); "
+        "print(sorted(module for module in sys.modules if module.startswith(('ocdskit.commands.', 'ocdsmerge'))))"
+    )
+
+    actual = subprocess.run([sys.executable, "-c", code], input=b"{}", capture_output=True, check=True)
+
+    assert actual.stdout == b"{}\n['ocdskit.commands.base', 'ocdskit.commands.echo']\n"
+
+
 def test_command_encoding(capsys, monkeypatch):
     assert_streaming(
         capsys,
@@ -97,3 +115,153 @@ def test_command_invalid_json(capsys, monkeypatch, caplog):
         assert len(caplog.records) == 1
         assert caplog.records[0].levelname == "CRITICAL"
         assert caplog.records[0].message.startswith("JSON error: ")
+
+
+@pytest.mark.parametrize("args", [[], ["--jsonl"]])
+def test_command_jsonl(capsys, monkeypatch, args):
+    stdin = b'{"releases":[{"ocid":"x"}]}\n\n{"releases":[{"ocid":"y"}]}\n'
+
+    actual = run_streaming(capsys, monkeypatch, main, ["echo", "--root-path", "releases.item", *args], stdin)
+
+    assert actual.out == '{"ocid":"x"}\n{"ocid":"y"}\n'
+
+
+def test_command_jsonl_invalid_json(capsys, monkeypatch, caplog):
+    with caplog.at_level(logging.ERROR):
+        stdin = b'{"ocid":"x"}\n{\n'
+
+        assert_streaming_error(capsys, monkeypatch, main, ["echo", "--jsonl"], stdin, expected='{"ocid":"x"}\n')
+
+        assert len(caplog.records) == 1
+        assert caplog.records[0].levelname == "CRITICAL"
+        assert caplog.records[0].message.startswith("JSON error: ")
+
+
+@pytest.mark.parametrize(
+    ("compress", "compression"),
+    [
+        (gzip.compress, "gzip"),
+        (bz2.compress, "bz2"),
+        (lzma.compress, "lzma"),
+        (gzip.compress, "auto"),
+        (bz2.compress, "auto"),
+        (lzma.compress, "auto"),
+        (lambda data: data, "auto"),
+    ],
+)
+def test_command_input_compression(capsys, monkeypatch, compress, compression):
+    stdin = read("release-package_minimal.json", "rb")
+
+    actual = run_streaming(capsys, monkeypatch, main, ["--input-compression", compression, "echo"], compress(stdin))
+
+    assert actual.out == read("release-package_minimal.json")
+
+
+@pytest.mark.parametrize(
+    ("decompress", "compression"),
+    [
+        (gzip.decompress, "gzip"),
+        (bz2.decompress, "bz2"),
+        (lzma.decompress, "lzma"),
+    ],
+)
+def test_command_output_compression(capsysbinary, monkeypatch, decompress, compression):
+    stdin = read("release-package_minimal.json", "rb")
+
+    actual = run_streaming(capsysbinary, monkeypatch, main, ["--output-compression", compression, "echo"], stdin)
+
+    assert decompress(actual.out) == stdin
+
+
+@pytest.mark.parametrize(
+    "args",
+    [
+        [],
+        ["--input-workers", "2"],
+        ["--input-workers", "0"],
+    ],
+)
+def test_command_input(capsys, monkeypatch, tmp_path, args):
+    filenames = ["release_minimal-1.json", "release_minimal-2.json", "release-package_minimal.json"]
+    for i, filename in enumerate(filenames):
+        (tmp_path / f"{i}.json").write_bytes(read(filename, "rb"))
+    # A file is compressed, and a file is in a subdirectory.
+    (tmp_path / "2.json").rename(tmp_path / "2.json.gz")
+    (tmp_path / "2.json.gz").write_bytes(gzip.compress(read(filenames[2], "rb")))
+    (tmp_path / "sub").mkdir()
+    (tmp_path / "0.json").rename(tmp_path / "sub" / "0.json")
+
+    patterns = [str(tmp_path / "sub" / "0.json"), str(tmp_path / "[12].json*")]
+    argv = ["--input-compression", "auto", "echo", "--input", *patterns, *args]
+    # The standard input is ignored.
+    actual = run_streaming(capsys, monkeypatch, main, argv, b"{}")
+
+    assert actual.out == "".join(read(filename).rstrip() + "\n" for filename in filenames)
+
+
+@pytest.mark.parametrize("args", [[], ["--use-float"]])
+def test_command_use_float(capsys, monkeypatch, args):
+    actual = run_streaming(capsys, monkeypatch, main, ["echo", *args], b'{"a":1311264.00,"b":0.1,"c":1}')
+
+    # Decimals are printed as floats.
+    assert actual.out == '{"a":1311264.0,"b":0.1,"c":1}\n'
+
+
+def test_command_input_unordered(capsys, monkeypatch):
+    filenames = ["release_minimal-1.json", "release_minimal-2.json"]
+    argv = ["echo", "--input-workers", "2", "--unordered", "--input", *(path(filename) for filename in filenames)]
+
+    actual = run_streaming(capsys, monkeypatch, main, argv, b"")
+
+    assert sorted(actual.out.splitlines()) == sorted(read(filename).rstrip() for filename in filenames)
+
+
+@pytest.mark.parametrize(
+    ("pattern", "message"),
+    [
+        ("nonexistent.json", "nonexistent.json: No such file or directory"),
+        ("nonexistent/*.json", "nonexistent/*.json: No files match the pattern"),
+        ("tests", "tests: Is a directory"),
+    ],
+)
+def test_command_input_error(capsys, monkeypatch, caplog, pattern, message):
+    with caplog.at_level(logging.ERROR):
+        assert_streaming_error(capsys, monkeypatch, main, ["echo", "--input", pattern], b"")
+
+        assert len(caplog.records) == 1
+        assert caplog.records[0].levelname == "CRITICAL"
+        assert caplog.records[0].message == message
+
+
+@pytest.mark.parametrize(
+    ("filename", "args"),
+    [
+        ("realdata/release-package-1-2.json", ["--root-path", "releases.item", "--use-float"]),
+        ("release-packages.json", ["--use-float"]),
+        ("release-packages.jsonl", ["--use-float"]),
+    ],
+)
+def test_command_input_split(capsys, monkeypatch, filename, args):
+    monkeypatch.setattr("ocdskit.parallel.CHUNK_SIZE", 100)
+
+    expected = run_streaming(capsys, monkeypatch, main, ["echo", *args], [filename])
+    actual = run_streaming(
+        capsys, monkeypatch, main, ["echo", *args, "--input-workers", "2", "--input", path(filename)], b""
+    )
+
+    assert actual.out == expected.out
+
+
+@pytest.mark.parametrize(("args", "called"), [([], False), (["--use-float"], True)])
+def test_command_input_split_use_float(capsys, monkeypatch, args, called):
+    monkeypatch.setattr("ocdskit.parallel.CHUNK_SIZE", 100)
+    filename = "release-packages.json"
+
+    # Without --use-float, a large file isn't split, because orjson doesn't parse numbers as decimals.
+    with patch("ocdskit.parallel.iter_items_parallel", wraps=ocdskit.parallel.iter_items_parallel) as mock:
+        actual = run_streaming(
+            capsys, monkeypatch, main, ["echo", *args, "--input-workers", "2", "--input", path(filename)], b""
+        )
+
+    assert actual.out == "".join(f"{json_dumps(package)}\n" for package in json.loads(read(filename)))
+    assert mock.called is called
@@ -0,0 +1,51 @@
+import json
+
+from ocdskit.__main__ import main
+from tests import assert_command, assert_command_error, read, run_command
+
+
+def test_command(capsys, monkeypatch, caplog, tmpdir):
+    p = tmpdir.join("test.json")
+    p.write(read("realdata/release-package-1.json", "rb"))
+    releases = json.loads(read("realdata/release-package-1.json"))["releases"]
+
+    run_command(capsys, monkeypatch, main, ["index", str(p)])
+    actual = run_command(capsys, monkeypatch, main, ["get", str(p), "OCDS-87SD3T-AD-SF-DRM-063-2015", "missing"])
+
+    assert [json.loads(line) for line in actual.out.splitlines()] == releases
+    assert len(caplog.records) == 1
+    assert caplog.records[0].levelname == "WARNING"
+    assert caplog.records[0].message == "missing: OCID not found"
+
+
+def test_command_not_indexed(capsys, monkeypatch, caplog, tmpdir):
+    p = tmpdir.join("test.json")
+    p.write(b"{}")
+
+    assert_command_error(capsys, monkeypatch, main, ["get", str(p), "ocds-1"])
+
+    assert len(caplog.records) == 1
+    assert caplog.records[0].levelname == "CRITICAL"
+    assert caplog.records[0].message == f"{p}.ocid-index doesn't exist. Run the index command first."
+
+
+def test_command_stale(capsys, monkeypatch, caplog, tmpdir):
+    p = tmpdir.join("test.json")
+    p.write(b'{"ocid":"ocds-1"}')
+
+    run_command(capsys, monkeypatch, main, ["index", str(p)])
+    p.write(b'{"ocid":"ocds-12"}')
+    assert_command_error(capsys, monkeypatch, main, ["get", str(p), "ocds-1"])
+
+    assert len(caplog.records) == 1
+    assert caplog.records[0].levelname == "CRITICAL"
+    assert caplog.records[0].message == f"{p} changed since it was indexed. Run the index command again."
+
+
+def test_command_pretty(capsys, monkeypatch, tmpdir):
+    p = tmpdir.join("test.json")
+    p.write(b'{"ocid":"ocds-1"}\n{"ocid":"ocds-2"}\n')
+
+    run_command(capsys, monkeypatch, main, ["index", str(p)])
+
+    assert_command(capsys, monkeypatch, main, ["--pretty", "get", str(p), "ocds-2"], '{\n  "ocid": "ocds-2"\n}\n')
@@ -1,3 +1,5 @@
+from unittest.mock import patch
+
 from ocdskit.__main__ import main
 from tests import assert_command
 
@@ -42,6 +44,36 @@ def test_command_recursive(capsys, monkeypatch, tmpdir):
     assert tmpdir.join("test.txt").read() == content.decode()
 
 
+def test_command_jobs(capsys, monkeypatch, caplog, tmpdir):
+    for i in range(40):
+        tmpdir.join(f"test{i}.json").write(content if i % 2 else invalid)
+
+    assert_command(capsys, monkeypatch, main, ["indent", "--recursive", "--jobs", "2", str(tmpdir)], "")
+
+    for i in range(1, 40, 2):
+        assert tmpdir.join(f"test{i}.json").read() == '{\n  "lorem": "ipsum"\n}\n'
+    assert len(caplog.records) == 20
+
+
+def test_command_cache(capsys, monkeypatch, tmpdir):
+    cache = str(tmpdir.join("manifest.json"))
+    p = tmpdir.join("test.json")
+    p.write(content)
+
+    assert_command(capsys, monkeypatch, main, ["indent", "--cache", cache, str(p)], "")
+
+    assert p.read() == '{\n  "lorem": "ipsum"\n}\n'
+
+    # Unchanged files are skipped.
+    with patch("ocdskit.commands.indent.json_dump", side_effect=AssertionError):
+        assert_command(capsys, monkeypatch, main, ["indent", "--cache", cache, str(p)], "")
+
+    # Changed options invalidate the manifest.
+    assert_command(capsys, monkeypatch, main, ["indent", "--cache", cache, "--indent", "4", str(p)], "")
+
+    assert p.read() == '{\n    "lorem": "ipsum"\n}\n'
+
+
 def test_command_directory(capsys, monkeypatch, caplog, tmpdir):
     assert_command(capsys, monkeypatch, main, ["indent", str(tmpdir)], "")
 
@@ -0,0 +1,28 @@
+import os
+
+from ocdskit.__main__ import main
+from ocdskit.index import Index
+from tests import assert_command, read
+
+
+def test_command(capsys, monkeypatch, tmpdir):
+    p = tmpdir.join("test.json")
+    p.write(read("realdata/release-package-1.json", "rb"))
+
+    assert_command(capsys, monkeypatch, main, ["index", str(p)], "")
+
+    assert os.path.isfile(f"{p}.ocid-index")
+    with Index(str(p)) as index:
+        assert len(index.get("OCDS-87SD3T-AD-SF-DRM-063-2015")) == 2
+
+
+def test_command_index(capsys, monkeypatch, tmpdir):
+    p = tmpdir.join("test.json")
+    p.write(read("realdata/release-package-1.json", "rb"))
+    index_path = str(tmpdir.join("index"))
+
+    assert_command(capsys, monkeypatch, main, ["index", str(p), "--index", index_path], "")
+
+    assert not os.path.exists(f"{p}.ocid-index")
+    with Index(str(p), index_path) as index:
+        assert len(index.get("OCDS-87SD3T-AD-SF-DRM-063-2015")) == 2
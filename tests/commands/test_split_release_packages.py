@@ -1,5 +1,10 @@
+import json
+import sys
+
+import pytest
+
 from ocdskit.__main__ import main
-from tests import assert_streaming
+from tests import assert_streaming, read, run_streaming
 
 
 def test_command(capsys, monkeypatch):
@@ -11,3 +16,35 @@ def test_command(capsys, monkeypatch):
         ["realdata/release-package-1-2.json"],
         ["realdata/release-package_split.json"],
     )
+
+
+def test_command_use_float(capsys, monkeypatch):
+    assert_streaming(
+        capsys,
+        monkeypatch,
+        main,
+        ["split-release-packages", "2", "--use-float"],
+        ["realdata/release-package-1-2.json"],
+        ["realdata/release-package_split.json"],
+    )
+
+
+@pytest.mark.parametrize("indent", [None, 2])
+def test_command_late_metadata(capsys, monkeypatch, indent):
+    # The "version" field follows the "releases" field.
+    packages = json.loads(read("release-packages.json"))
+    stdin = "\n".join(json.dumps(package, indent=indent) for package in packages).encode()
+
+    actual = run_streaming(capsys, monkeypatch, main, ["split-release-packages", "1"], stdin)
+
+    assert [json.loads(line) for line in actual.out.splitlines()] == packages
+
+
+@pytest.mark.parametrize("args", [["--input-workers", "2"], ["--unordered"]])
+def test_command_input_workers(capsys, monkeypatch, args):
+    monkeypatch.setattr(sys, "argv", ["ocdskit", "split-release-packages", "1", *args])
+    with pytest.raises(SystemExit) as excinfo:
+        main()
+
+    assert excinfo.value.code == 2
+    assert "unrecognized arguments" in capsys.readouterr().err
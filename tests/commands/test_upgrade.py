@@ -77,6 +77,55 @@ def test_command_release_tenderers_amendment(capsys, monkeypatch, caplog):
     )
 
 
+@pytest.mark.parametrize(
+    ("filename", "expected"),
+    [
+        ("realdata/release-package_1.0-1.json", "realdata/release-package_1.1-1.json"),
+        ("release_1.0.json", "release_1.1.json"),
+    ],
+)
+def test_command_workers(filename, expected, capsys, monkeypatch, caplog):
+    assert_streaming(
+        capsys,
+        monkeypatch,
+        main,
+        ["upgrade", "1.0:1.1", "--workers", "2"],
+        [filename],
+        [expected],
+        ordered=False,
+    )
+
+    assert len(caplog.records) == (filename == "release_1.0.json")
+    assert all(record.levelname == "WARNING" for record in caplog.records)
+
+
+@pytest.mark.parametrize("workers", ["2", "0"])
+def test_command_workers_jsonl(capsys, monkeypatch, caplog, workers):
+    releases = json.loads(read("realdata/release-package_1.0-1.json"))["releases"]
+    stdin = "".join(f"{json.dumps(release)}\n" for release in releases * 150).encode()
+
+    expected = run_streaming(capsys, monkeypatch, main, ["upgrade", "1.0:1.1", "--jsonl"], stdin)
+    actual = run_streaming(capsys, monkeypatch, main, ["upgrade", "1.0:1.1", "--jsonl", "--workers", workers], stdin)
+
+    assert [json.loads(line) for line in actual.out.splitlines()] == [
+        json.loads(line) for line in expected.out.splitlines()
+    ]
+    assert len(actual.out.splitlines()) == len(releases) * 150
+    assert len(caplog.records) == 0
+
+
+def test_command_workers_jsonl_array(capsys, monkeypatch, caplog):
+    releases = json.loads(read("realdata/release-package_1.0-1.json"))["releases"]
+    stdin = f"{json.dumps(releases[0])}\n{json.dumps(releases)}\n".encode()
+
+    expected = run_streaming(capsys, monkeypatch, main, ["upgrade", "1.0:1.1", "--jsonl"], stdin)
+    actual = run_streaming(capsys, monkeypatch, main, ["upgrade", "1.0:1.1", "--jsonl", "--workers", "2"], stdin)
+
+    assert actual.out == expected.out
+    assert len(actual.out.splitlines()) == len(releases) + 1
+    assert len(caplog.records) == 0
+
+
 @pytest.mark.parametrize(
     "pointer",
     [
@@ -5,4 +5,4 @@ import ocdskit.packager
 
 @pytest.fixture(params=[True, False])
 def sqlite(request, monkeypatch):
-    ocdskit.packager.USING_SQLITE = request.param
+    monkeypatch.setattr(ocdskit.packager, "USING_SQLITE", request.param)
@@ -0,0 +1,72 @@
+import json
+import os
+import time
+from unittest.mock import patch
+
+from ocdsmerge import Merger
+
+from ocdskit.cache import SchemaCache
+from ocdskit.combine import merge
+from tests import path, read
+
+schema = json.loads(read("release-schema.json"))
+
+
+def _populate(directory, extensions):
+    with (
+        patch("ocdskit.cache.get_ocds_patch_tag", return_value="1__1__5") as get_ocds_patch_tag,
+        patch("ocdskit.cache.ProfileBuilder") as builder,
+    ):
+        builder.return_value.patched_release_schema.return_value = schema
+        merger = SchemaCache(directory).get_merger("1.1", extensions)
+
+    return merger, get_ocds_patch_tag, builder
+
+
+def test_get_merger(tmp_path):
+    extensions = ["http://example.com/b/extension.json", "http://example.com/a/extension.json"]
+
+    merger, get_ocds_patch_tag, builder = _populate(tmp_path, extensions)
+
+    assert merger.merge_rules == Merger(schema).merge_rules
+    get_ocds_patch_tag.assert_called_once_with("1.1")
+    builder.assert_called_once_with("1__1__5", extensions)
+
+    # A hit doesn't build the schema.
+    merger, get_ocds_patch_tag, builder = _populate(tmp_path, extensions)
+
+    assert merger.merge_rules == Merger(schema).merge_rules
+    get_ocds_patch_tag.assert_not_called()
+    builder.assert_not_called()
+
+    # The order of extensions is part of the key.
+    _, _, builder = _populate(tmp_path, extensions[::-1])
+
+    builder.assert_called_once_with("1__1__5", extensions[::-1])
+
+
+def test_evict(tmp_path):
+    _populate(tmp_path, [])
+
+    filenames = sorted(os.listdir(tmp_path))
+    assert len(filenames) == 3
+
+    stale = time.time() - 8 * 24 * 60 * 60
+    os.utime(tmp_path / filenames[0], (stale, stale))
+    SchemaCache(tmp_path)
+
+    assert sorted(os.listdir(tmp_path)) == filenames[1:]
+
+
+def test_merge(tmp_path, monkeypatch):
+    data = json.loads(read("release-package_minimal.json"))
+
+    _populate(tmp_path, [])
+    monkeypatch.setenv("OCDSKIT_CACHE_DIR", str(tmp_path))
+
+    # No requests are made.
+    with patch("ocdskit.cache.get_ocds_patch_tag") as get_ocds_patch_tag:
+        actual = list(merge([data]))
+
+    get_ocds_patch_tag.assert_not_called()
+    assert actual == list(merge([data], schema=path("release-schema.json")))
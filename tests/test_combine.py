@@ -6,11 +6,14 @@ from ocdsmerge.exceptions import DuplicateIdValueWarning, InconsistentTypeError
 
 from ocdskit.combine import merge, package_records
 from ocdskit.exceptions import (
+    DuplicateReleasesWarning,
+    IgnoredMetadataWarning,
     InconsistentVersionError,
     MergeErrorWarning,
+    UngroupedOcidError,
     UnknownVersionError,
 )
-from tests import read
+from tests import path, read
 
 inconsistent = [
     {"ocid": "ocds-213czf-1", "date": "2000-01-01T00:00:00Z", "integer": 1},
@@ -143,3 +146,174 @@ def test_merge_inconsistent_type_convert_exceptions_to_warnings(return_package,
         str(records[0].message)
         == "ocds-213czf-1: An earlier release had the value 1 for /integer, but the current release has an object with a 'object' key"  # noqa: E501
     )
+
+
+@pytest.mark.usefixtures("sqlite")
+@pytest.mark.parametrize("return_package", [True, False])
+@pytest.mark.parametrize("return_versioned_release", [True, False])
+def test_merge_workers(return_package, return_versioned_release):
+    data = [
+        json.loads(read(filename))
+        for filename in ("realdata/release-package-1.json", "realdata/release-package-2.json")
+    ]
+    kwargs = {
+        "schema": path("release-schema.json"),
+        "return_package": return_package,
+        "return_versioned_release": return_versioned_release,
+    }
+
+    expected = list(merge(data, **kwargs))
+    actual = list(merge(data, workers=2, **kwargs))
+
+    assert actual == expected
+
+
+def test_merge_workers_warning():
+    data = json.loads(read("release-package_warning.json"))["releases"]
+
+    with pytest.warns(DuplicateIdValueWarning) as records:
+        compiled_release = next(iter(merge(data, schema=path("release-schema.json"), workers=2)))
+
+    assert compiled_release["parties"] == json.loads(read("compile_warning.json"))["parties"]
+
+    assert [record.message for record in records] == [
+        ("ocds-213czf-1: Multiple objects have the `id` value '1' in the `parties` array"),
+    ]
+
+
+def test_merge_workers_inconsistent_type_convert_exceptions_to_warnings():
+    def data():
+        for release in inconsistent:
+            yield {"releases": [release]}
+
+    with pytest.warns(MergeErrorWarning) as records:
+        output = list(
+            merge(data(), schema=path("release-schema.json"), convert_exceptions_to_warnings=True, workers=2)
+        )
+
+    assert output == []
+    assert len(records) == 1
+    # The wording of the message depends on the version of OCDS Merge.
+    assert str(records[0].message).startswith("ocds-213czf-1: An earlier release had the ")
+    assert " 1 for /integer, " in str(records[0].message)
+
+
+def test_merge_workers_inconsistent_type():
+    def data():
+        for release in inconsistent:
+            yield {"releases": [release]}
+
+    with pytest.raises(InconsistentTypeError):
+        list(merge(data(), schema=path("release-schema.json"), workers=2))
+
+
+@pytest.mark.parametrize("return_package", [True, False])
+def test_merge_assume_grouped(return_package):
+    releases = []
+    for filename in ("realdata/release-package-1.json", "realdata/release-package-2.json"):
+        releases.extend(json.loads(read(filename))["releases"])
+    releases.sort(key=lambda release: release["ocid"])
+    kwargs = {"schema": path("release-schema.json"), "return_package": return_package}
+
+    expected = list(merge(releases, **kwargs))
+    actual = list(merge(releases, assume_grouped=True, **kwargs))
+
+    assert actual == expected
+
+
+def test_merge_assume_grouped_ungrouped():
+    data = [
+        {"ocid": "ocds-213czf-1", "id": "1", "date": "2001-02-03T04:05:06Z"},
+        {"ocid": "ocds-213czf-2", "id": "2", "date": "2001-02-03T04:05:06Z"},
+        {"ocid": "ocds-213czf-1", "id": "3", "date": "2001-02-03T04:05:06Z"},
+    ]
+
+    output = merge(data, schema=path("release-schema.json"), assume_grouped=True)
+
+    assert next(output)["ocid"] == "ocds-213czf-1"
+    assert next(output)["ocid"] == "ocds-213czf-2"
+    with pytest.raises(UngroupedOcidError) as excinfo:
+        next(output)
+
+    assert str(excinfo.value) == "the releases for OCID ocds-213czf-1 are not contiguous"
+
+
+def test_merge_assume_grouped_package_metadata():
+    data = [
+        {"uri": "http://example.com/1", "version": "1.1", "releases": [{"ocid": "ocds-213czf-1", "id": "1"}]},
+        {
+            "uri": "http://example.com/2",
+            "version": "1.1",
+            "extensions": ["http://example.com/extension.json"],
+            "releases": [{"ocid": "ocds-213czf-2", "id": "2"}],
+        },
+    ]
+
+    output = merge(data, schema=path("release-schema.json"), return_package=True, streaming=True, assume_grouped=True)
+    package = next(output)
+    records = list(package["records"])
+
+    assert [record["ocid"] for record in records] == ["ocds-213czf-1", "ocds-213czf-2"]
+    assert package["packages"] == ["http://example.com/1"]
+    assert "extensions" not in package
+
+    with pytest.warns(IgnoredMetadataWarning, match=r"^metadata after the first package is missing from the record "):
+        assert next(output, None) is None
+
+
+def test_merge_assume_grouped_extensions(monkeypatch):
+    monkeypatch.setattr("ocdskit.combine.get_ocds_patch_tag", lambda _: "1__1__5")
+    monkeypatch.setattr("ocdskit.combine.get_release_schema_url", lambda _: path("release-schema.json"))
+    data = [
+        {"uri": "http://example.com/1", "version": "1.1", "releases": [{"ocid": "ocds-213czf-1", "id": "1"}]},
+        {
+            "uri": "http://example.com/2",
+            "version": "1.1",
+            "extensions": ["http://example.com/extension.json"],
+            "releases": [{"ocid": "ocds-213czf-2", "id": "2"}],
+        },
+    ]
+
+    with pytest.warns(IgnoredMetadataWarning) as records:
+        releases = list(merge(data, assume_grouped=True))
+
+    assert [release["ocid"] for release in releases] == ["ocds-213czf-1", "ocds-213czf-2"]
+    assert [str(record.message) for record in records] == [
+        "extensions after the first package were not used to merge releases: http://example.com/extension.json"
+    ]
+
+
+@pytest.mark.parametrize("deduplicate", ["memory", "disk"])
+@pytest.mark.parametrize("assume_grouped", [True, False])
+def test_merge_deduplicate(deduplicate, assume_grouped):
+    package_1 = json.loads(read("realdata/release-package-1.json"))
+    package_2 = json.loads(read("realdata/release-package-2.json"))
+    kwargs = {"schema": path("release-schema.json"), "return_package": True, "assume_grouped": assume_grouped}
+
+    expected = list(merge([package_1, package_2], **kwargs))
+    with pytest.warns(DuplicateReleasesWarning) as records:
+        actual = list(merge([package_1, package_2, package_2], deduplicate=deduplicate, **kwargs))
+
+    # The package metadata lists the URI of each package, including the repeated package.
+    assert actual[0]["records"] == expected[0]["records"]
+    assert len(records) == 1
+    assert str(records[0].message) == f"{len(package_2['releases'])} duplicate releases were dropped"
+
+
+def test_merge_deduplicate_changed():
+    release = {"ocid": "ocds-213czf-1", "id": "1", "date": "2001-02-03T04:05:06Z", "title": "a"}
+    # The same release, with its keys in another order.
+    duplicate = {"title": "a", "date": "2001-02-03T04:05:06Z", "id": "1", "ocid": "ocds-213czf-1"}
+    changed = {**release, "title": "b"}
+
+    with pytest.warns(DuplicateReleasesWarning, match="^1 duplicate releases were dropped$"):
+        output = list(
+            merge(
+                [release, duplicate, changed],
+                schema=path("release-schema.json"),
+                return_package=True,
+                deduplicate="memory",
+            )
+        )
+
+    assert len(output[0]["records"][0]["releases"]) == 2
@@ -0,0 +1,98 @@
+import json
+import os
+
+import pytest
+
+from ocdskit.exceptions import StaleIndexError
+from ocdskit.index import Index, build_index, iter_offsets
+from tests import path, read
+
+
+@pytest.mark.parametrize(
+    ("filename", "expected"),
+    [
+        ("realdata/release-package-1.json", ["OCDS-87SD3T-AD-SF-DRM-063-2015"] * 2),
+        ("realdata/record-package-1.json", ["ocds-07smqs-993235"]),
+        ("realdata/compiled-release-1.json", ["OCDS-87SD3T-AD-SF-DRM-063-2015"]),
+        ("release-packages.json", ["ocds-213czf-1"] * 2),
+        ("release-packages.jsonl", ["ocds-213czf-1"] * 4),
+        ("detect-format_object.json", []),
+    ],
+)
+def test_iter_offsets(filename, expected):
+    data = read(filename, "rb")
+
+    offsets = list(iter_offsets(data))
+
+    assert [ocid for ocid, _, _ in offsets] == expected
+    for ocid, start, end in offsets:
+        assert json.loads(data[start:end])["ocid"] == ocid
+
+
+def test_iter_offsets_scan(monkeypatch):
+    releases = [{"ocid": f"ocds-{i}", "id": str(i), "tag": ["tender"], "title": "é}"} for i in range(3)]
+    record = {"ocid": "ocds-r", "releases": [{"url": "http://example.com", "date": "2001-02-03T04:05:06Z"}]}
+    data = json.dumps(
+        [{"uri": "[{", "releases": releases, "publisher": {"name": "{"}}, {"records": [record, {"ocid": 1}]}]
+    ).encode()
+
+    # Scan the packages, instead of decoding them at once.
+    monkeypatch.setattr("ocdskit.index.DOCUMENT_DECODE_LIMIT", 1)
+    monkeypatch.setattr("ocdskit.util.DECODE_SIZE", 1)
+
+    offsets = list(iter_offsets(data))
+
+    assert [json.loads(data[start:end]) for _, start, end in offsets] == [*releases, record]
+
+
+def test_index(tmpdir):
+    filename = str(tmpdir.join("test.jsonl"))
+    tmpdir.join("test.jsonl").write("".join(f'{{"ocid":"ocds-{i % 2}","id":"{i}"}}\n' for i in range(4)))
+
+    assert build_index(filename) == 4
+
+    with Index(filename) as index:
+        assert index.get("ocds-0") == [{"ocid": "ocds-0", "id": "0"}, {"ocid": "ocds-0", "id": "2"}]
+        assert index.get("ocds-1") == [{"ocid": "ocds-1", "id": "1"}, {"ocid": "ocds-1", "id": "3"}]
+        assert index.get("ocds-2") == []
+
+
+def test_index_path(tmpdir):
+    index_path = str(tmpdir.join("index"))
+
+    assert build_index(path("realdata/release-package-1.json"), index_path) == 2
+
+    with Index(path("realdata/release-package-1.json"), index_path) as index:
+        assert [release["id"] for release in index.get("OCDS-87SD3T-AD-SF-DRM-063-2015")] == ["01", "02"]
+
+
+def test_index_empty(tmpdir):
+    p = tmpdir.join("test.json")
+    p.write(b"")
+
+    assert build_index(str(p)) == 0
+
+    with Index(str(p)) as index:
+        assert index.get("ocds-0") == []
+
+
+def test_index_missing(tmpdir):
+    p = tmpdir.join("test.json")
+    p.write(b"{}")
+
+    with pytest.raises(FileNotFoundError):
+        Index(str(p))
+
+
+def test_index_stale(tmpdir):
+    p = tmpdir.join("test.json")
+    p.write(b'{"ocid":"ocds-0"}')
+
+    build_index(str(p))
+    p.write(b'{"ocid":"ocds-1"}')
+    os.utime(str(p), ns=(0, 0))
+
+    with pytest.raises(StaleIndexError) as excinfo:
+        Index(str(p))
+
+    assert str(excinfo.value) == f"{p} changed since it was indexed"
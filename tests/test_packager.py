@@ -1,9 +1,24 @@
+import importlib.metadata
+import importlib.util
 import json
+import sys
+from decimal import Decimal
 
+import pytest
 from ocdsmerge import Merger
 from ocdsmerge.util import get_release_schema_url, get_tags
 
-from ocdskit.packager import Packager
+import ocdskit.packager
+from ocdskit.exceptions import UnknownBackendError
+from ocdskit.packager import (
+    BACKEND_ENTRY_POINT_GROUP,
+    ExternalSortBackend,
+    Packager,
+    PythonBackend,
+    SQLiteBackend,
+    get_backend,
+    get_backend_names,
+)
 from tests import read
 
 
@@ -24,3 +39,143 @@ def test_output_package_no_streaming():
         actual = next(packager.output_package(Merger(schema)))
 
     assert actual == json.loads(read("realdata/record-package_package.json"))
+
+
+@pytest.mark.parametrize(
+    "backend",
+    [
+        PythonBackend,
+        SQLiteBackend,
+        ExternalSortBackend,
+        # Write a run for each release, and merge runs.
+        lambda: ExternalSortBackend(memory_budget=1, max_runs=2),
+        lambda: SQLiteBackend(compression="zlib"),
+        pytest.param(
+            lambda: SQLiteBackend(compression="zstd", compression_level=1),
+            marks=pytest.mark.skipif(
+                sys.version_info < (3, 14) and not importlib.util.find_spec("zstandard"),
+                reason="zstd is unavailable",
+            ),
+        ),
+    ],
+)
+def test_backend(backend):
+    releases = [{"ocid": f"ocds-213czf-{i % 3}", "id": str(i), "date": "", "value": Decimal(i)} for i in range(10)]
+
+    backend = backend()
+    try:
+        for i, release in enumerate(releases):
+            backend.add_release(release, f"http://example.com/{i}")
+            backend.flush()
+
+        actual = [(ocid, sorted(rows, key=lambda row: row[1])) for ocid, rows in backend.get_releases_by_ocid()]
+    finally:
+        backend.close()
+
+    assert actual == [
+        (
+            f"ocds-213czf-{j}",
+            sorted(
+                (
+                    (release["ocid"], f"http://example.com/{i}", {**release, "value": i})
+                    for i, release in enumerate(releases)
+                    if i % 3 == j
+                ),
+                key=lambda row: row[1],
+            ),
+        )
+        for j in range(3)
+    ]
+
+
+@pytest.mark.parametrize(
+    ("kwargs", "expected"),
+    [
+        ({"backend": "python"}, PythonBackend),
+        ({"backend": "sqlite"}, SQLiteBackend),
+        ({"backend": "external-sort", "backend_options": {"memory_budget": 1}}, ExternalSortBackend),
+        ({"backend": ExternalSortBackend(memory_budget=1)}, ExternalSortBackend),
+    ],
+)
+def test_packager_backend(kwargs, expected):
+    data = [json.loads(read(filename)) for filename in ("release_minimal-1.json", "release_minimal-2.json")]
+    merger = Merger(json.loads(read("release-schema.json")))
+
+    with Packager() as packager:
+        packager.add(data)
+        expected_records = list(packager.output_records(merger))
+
+    with Packager(**kwargs) as packager:
+        packager.add(data)
+        actual_records = list(packager.output_records(merger))
+
+    assert isinstance(packager.backend, expected)
+    assert actual_records == expected_records
+
+
+def test_packager_backend_invalid():
+    with pytest.raises(UnknownBackendError) as excinfo:
+        Packager(backend="nonexistent")
+
+    assert str(excinfo.value) == "nonexistent"
+
+    with pytest.raises(ValueError, match=r"^store and compression require the sqlite backend$"):
+        Packager(backend="python", compression="zlib")
+
+    with pytest.raises(ValueError, match=r"^backend_options can't be set if backend is an instance$"):
+        Packager(backend=PythonBackend(), backend_options={"memory_budget": 1})
+
+
+@pytest.mark.parametrize(
+    "kwargs",
+    [{"store": "store.sqlite3"}, {"compression": "zlib"}, {"backend": "python"}, {"backend_options": {"path": None}}],
+)
+def test_packager_assume_grouped_conflict(kwargs):
+    with pytest.raises(ValueError, match=r"^assume_grouped can't be combined with "):
+        Packager(assume_grouped=True, **kwargs)
+
+
+@pytest.mark.parametrize(
+    "kwargs", [{"store": True}, {"compression": "zlib"}, {"backend": "sqlite"}, {"deduplicate": "disk"}]
+)
+def test_packager_sqlite_unavailable(monkeypatch, kwargs):
+    monkeypatch.setattr(ocdskit.packager, "USING_SQLITE", False)
+
+    with pytest.raises(ImportError, match=r"^sqlite3 is unavailable, so \w+ can't be used$"):
+        Packager(**kwargs)
+
+
+def test_get_backend_entry_point(monkeypatch):
+    entry_point = importlib.metadata.EntryPoint(
+        name="custom", value="ocdskit.packager:PythonBackend", group=BACKEND_ENTRY_POINT_GROUP
+    )
+    entry_points = importlib.metadata.EntryPoints([entry_point])
+    monkeypatch.setattr(importlib.metadata, "entry_points", entry_points.select)
+
+    assert get_backend("custom") is PythonBackend
+    assert get_backend_names() == ["python", "sqlite", "external-sort", "custom"]
+
+    with Packager(backend="custom") as packager:
+        assert isinstance(packager.backend, PythonBackend)
+
+
+@pytest.mark.parametrize(
+    "filenames",
+    [
+        ["realdata/release-package-1.json", "realdata/release-package-2.json"],
+        ["release-package_maximal.json"],
+        ["release_minimal-1.json", "release_minimal-2.json"],
+    ],
+)
+def test_output_records_versioned(filenames):
+    data = [json.loads(read(filename)) for filename in filenames]
+    merger = Merger(json.loads(read("release-schema.json")))
+
+    with Packager() as packager:
+        packager.add(data)
+
+        records = list(packager.output_records(merger, return_versioned_release=True))
+
+    for record in records:
+        assert record["compiledRelease"] == merger.create_compiled_release(record["releases"])
+        assert record["versionedRelease"] == merger.create_versioned_release(record["releases"])
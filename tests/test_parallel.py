@@ -0,0 +1,123 @@
+import json
+import subprocess
+import sys
+
+import pytest
+
+from ocdskit.parallel import iter_items_parallel
+from ocdskit.util import iter_items
+from tests import path
+
+
+def flatten(items):
+    for item in items:
+        if isinstance(item, list):
+            yield from item
+        else:
+            yield item
+
+
+def records(n):
+    # The releases start like the records, and a string looks like a boundary between records.
+    return [
+        {
+            "ocid": f"ocds-213czf-{i}",
+            "releases": [{"ocid": f"ocds-213czf-{i}", "id": str(j), "title": '"},{"ocid":'} for j in range(i % 3 + 1)],
+            "compiledRelease": {"ocid": f"ocds-213czf-{i}", "value": {"amount": i / 2}},
+        }
+        for i in range(20)
+    ][:n]
+
+
+@pytest.mark.parametrize("chunk_size", [1, 100, 10000])
+@pytest.mark.parametrize(
+    ("filename", "prefix"),
+    [
+        ("realdata/release-package-1-2.json", "releases.item"),
+        ("realdata/record-package-1-2.json", "records.item"),
+        ("realdata/record-package-1-2.json", "records.item.releases.item"),
+        ("release-packages.json", ""),
+        ("release-packages.json", "item"),
+        ("release-packages.jsonl", ""),
+        ("release-packages.jsonl", "item.releases.item"),
+        ("release_minimal_pretty.json", ""),
+        ("detect-format_empty.json", ""),
+    ],
+)
+def test_iter_items_parallel(filename, prefix, chunk_size):
+    with open(path(filename), "rb") as f:
+        expected = list(iter_items(f, prefix))
+    if not prefix:
+        expected = list(flatten(expected))
+
+    actual = list(iter_items_parallel(path(filename), prefix, 2, chunk_size=chunk_size))
+
+    assert actual == json.loads(json.dumps(expected, default=float))
+
+
+@pytest.mark.parametrize("chunk_size", [1, 50, 500])
+@pytest.mark.parametrize(
+    ("data", "prefix"),
+    [
+        (records(20), ""),
+        (records(20), "item"),
+        ({"uri": "[", "records": records(20), "version": "1.1"}, "records.item"),
+        ({"uri": "[", "records": records(20), "version": "1.1"}, "records.item.releases.item"),
+        ({"records": records(1)}, "records.item"),
+        ({"records": []}, "records.item"),
+        ({"publisher": {"records": records(2)}}, "records.item"),
+    ],
+)
+@pytest.mark.parametrize("indent", [None, 2])
+def test_iter_items_parallel_split(tmp_path, data, prefix, chunk_size, indent):
+    text = json.dumps(data, indent=indent)
+    # Another value follows the first value.
+    (tmp_path / "test.json").write_text(text + "\n" + text)
+
+    with (tmp_path / "test.json").open("rb") as f:
+        expected = list(iter_items(f, prefix))
+    if not prefix:
+        expected = list(flatten(expected))
+
+    actual = list(iter_items_parallel(str(tmp_path / "test.json"), prefix, 2, chunk_size=chunk_size))
+
+    assert actual == json.loads(json.dumps(expected, default=float))
+
+
+@pytest.mark.parametrize("chunk_size", [1, 50, 500])
+@pytest.mark.parametrize("indent", [None, 2])
+def test_iter_items_parallel_concatenated(tmp_path, chunk_size, indent):
+    # The values are on one line (not JSON Lines) or pretty-printed, and an array follows the objects.
+    text = " ".join(json.dumps(record, indent=indent) for record in records(20)) + "\n" + json.dumps(records(2))
+    (tmp_path / "test.json").write_text(text)
+
+    with (tmp_path / "test.json").open("rb") as f:
+        expected = list(flatten(iter_items(f, "")))
+
+    actual = list(iter_items_parallel(str(tmp_path / "test.json"), "", 2, chunk_size=chunk_size))
+
+    assert actual == json.loads(json.dumps(expected, default=float))
+
+
+@pytest.mark.parametrize(
+    ("text", "prefix"),
+    [
+        ('[{"a":1},{"a":2}', ""),
+        ('[{"a":1},{"a":2} {"a":3}]', ""),
+        ('{"a":[{"a":1},{"a":2]}', "a.item"),
+        ('{"a":1} {"a":2} {"a":', ""),
+    ],
+)
+def test_iter_items_parallel_invalid(tmp_path, text, prefix):
+    (tmp_path / "test.json").write_text(text)
+
+    with pytest.raises(ValueError):  # noqa: PT011 # orjson, json or ijson
+        list(iter_items_parallel(str(tmp_path / "test.json"), prefix, 2, chunk_size=1))
+
+
+def test_import_without_sqlite():
+    code = "import sys; sys.modules['sqlite3'] = None; import ocdskit.parallel; print('ocdskit.index' in sys.modules)"
+
+    actual = subprocess.run([sys.executable, "-c", code], capture_output=True, check=True)
+
+    assert actual.stdout == b"False\n"
@@ -1,7 +1,5 @@
 from collections import OrderedDict
 
-import pytest
-
 from ocdskit.upgrade import upgrade_10_11
 
 
@@ -26,5 +24,35 @@ def test_upgrade_10_11_no_reorder():
 def test_upgrade_10_11_reorder_dict():
     data = {"releases": [{"ocid": "ocds-1", "buyer": {"name": "Acme"}}]}
 
-    with pytest.raises(AttributeError):
-        upgrade_10_11(data)
+    result = upgrade_10_11(data)
+
+    assert list(result) == ["version", "releases"]
+    assert list(result["releases"][0]) == ["ocid", "parties", "buyer"]
+    assert list(result["releases"][0]["parties"][0]) == ["id", "roles", "name"]
+
+
+def tenderers_release(n):
+    organizations = [{"name": f"Org {i}", "identifier": {"scheme": "XX", "id": str(i)}} for i in range(n)]
+    return {
+        "ocid": "ocds-1",
+        "id": "1",
+        "tender": {"id": "1", "tenderers": organizations},
+        "awards": [{"id": "1", "suppliers": [organizations[0].copy()]}],
+    }
+
+
+def test_upgrade_10_11_tenderers():
+    result = upgrade_10_11(tenderers_release(3))
+
+    assert [party["roles"] for party in result["parties"]] == [["tenderer", "supplier"], ["tenderer"], ["tenderer"]]
+    assert [tenderer["name"] for tenderer in result["tender"]["tenderers"]] == ["Org 0", "Org 1", "Org 2"]
+    assert result["awards"][0]["suppliers"] == [result["tender"]["tenderers"][0]]
+
+
+def test_benchmark_upgrade_10_11_tenderers(benchmark):
+    def setup():
+        return (tenderers_release(5000),), {}
+
+    result = benchmark.pedantic(upgrade_10_11, setup=setup, rounds=5)
+
+    assert len(result["parties"]) == 5000
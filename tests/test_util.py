@@ -1,11 +1,15 @@
 import gzip
 import json
+from decimal import Decimal
+from io import BytesIO
 
 import ijson
 import pytest
 
-from ocdskit.exceptions import UnknownFormatError
+import ocdskit.util
+from ocdskit.exceptions import LateMetadataWarning, UnknownFormatError
 from ocdskit.util import (
+    JSONEncoder,
     detect_format,
     get_definitions_keyword,
     get_ocds_minor_version,
@@ -16,6 +20,11 @@ from ocdskit.util import (
     is_record_package,
     is_release,
     is_release_package,
+    iter_items,
+    iter_package_entries,
+    iter_package_metadata,
+    iter_split_packages,
+    iterencode,
     json_dump,
     longest_common_subsequence,
 )
@@ -181,6 +190,157 @@ def test_json_dump(data, expected, tmpdir):
     assert p.read() == expected
 
 
+def _releases():
+    yield {"ocid": "a", "tender": {"items": [{"id": "1"}], "value": {"amount": Decimal("1.5")}}}
+    yield {"ocid": "b", "tender": {}, "awards": iter([{"id": "1"}])}
+
+
+@pytest.mark.parametrize(
+    "kwargs", [{}, {"indent": 2}, {"ensure_ascii": True}, {"indent": 4}, {"indent": 2, "sort_keys": True}]
+)
+@pytest.mark.parametrize(
+    "data",
+    [
+        lambda: {"uri": "é", "releases": _releases(), "extensions": [], "publisher": {"name": "x"}},
+        lambda: [{"releases": _releases()}, {"releases": iter([])}],
+        _releases,
+        lambda: iter([]),
+        dict,
+        lambda: 1,
+    ],
+)
+def test_iterencode(data, kwargs):
+    separators = (",", ": ") if "indent" in kwargs else (",", ":")
+    expected = json.dumps(data(), cls=JSONEncoder, **{"ensure_ascii": False, "separators": separators, **kwargs})
+
+    assert "".join(iterencode(data(), **kwargs)) == expected
+
+
+@pytest.mark.parametrize(
+    ("data", "prefix", "expected"),
+    [
+        # JSON Lines
+        (b'{"a":[1,2]}\n{"a":[3]}', "a.item", [1, 2, 3]),
+        (b'{"a":{"item":1}}\n \n[{"a":2}]\n', "a.item", [1]),
+        (b'{"a":1}\n{"b":2}\n', "", [{"a": 1}, {"b": 2}]),
+        # Concatenated JSON, after JSON Lines
+        (b'{"a":1}\n{\n"a": 2}{"a":3}\n{"a":4}\n', "a", [1, 2, 3, 4]),
+        (b'{"a":1}{"a":2}\n', "a", [1, 2]),
+        (b'[\n{"a":1},\n{"a":2}\n]\n', "item.a", [1, 2]),
+    ],
+)
+def test_iter_items(data, prefix, expected):
+    assert list(iter_items(BytesIO(data), prefix)) == expected
+
+
+def test_iter_items_jsonl_limit(monkeypatch):
+    monkeypatch.setattr(ocdskit.util, "JSONL_DETECTION_LIMIT", 4)
+
+    assert list(iter_items(BytesIO(b'[1,2,3]\n{"a":1}\n'))) == [[1, 2, 3], {"a": 1}]
+
+
+def test_iter_items_jsonl_invalid():
+    with pytest.raises(json.JSONDecodeError):
+        list(iter_items(BytesIO(b'{"a":1}{"a":2}\n'), jsonl=True))
+
+
+@pytest.mark.parametrize("jsonl", [None, False])
+@pytest.mark.parametrize(
+    ("data", "prefix", "expected"),
+    [
+        (
+            b'{"uri":"a","version":"1.1","releases":[1,2,3]}\n{"uri":"b","releases":[]}\n{"uri":"c","releases":[4]}',
+            "",
+            [
+                {"uri": "a", "version": "1.1", "releases": [1, 2]},
+                {"uri": "a", "version": "1.1", "releases": [3]},
+                {"uri": "c", "releases": [4]},
+            ],
+        ),
+        (
+            b'[{"uri":"a","releases":[{"a":[1]},{"b":{"c":2}},{}]},{"uri":"b","releases":[1]}]',
+            "",
+            [
+                {"uri": "a", "releases": [{"a": [1]}, {"b": {"c": 2}}]},
+                {"uri": "a", "releases": [{}]},
+                {"uri": "b", "releases": [1]},
+            ],
+        ),
+        (
+            b'{"results":[{"package":{"uri":{"a":[1]},"releases":[1,2,3,4]}},{"item":{"releases":[1]}}]}',
+            "results.item.package",
+            [{"uri": {"a": [1]}, "releases": [1, 2]}, {"uri": {"a": [1]}, "releases": [3, 4]}],
+        ),
+        (
+            b'{"item":{"uri":"a","releases":[1]},"releases":[2]}',
+            "",
+            [{"item": {"uri": "a", "releases": [1]}, "releases": [2]}],
+        ),
+        (b'{"uri":"a"}', "", []),
+    ],
+)
+def test_iter_split_packages(data, prefix, expected, jsonl):
+    assert list(iter_split_packages(BytesIO(data), "releases", 2, prefix, jsonl=jsonl)) == expected
+
+
+@pytest.mark.parametrize("jsonl", [None, False])
+def test_iter_package_metadata_and_entries(jsonl):
+    data = b'{"uri":"a","releases":[{"id":1},{"id":2}],"version":"1.1"}\n{"uri":"b"}\n[{"uri":"c","releases":[3]}]'
+
+    assert list(iter_package_metadata(BytesIO(data), "releases", jsonl=jsonl)) == [
+        {"uri": "a", "releases": [], "version": "1.1"},
+        {"uri": "b"},
+        {"uri": "c", "releases": []},
+    ]
+    assert list(iter_package_entries(BytesIO(data), "releases", jsonl=jsonl)) == [{"id": 1}, {"id": 2}, 3]
+
+
+@pytest.mark.parametrize("jsonl", [None, False])
+def test_iter_split_packages_metadata(jsonl):
+    data = b'{"uri":"a","releases":[1,2,3],"version":"1.1"}\n{"releases":[4],"uri":"b"}'
+    metadata = list(iter_package_metadata(BytesIO(data), "releases", jsonl=jsonl))
+
+    assert list(iter_split_packages(BytesIO(data), "releases", 2, jsonl=jsonl, metadata=metadata)) == [
+        {"uri": "a", "releases": [1, 2], "version": "1.1"},
+        {"uri": "a", "releases": [3], "version": "1.1"},
+        {"releases": [4], "uri": "b"},
+    ]
+
+
+@pytest.mark.parametrize("use_float", [False, True])
+def test_iter_split_packages_use_float(use_float):
+    data = b'{"uri":"a","value":1.5,"releases":[{"amount":2.5},{"amount":3}]}'
+    number = float if use_float else Decimal
+
+    assert list(iter_split_packages(BytesIO(data), "releases", 2, jsonl=False, use_float=use_float)) == [
+        {"uri": "a", "value": number("1.5"), "releases": [{"amount": number("2.5")}, {"amount": 3}]}
+    ]
+    assert list(iter_package_metadata(BytesIO(data), "releases", jsonl=False, use_float=use_float)) == [
+        {"uri": "a", "value": number("1.5"), "releases": []}
+    ]
+    assert list(iter_package_entries(BytesIO(data), "releases", jsonl=False, use_float=use_float)) == [
+        {"amount": number("2.5")},
+        {"amount": 3},
+    ]
+
+
+def test_iter_split_packages_late_metadata():
+    data = b'{"uri":"a","releases":[1,2,3,4,5],"version":"1.1","extensions":["b"]}'
+
+    with pytest.warns(LateMetadataWarning) as records:
+        actual = list(iter_split_packages(BytesIO(data), "releases", 2, jsonl=False))
+
+    assert actual == [
+        {"uri": "a", "releases": [1, 2]},
+        {"uri": "a", "releases": [3, 4]},
+        {"uri": "a", "releases": [5], "version": "1.1", "extensions": ["b"]},
+    ]
+    assert [str(record.message) for record in records] == [
+        'the "version" field follows the "releases" field, so the first 2 packages omit it',
+        'the "extensions" field follows the "releases" field, so the first 2 packages omit it',
+    ]
+
+
 @pytest.mark.parametrize(
     ("filename", "expected"),
     [
@@ -203,6 +363,77 @@ def test_detect_format(filename, expected):
     assert result == expected
 
 
+@pytest.mark.parametrize(
+    ("text", "expected"),
+    [
+        # The format is decided once the "releases" or "records" array starts, and the next token is read once the
+        # top-level JSON value closes.
+        ('{"releases":[{"ocid":"1"}]} {"releases":[', ("release package", True, False)),
+        ('{"releases":[{"ocid":"1"}]}\n', ("release package", False, False)),
+        ('{"ocid":"1","releases":[{"ocid":"1"}]}', ("record", False, False)),
+        ('{"records":[{"ocid":"1"}],"uri":""}{', ("record package", True, False)),
+        ('[{"releases":[{"ocid":"1"}]},{"releases":[]}]', ("release package", False, True)),
+        # The format is decided once the first item closes.
+        ('{"ocid":"1","tag":["tender"]} {"ocid":', ("release", True, False)),
+        ('{"ocid":"1","tag":["tender"]}\n', ("release", False, False)),
+        ('[{"ocid":"1","tag":["tender"]},{"ocid":"2"}] []', ("release", True, True)),
+    ],
+)
+def test_detect_format_bounded(text, expected, tmp_path):
+    path = tmp_path / "test.json"
+    path.write_text(text)
+
+    assert detect_format(path, bounded=True) == expected
+
+
+@pytest.mark.parametrize(
+    ("text", "expected"),
+    [
+        ('{"uri":"","releases":[{"ocid":"1"},{"ocid":"2"}]}', ("release package", None, False)),
+        ('{"ocid":"1","tag":["tender"]} {"ocid":"2","tag":["tender"]}', ("release", True, False)),
+        ('{"ocid":"1","tag":["tender"]}', ("release", False, False)),
+    ],
+)
+def test_detect_format_max_bytes(text, expected, tmp_path):
+    path = tmp_path / "test.json"
+    path.write_text(text)
+
+    assert detect_format(path, max_bytes=33) == expected
+
+
+def test_detect_format_bounded_max_bytes(tmp_path):
+    path = tmp_path / "test.json"
+    path.write_text('{"releases":[{"ocid":"1"},{"ocid":"2"}]} {"releases":[]}')
+
+    assert detect_format(path, bounded=True, max_bytes=20) == ("release package", None, False)
+
+
+@pytest.mark.parametrize("size", [1, 3, 2**16])
+@pytest.mark.parametrize(
+    ("text", "expected"),
+    [
+        ('{"releases":[{"ocid":"}]\\"{["}],"uri":"\\\\"}\n', ("release package", False, False)),
+        ('{"releases":[{"ocid":"}]\\"{["}],"uri":"\\\\"} 1', ("release package", True, False)),
+        ('[{"ocid":"1","tag":["tender"],"title":"[[\\\\\\""}]\n\n', ("release", False, True)),
+        ('[{"ocid":"1","tag":["tender"],"title":"[[\\\\\\""}]"]"', ("release", True, True)),
+    ],
+)
+def test_detect_format_bounded_scan(text, expected, size, tmp_path, monkeypatch):
+    monkeypatch.setattr("ocdskit.util.SCAN_SIZE", size)
+    path = tmp_path / "test.json"
+    path.write_text(text)
+
+    assert detect_format(path, bounded=True) == expected
+
+
+def test_detect_format_bounded_incomplete(tmp_path):
+    path = tmp_path / "test.json"
+    path.write_text('{"releases":[{"ocid":"1"}],"uri":"')
+
+    with pytest.raises(ijson.common.IncompleteJSONError):
+        detect_format(path, bounded=True)
+
+
 @pytest.mark.parametrize(("filename", "expected"), [("ocds-sample-data.json.gz", ("release package", False, False))])
 def test_detect_format_gz(filename, expected):
     result = detect_format(path(filename), reader=gzip.open)